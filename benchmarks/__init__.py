@@ -0,0 +1 @@
+"""Offline benchmarks for ShutterPilot (not shipped with the integration)."""
@@ -0,0 +1,233 @@
+"""Config-path benchmark: setup, reload and options saves with 50/200/500 profiles.
+
+    python -m benchmarks.bench_config                    # 50, 200, 500 Profile
+    python -m benchmarks.bench_config --profiles 1000 --save
+
+Jedes Szenario läuft in einem eigenen Prozess und spielt den Konfigurationspfad
+einmal durch: Setup mit leerer Registry, Schalter umlegen, ``update_config``
+(Legacy-Card-API), ``patch_config``, Speichern im Options-Flow, Reload,
+Unload und erneutes Setup mit vorhandener Registry (Entities neu anlegen).
+Pro Schritt werden Wandzeit, Loop-Rechenzeit und längste Blockade gemessen –
+inklusive verzögertem Schreiben von ``core.config_entries``. Dazu kommen die
+Größe der serialisierten Optionen und der Attribute von
+``sensor.shutterpilot_config``. Ergebnisse mit ``--save`` unter
+``benchmarks/results/config/<Version>.json``.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Awaitable, Callable, Optional
+
+from homeassistant.helpers import entity_registry as er
+
+from .bench_scale import _git_revision, _ha_version, _version, compare, load_baseline
+from .harness import DOMAIN, REPO_ROOT, BenchHass, bench_hass, local_datetime, run
+from .streams import build_options, initial_states
+
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results", "config")
+DEFAULT_PROFILES = (50, 200, 500)
+DEFAULT_START = "2026-06-22 10:00"
+DEFAULT_THRESHOLD = 0.2
+ENTRY_ID = "bench"
+CONFIG_SENSOR = "sensor.shutterpilot_config"
+FLUSH_DELAY = 2.0  # > SAVE_DELAY der Config-Entries (1 s): verzögertes Schreiben abwarten
+
+STEPS = (
+    "setup", "switch_toggle", "update_config", "patch_config",
+    "options_flow_save", "reload", "unload", "setup_warm",
+)
+
+# Kennzahl → True, wenn größer besser ist
+TRACKED = {
+    **{f"{step}_ms": False for step in STEPS},
+    "max_slice_ms": False,
+    "options_bytes": False,
+    "config_sensor_attr_bytes": False,
+}
+
+
+def _json_size(data) -> int:
+    return len(json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode())
+
+
+def _changed_profile(options: dict, index: int = 0, **changes) -> list[dict]:
+    profiles = [dict(p) for p in options["profiles"]]
+    profiles[index].update(changes)
+    return profiles
+
+
+async def _async_measure(bench: BenchHass, step: str, action: Callable[[], Awaitable], results: dict) -> None:
+    """Run ``action`` until the loop is idle and the options are written; record the timings."""
+    hass = bench.hass
+    store = hass.data.get(DOMAIN, {}).get(ENTRY_ID)
+    await asyncio.sleep(0)  # Messung beginnt mit einem frischen Loop-Durchlauf
+    bench.loop.reset_stats()
+    started = time.perf_counter()
+    await action()
+    await hass.async_block_till_done()
+    await asyncio.sleep(FLUSH_DELAY)
+    await hass.async_block_till_done()
+    results[f"{step}_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    results[f"{step}_loop_ms"] = round(bench.loop.busy * 1000, 1)
+    results[f"{step}_max_ms"] = round(bench.loop.max_slice * 1000, 2)
+    # Neuer Store = Integration wurde neu geladen (Controller und Entities neu)
+    after = hass.data.get(DOMAIN, {}).get(ENTRY_ID)
+    results[f"{step}_reloaded"] = store is not None and after is not None and after is not store
+
+
+async def _async_scenario(count: int, start: datetime) -> dict:
+    async with bench_hass(start) as bench:
+        hass = bench.hass
+        bench.register_cover_services()
+        for change in initial_states(hass, count, start):
+            hass.states.async_set(change.entity_id, change.state, change.attributes)
+        results: dict = {"profiles": count}
+
+        async def _setup() -> None:
+            await bench.async_setup_shutterpilot(build_options(count), entry_id=ENTRY_ID)
+
+        await _async_measure(bench, "setup", _setup, results)
+        entry = hass.config_entries.async_get_entry(ENTRY_ID)
+        registry = er.async_get(hass)
+        results["entities"] = len(er.async_entries_for_config_entry(registry, ENTRY_ID))
+
+        # Schalter eines Profils (Card/Dashboard)
+        name = entry.options["profiles"][0]["name"]
+        switch = next(
+            e.entity_id for e in er.async_entries_for_config_entry(registry, ENTRY_ID)
+            if e.domain == "switch" and e.original_name == f"Automatik {name}"
+        )
+
+        async def _switch_toggle() -> None:
+            await hass.services.async_call("switch", "turn_off", {"entity_id": switch}, blocking=True)
+
+        await _async_measure(bench, "switch_toggle", _switch_toggle, results)
+
+        # Card speichert alle Profile (Legacy-API)
+        async def _update_config() -> None:
+            await hass.services.async_call(DOMAIN, "update_config", {
+                "profiles": _changed_profile(entry.options, lux_threshold=31000),
+                "areas": entry.options["areas"],
+            }, blocking=True)
+
+        await _async_measure(bench, "update_config", _update_config, results)
+
+        async def _patch_config() -> None:
+            profile = _changed_profile(entry.options, lux_threshold=32000)[0]
+            await hass.services.async_call(DOMAIN, "patch_config", {"upsert_profiles": [profile]}, blocking=True)
+
+        await _async_measure(bench, "patch_config", _patch_config, results)
+
+        # Options-Flow: Ergebnis wird als Ganzes in den Entry geschrieben → Update-Listener
+        async def _options_flow_save() -> None:
+            options = {**entry.options, "profiles": _changed_profile(entry.options, lux_threshold=33000)}
+            hass.config_entries.async_update_entry(entry, options=options)
+
+        await _async_measure(bench, "options_flow_save", _options_flow_save, results)
+
+        async def _reload() -> None:
+            await hass.config_entries.async_reload(ENTRY_ID)
+
+        await _async_measure(bench, "reload", _reload, results)
+
+        state = hass.states.get(CONFIG_SENSOR)
+        results["options_bytes"] = _json_size(dict(entry.options))
+        results["config_sensor_attr_bytes"] = _json_size(dict(state.attributes)) if state else None
+        storage = os.path.join(bench.config_dir, ".storage", "core.config_entries")
+        results["storage_bytes"] = os.path.getsize(storage) if os.path.exists(storage) else None
+
+        async def _unload() -> None:
+            await hass.config_entries.async_unload(ENTRY_ID)
+
+        await _async_measure(bench, "unload", _unload, results)
+
+        # Registry-Einträge bleiben → Entities werden mit ihren IDs neu angelegt
+        async def _setup_warm() -> None:
+            await hass.config_entries.async_setup(ENTRY_ID)
+
+        await _async_measure(bench, "setup_warm", _setup_warm, results)
+        results["max_slice_ms"] = max(results[f"{step}_max_ms"] for step in STEPS)
+        return results
+
+
+def run_scenario(count: int, start: str) -> dict:
+    """Entry point for the worker process."""
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return run(_async_scenario(count, local_datetime(start)))
+
+
+def _print_table(results: dict) -> None:
+    header = f"{'step':<26}" + "".join(f"{key:>22}" for key in results)
+    print(header)
+    print(f"{'':<26}" + "".join(f"{'wall / loop / max ms':>22}" for _ in results))
+    print("-" * len(header))
+    for step in STEPS:
+        cells = []
+        for r in results.values():
+            mark = "*" if r.get(f"{step}_reloaded") else " "
+            cells.append(f"{r[f'{step}_ms']:.0f} / {r[f'{step}_loop_ms']:.0f} / {r[f'{step}_max_ms']:.0f}{mark}")
+        print(f"{step:<26}" + "".join(f"{c:>22}" for c in cells))
+    print("-" * len(header))
+    for field in ("entities", "options_bytes", "storage_bytes", "config_sensor_attr_bytes"):
+        print(f"{field:<26}" + "".join(f"{r[field]!s:>22}" for r in results.values()))
+    print("* = full reload")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, nargs="+", default=list(DEFAULT_PROFILES))
+    parser.add_argument("--start", default=DEFAULT_START, help="local start time 'YYYY-MM-DD HH:MM'")
+    parser.add_argument("--save", action="store_true", help="store results for this version")
+    parser.add_argument("--baseline", help="compare against this result file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    version = _version()
+    results: dict[str, dict] = {}
+    for count in args.profiles:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results[f"p{count}"] = pool.submit(run_scenario, count, args.start).result()
+        print(f"p{count}: done", file=sys.stderr)
+
+    report = {
+        "version": version,
+        "git": _git_revision(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "homeassistant": _ha_version(),
+        "machine": platform.machine(),
+        "params": {"start": args.start},
+        "scenarios": results,
+    }
+    _print_table(results)
+
+    baseline = load_baseline(args.baseline, version, RESULTS_DIR)
+    regressions = []
+    if baseline:
+        regressions = compare(report, baseline, args.threshold, TRACKED)
+        print(f"\nCompared with {baseline['version']} ({baseline.get('git')}):")
+        print("\n".join(f"  {line}" for line in regressions) or "  no regressions")
+
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{version}.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+        print(f"\nSaved {path}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
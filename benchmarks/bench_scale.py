@@ -0,0 +1,245 @@
+"""Scale benchmark: 10/100/1000 profiles over simulated hours.
+
+    python -m benchmarks.bench_scale                     # 10, 100, 1000 Profile, 4 h
+    python -m benchmarks.bench_scale --profiles 100 --hours 24 --save
+
+Jedes Szenario läuft in einem eigenen Prozess (saubere Speicherspitze).
+Gemessen werden Setup-Zeit, Auswertungen pro Sekunde Loop-Zeit, gesendete
+Befehle, Loop-Zeit pro simulierter Stunde, längste Blockade und maximale
+RSS. Mit ``--save`` landet das Ergebnis unter ``benchmarks/results/<Version>.json``;
+verglichen wird automatisch mit dem Ergebnis der vorherigen Version.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from typing import Optional
+
+from .harness import DOMAIN, INTEGRATION_DIR, REPO_ROOT, bench_hass, local_datetime, run
+from .streams import build_options, initial_states, timeline
+
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+DEFAULT_PROFILES = (10, 100, 1000)
+DEFAULT_HOURS = 4.0
+DEFAULT_START = "2026-06-22 05:00"  # Montag, Sonnenaufgang und Vormittag
+DEFAULT_THRESHOLD = 0.2             # ±20 % gelten als Regression
+
+# Kennzahl → True, wenn größer besser ist
+TRACKED = {
+    "setup_s": False,
+    "evaluations_per_s": True,
+    "loop_ms_per_hour": False,
+    "max_slice_ms": False,
+    "peak_rss_mb": False,
+}
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+async def _async_scenario(count: int, hours: float, start: datetime, seed: int, compact: bool) -> dict:
+    from custom_components.shutterpilot.const import METRICS
+
+    async with bench_hass(start) as bench:
+        hass = bench.hass
+        bench.register_cover_services()
+        for change in initial_states(hass, count, start):
+            hass.states.async_set(change.entity_id, change.state, change.attributes)
+        events = timeline(hass, count, start, hours, seed)
+        rss_base = _rss_mb()
+
+        bench.loop.reset_stats()
+        started = time.perf_counter()
+        entry = await bench.async_setup_shutterpilot(build_options(count, compact))
+        setup_s = time.perf_counter() - started
+        setup_max_slice = bench.loop.max_slice
+        metrics = hass.data[DOMAIN][entry.entry_id][METRICS]
+        startup_commands = bench.commands.total
+
+        def evaluations() -> float:
+            return metrics.summary().get("shutterpilot_evaluations_total", 0)
+
+        bench.loop.reset_stats()
+        eval_start = evaluations()
+        hour_end = start + timedelta(hours=1)
+        hourly: list[float] = []
+        busy_mark = 0.0
+        for change in events:
+            while change.at >= hour_end:
+                await bench.clock.sleep_until(hour_end)
+                hourly.append((bench.loop.busy - busy_mark) * 1000)
+                busy_mark = bench.loop.busy
+                hour_end += timedelta(hours=1)
+            await bench.clock.sleep_until(change.at)
+            hass.states.async_set(change.entity_id, change.state, change.attributes)
+        end = start + timedelta(hours=hours)
+        while hour_end <= end:
+            await bench.clock.sleep_until(hour_end)
+            hourly.append((bench.loop.busy - busy_mark) * 1000)
+            busy_mark = bench.loop.busy
+            hour_end += timedelta(hours=1)
+        await hass.async_block_till_done()
+
+        evaluated = evaluations() - eval_start
+        busy = bench.loop.busy
+        return {
+            "profiles": count,
+            "hours": hours,
+            "events": len(events),
+            "setup_s": round(setup_s, 3),
+            "setup_max_slice_ms": round(setup_max_slice * 1000, 1),
+            "evaluations": int(evaluated),
+            "evaluations_per_s": round(evaluated / busy, 1) if busy else None,
+            "commands_startup": startup_commands,
+            "commands": bench.commands.total - startup_commands,
+            "loop_ms_per_hour": round(sum(hourly) / len(hourly), 1) if hourly else None,
+            "loop_ms_hourly": [round(v, 1) for v in hourly],
+            "max_slice_ms": round(bench.loop.max_slice * 1000, 2),
+            "rss_base_mb": round(rss_base, 1),
+            "peak_rss_mb": round(_rss_mb(), 1),
+        }
+
+
+def run_scenario(count: int, hours: float, start: str, seed: int, compact: bool = False) -> dict:
+    """Entry point for the worker process."""
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return run(_async_scenario(count, hours, local_datetime(start), seed, compact))
+
+
+def _version() -> str:
+    with open(os.path.join(INTEGRATION_DIR, "manifest.json"), encoding="utf-8") as fh:
+        return json.load(fh)["version"]
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _version_key(version: str) -> tuple:
+    return tuple(int(p) if p.isdigit() else 0 for p in version.split("."))
+
+
+def load_baseline(path: Optional[str], version: str, results_dir: str = RESULTS_DIR) -> Optional[dict]:
+    """Explicit file, otherwise the newest stored result of an older version."""
+    if path:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    if not os.path.isdir(results_dir):
+        return None
+    older = [
+        name[:-5] for name in os.listdir(results_dir)
+        if name.endswith(".json") and _version_key(name[:-5]) < _version_key(version)
+    ]
+    if not older:
+        return None
+    with open(os.path.join(results_dir, max(older, key=_version_key) + ".json"), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def compare(current: dict, baseline: dict, threshold: float, tracked: dict = TRACKED) -> list[str]:
+    """Human-readable regressions and behaviour changes against the baseline."""
+    findings = []
+    for key, result in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(key)
+        if not old:
+            continue
+        for metric, higher_is_better in tracked.items():
+            new_value, old_value = result.get(metric), old.get(metric)
+            if not new_value or not old_value:
+                continue
+            change = (new_value - old_value) / old_value
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                findings.append(f"{key}: {metric} {old_value} → {new_value} ({change:+.0%})")
+        if result.get("commands") != old.get("commands"):
+            findings.append(f"{key}: commands {old.get('commands')} → {result.get('commands')} (behaviour changed)")
+    return findings
+
+
+def _print_table(results: dict) -> None:
+    header = f"{'scenario':<10} {'setup s':>8} {'evals':>8} {'evals/s':>9} {'cmds':>6} {'loop ms/h':>10} {'max ms':>8} {'RSS MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for key, r in results.items():
+        print(f"{key:<10} {r['setup_s']:>8} {r['evaluations']:>8} {r['evaluations_per_s']:>9} "
+              f"{r['commands']:>6} {r['loop_ms_per_hour']:>10} {r['max_slice_ms']:>8} {r['peak_rss_mb']:>8}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, nargs="+", default=list(DEFAULT_PROFILES))
+    parser.add_argument("--hours", type=float, default=DEFAULT_HOURS)
+    parser.add_argument("--start", default=DEFAULT_START, help="local start time 'YYYY-MM-DD HH:MM'")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--compact", action="store_true", help="compact entity mode")
+    parser.add_argument("--save", action="store_true", help="store results for this version")
+    parser.add_argument("--baseline", help="compare against this result file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    version = _version()
+    results: dict[str, dict] = {}
+    for count in args.profiles:
+        # Eigener Prozess pro Szenario: Speicherspitze und Caches nicht geteilt
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results[f"p{count}"] = pool.submit(
+                run_scenario, count, args.hours, args.start, args.seed, args.compact
+            ).result()
+        print(f"p{count}: done", file=sys.stderr)
+
+    report = {
+        "version": version,
+        "git": _git_revision(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "homeassistant": _ha_version(),
+        "machine": platform.machine(),
+        "params": {"hours": args.hours, "start": args.start, "seed": args.seed, "compact": args.compact},
+        "scenarios": results,
+    }
+    _print_table(results)
+
+    baseline = load_baseline(args.baseline, version)
+    regressions = []
+    if baseline:
+        if baseline.get("params") != report["params"]:
+            print(f"\nNote: baseline {baseline['version']} used different parameters {baseline.get('params')}")
+        regressions = compare(report, baseline, args.threshold)
+        print(f"\nCompared with {baseline['version']} ({baseline.get('git')}):")
+        print("\n".join(f"  {line}" for line in regressions) or "  no regressions")
+
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{version}.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+        print(f"\nSaved {path}")
+    return 1 if regressions else 0
+
+
+def _ha_version() -> str:
+    from homeassistant.const import __version__
+    return __version__
+
+
+if __name__ == "__main__":
+    sys.exit(main())
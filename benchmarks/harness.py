@@ -0,0 +1,332 @@
+"""In-memory Home Assistant stand-in with a virtual clock.
+
+Die Benchmarks laufen gegen den echten Home-Assistant-Kern (State Machine,
+Event Bus, Service Registry, Entity-/Geräte-Registry) in einem temporären
+Konfigurationsverzeichnis – ohne HTTP-Server, Recorder und Frontend. Die
+Event-Loop hat eine virtuelle Uhr: Wartet sie nur noch auf Timer, springt
+die Zeit direkt zum nächsten Timer. Eine simulierte Stunde kostet damit nur
+die Rechenzeit der Callbacks, und genau diese Rechenzeit wird gemessen.
+"""
+from __future__ import annotations
+import asyncio
+import importlib
+import os
+import random
+import shutil
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Optional
+
+from homeassistant import config_entries, core, loader
+from homeassistant.core import CoreState, HomeAssistant, ServiceCall
+from homeassistant.helpers import entity, event as ha_event, translation
+from homeassistant.util import dt as dt_util
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTEGRATION_DIR = os.path.join(REPO_ROOT, "custom_components", "shutterpilot")
+DOMAIN = "shutterpilot"
+
+# Standort für Sonnenstand/-auf-/-untergang (Mitte Deutschlands)
+LATITUDE = 51.16
+LONGITUDE = 10.45
+TIME_ZONE = "Europe/Berlin"
+
+_REGISTRIES = ("area_registry", "device_registry", "entity_registry",
+               "floor_registry", "label_registry", "issue_registry")
+
+
+class _VirtualSelector:
+    """Selector proxy: instead of sleeping until the next timer, advance the clock."""
+
+    def __init__(self, selector, loop: "VirtualClockLoop"):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout=None):
+        started = time.perf_counter()
+        try:
+            if timeout is not None and timeout <= 0:
+                return self._selector.select(0)
+            if self._loop.executor_pending:
+                # Executor-Job läuft: wirklich warten, sonst liefe die Uhr dem Thread davon
+                events = self._selector.select(timeout)
+                if not events and timeout is not None:
+                    self._loop.advance(timeout)
+                return events
+            events = self._selector.select(0)
+            if events or timeout is None:
+                return events or self._selector.select(None)
+            self._loop.advance(timeout)
+            return []
+        finally:
+            self._loop.idle += time.perf_counter() - started
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose ``time()`` only moves when the loop would otherwise wait.
+
+    ``busy`` ist die reale Rechenzeit in Callbacks, ``max_slice`` der längste
+    einzelne Loop-Durchlauf (= längste Blockade der Event-Loop).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._selector = _VirtualSelector(self._selector, self)
+        self._virtual = 0.0
+        self.executor_pending = 0
+        self.idle = 0.0
+        self.busy = 0.0
+        self.max_slice = 0.0
+
+    def time(self) -> float:
+        return self._virtual
+
+    def advance(self, seconds: float) -> None:
+        self._virtual += seconds
+
+    def run_in_executor(self, executor, func, *args):
+        future = super().run_in_executor(executor, func, *args)
+        self.executor_pending += 1
+        future.add_done_callback(self._executor_done)
+        return future
+
+    def _executor_done(self, _future) -> None:
+        self.executor_pending -= 1
+
+    def _run_once(self):
+        idle_before = self.idle
+        started = time.perf_counter()
+        super()._run_once()
+        elapsed = time.perf_counter() - started - (self.idle - idle_before)
+        self.busy += elapsed
+        if elapsed > self.max_slice:
+            self.max_slice = elapsed
+
+    def reset_stats(self) -> None:
+        self.busy = 0.0
+        self.max_slice = 0.0
+
+
+class _TimeShim:
+    """Stand-in for the ``time`` module inside HA core/event helpers."""
+
+    def __init__(self, clock: "VirtualClock"):
+        self._clock = clock
+
+    def time(self) -> float:
+        return self._clock.timestamp()
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class VirtualClock:
+    """Maps the loop's virtual time onto wall-clock datetimes for HA."""
+
+    def __init__(self, loop: VirtualClockLoop, start: datetime):
+        self._loop = loop
+        self._t0 = loop.time()
+        self._start = start.timestamp()
+        self._patches: list[tuple[object, str, object]] = []
+
+    def timestamp(self) -> float:
+        return self._start + (self._loop.time() - self._t0)
+
+    def utcnow(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp(), timezone.utc)
+
+    def now(self, time_zone=None) -> datetime:
+        return datetime.fromtimestamp(self.timestamp(), time_zone or dt_util.DEFAULT_TIME_ZONE)
+
+    async def sleep_until(self, when) -> None:
+        """Advance to ``when`` (datetime or POSIX timestamp)."""
+        target = when if isinstance(when, (int, float)) else when.timestamp()
+        await asyncio.sleep(max(0.0, target - self.timestamp()))
+
+    def install(self) -> None:
+        shim = _TimeShim(self)
+        # Dieselben Stellen, die auch die HA-Tests für Zeitreisen patchen
+        for target, name, value in (
+            (dt_util, "utcnow", self.utcnow),
+            (dt_util, "now", self.now),
+            (ha_event, "time_tracker_utcnow", self.utcnow),
+            (ha_event, "time_tracker_timestamp", self.timestamp),
+            (ha_event, "time", shim),
+            (core, "time", shim),
+        ):
+            self._patches.append((target, name, getattr(target, name)))
+            setattr(target, name, value)
+
+    def uninstall(self) -> None:
+        while self._patches:
+            target, name, value = self._patches.pop()
+            setattr(target, name, value)
+
+
+class _NullHttp:
+    """``hass.http`` without a server: views are only collected."""
+
+    def __init__(self):
+        self.views: list = []
+
+    def register_view(self, view) -> None:
+        self.views.append(view)
+
+
+@dataclass
+class CommandLog:
+    """Cover/light service calls issued by ShutterPilot."""
+
+    calls: list[tuple[float, str, str, dict]] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.calls)
+
+    def count(self, service: Optional[str] = None) -> int:
+        return sum(1 for c in self.calls if service is None or c[2] == service)
+
+
+@dataclass
+class BenchHass:
+    hass: HomeAssistant
+    loop: VirtualClockLoop
+    clock: VirtualClock
+    commands: CommandLog
+    config_dir: str
+
+    async def async_setup_shutterpilot(self, options: dict, entry_id: str = "bench",
+                                       entities: bool = True) -> config_entries.ConfigEntry:
+        """Create the config entry and set it up.
+
+        ``entities=False`` lässt die Entity-Plattformen weg (nur Entscheidungen,
+        z. B. für den Replay-Simulator) – deutlich schneller.
+        """
+        if not entities:
+            async def _no_platforms(_entry, _platforms) -> None:
+                return None
+            self.hass.config_entries.async_forward_entry_setups = _no_platforms
+        entry = config_entries.ConfigEntry(
+            version=1, minor_version=1, domain=DOMAIN, title="ShutterPilot",
+            data={}, source=config_entries.SOURCE_USER, options=options, entry_id=entry_id,
+        )
+        await self.hass.config_entries.async_add(entry)
+        await self.hass.async_block_till_done()
+        return entry
+
+    def register_cover_services(self, travel_time: float = 0.0,
+                                on_command: Optional[Callable[[ServiceCall], None]] = None) -> None:
+        """Fake cover/light services; covers report the target position after ``travel_time``.
+
+        ``on_command`` sieht jeden Befehl, bevor sich ein Zustand ändert (z. B. Invarianten prüfen).
+        """
+        hass = self.hass
+
+        async def _handle(call: ServiceCall) -> None:
+            self.commands.calls.append((self.clock.timestamp(), call.domain, call.service, dict(call.data)))
+            if on_command is not None:
+                on_command(call)
+            if call.domain != "cover":
+                return
+            ids = call.data.get("entity_id") or []
+            ids = [ids] if isinstance(ids, str) else ids
+            position = {"open_cover": 100, "close_cover": 0}.get(call.service, call.data.get("position"))
+            if position is None:
+                return
+            if travel_time:
+                await asyncio.sleep(travel_time)
+            for entity_id in ids:
+                old = hass.states.get(entity_id)
+                attrs = dict(old.attributes) if old else {}
+                attrs["current_position"] = position
+                hass.states.async_set(entity_id, "open" if position else "closed", attrs)
+
+        for service in ("open_cover", "close_cover", "stop_cover", "set_cover_position", "set_cover_tilt_position"):
+            hass.services.async_register("cover", service, _handle)
+        for service in ("turn_on", "turn_off"):
+            hass.services.async_register("light", service, _handle)
+
+
+@dataclass(frozen=True)
+class Location:
+    latitude: float = LATITUDE
+    longitude: float = LONGITUDE
+    time_zone: str = TIME_ZONE
+
+
+async def _async_create_hass(config_dir: str, start: datetime, location: Location) -> BenchHass:
+    loop = asyncio.get_running_loop()
+    if not isinstance(loop, VirtualClockLoop):
+        raise RuntimeError("Benchmarks must run on a VirtualClockLoop (use run())")
+
+    hass = HomeAssistant(config_dir)
+    hass.config.latitude = location.latitude
+    hass.config.longitude = location.longitude
+    hass.config.elevation = 200
+    hass.config.set_time_zone(location.time_zone)
+    hass.config.skip_pip = True
+    hass.http = _NullHttp()
+    # Abhängigkeiten aus manifest.json als geladen markieren (kein Webserver)
+    hass.config.components.update({"http", "websocket_api"})
+
+    clock = VirtualClock(loop, start)
+    clock.install()
+
+    loader.async_setup(hass)
+    entity.async_setup(hass)
+    translation.async_setup(hass)
+    for name in _REGISTRIES:
+        try:
+            module = importlib.import_module(f"homeassistant.helpers.{name}")
+        except ImportError:  # ältere HA-Versionen ohne Floor-/Label-Registry
+            continue
+        await module.async_load(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    hass.set_state(CoreState.running)
+    return BenchHass(hass, loop, clock, CommandLog(), config_dir)
+
+
+@asynccontextmanager
+async def bench_hass(start: datetime, location: Location = Location()) -> AsyncIterator[BenchHass]:
+    """Throwaway Home Assistant with ShutterPilot available as custom component."""
+    config_dir = tempfile.mkdtemp(prefix="shutterpilot_bench_")
+    os.makedirs(os.path.join(config_dir, "custom_components"))
+    os.symlink(INTEGRATION_DIR, os.path.join(config_dir, "custom_components", DOMAIN))
+    bench = await _async_create_hass(config_dir, start, location)
+    try:
+        yield bench
+    finally:
+        try:
+            await bench.hass.async_stop(force=True)
+        finally:
+            bench.clock.uninstall()
+            shutil.rmtree(config_dir, ignore_errors=True)
+
+
+def run(coro):
+    """Run a benchmark coroutine on a fresh virtual-clock loop."""
+    loop = VirtualClockLoop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.run_until_complete(loop.shutdown_default_executor())
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def local_datetime(value: str, time_zone: str = TIME_ZONE) -> datetime:
+    """``YYYY-MM-DD HH:MM`` in the benchmark time zone."""
+    return datetime.strptime(value, "%Y-%m-%d %H:%M").replace(tzinfo=dt_util.get_time_zone(time_zone))
+
+
+def seeded(seed: int, *parts) -> random.Random:
+    """Independent, reproducible random stream per sensor."""
+    return random.Random(f"{seed}:" + ":".join(map(str, parts)))
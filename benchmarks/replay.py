@@ -0,0 +1,402 @@
+"""Replay recorded sensor history through ShutterPilot's policy.
+
+    python -m benchmarks.replay --config diagnostics.json --history history.csv
+    python -m benchmarks.replay --config options.json --history h.json --set lux_threshold=40000
+    python -m benchmarks.replay --config a.json --config b.json --history h.csv --out report.json
+
+Eingaben:
+- ``--config``: Diagnosedaten-Download, ``.storage/core.config_entries`` oder
+  direkt das Options-Dict (mit ``profiles``/``areas``). Mehrere Konfigurationen
+  bzw. ``--set key=value`` (für alle Profile) werden nebeneinander verglichen.
+- ``--history``: Verlaufs-Export aus Home Assistant – CSV aus dem Verlauf
+  (``entity_id,state,last_changed``), JSON der REST-API ``/api/history/period``
+  oder das kompakte Format von ``history/history_during_period``.
+
+Der Zeitraum wird in Tage (lokale Mitternacht) zerlegt; jeder Tag läuft mit
+virtueller Uhr in einem eigenen Prozess des Pools und beginnt ``--warmup``
+Stunden früher mit den zuletzt aufgezeichneten Zuständen, damit Hysterese,
+Cooldown und Rollladenpositionen eingeschwungen sind. Rollladen-Zustände aus
+dem Verlauf dienen nur als Startposition – danach fahren die simulierten
+Rollläden. Fehlt ``sun.sun`` mit Elevation/Azimut im Verlauf, wird der
+Sonnenstand aus ``--latitude``/``--longitude`` berechnet.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from multiprocessing import get_context
+from typing import Iterable, Optional
+
+from homeassistant.util import dt as dt_util
+
+from .harness import DOMAIN, LATITUDE, LONGITUDE, REPO_ROOT, TIME_ZONE, Location, bench_hass, run
+
+DEFAULT_WARMUP_HOURS = 2.0
+SUN_INTERVAL = 240  # s, wie die sun-Integration
+_OWN_PREFIXES = tuple(f"{d}.shutterpilot_" for d in ("sensor", "switch", "number"))
+
+# (Zeitstempel, entity_id, state, attributes)
+Record = tuple[float, str, str, Optional[dict]]
+
+
+# ---------- Eingaben ----------
+def load_options(path: str) -> dict:
+    """ShutterPilot options from a diagnostics download, core.config_entries or a plain dict."""
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    if "profiles" in data:
+        return data
+    inner = data.get("data", {})
+    options = inner.get("config_entry", {}).get("options")
+    if options is not None:
+        return options
+    for entry in inner.get("entries", []):
+        if entry.get("domain") == DOMAIN:
+            return entry.get("options", {})
+    raise ValueError(f"{path}: no ShutterPilot options found")
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    parsed = dt_util.parse_datetime(str(value))
+    if parsed is None:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _from_state_dicts(states: Iterable[dict], entity_id: Optional[str] = None) -> Iterable[Record]:
+    attrs: Optional[dict] = None
+    for st in states:
+        eid = st.get("entity_id", entity_id)
+        if "s" in st:  # kompaktes Websocket-Format; Attribute nur bei Änderung
+            attrs = st.get("a", attrs)
+            yield _timestamp(st.get("lu", st.get("lc"))), eid, st["s"], attrs
+        else:
+            yield _timestamp(st.get("last_changed") or st["last_updated"]), eid, st["state"], st.get("attributes")
+
+
+def load_history(paths: Iterable[str]) -> list[Record]:
+    """All records of all files, sorted by time."""
+    records: list[Record] = []
+    for path in paths:
+        if path.lower().endswith(".csv"):
+            with open(path, encoding="utf-8", newline="") as fh:
+                for row in csv.DictReader(fh):
+                    records.append((_timestamp(row["last_changed"]), row["entity_id"], row["state"], None))
+            continue
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if isinstance(data, dict):
+            for eid, states in data.items():
+                records.extend(_from_state_dicts(states, eid))
+        else:
+            for group in data:
+                records.extend(_from_state_dicts(group if isinstance(group, list) else [group]))
+    records = [r for r in records if not r[1].startswith(_OWN_PREFIXES)]
+    records.sort(key=lambda r: r[0])
+    return records
+
+
+def apply_overrides(options: dict, overrides: list[str]) -> dict:
+    """``key=value`` for every profile (value as JSON if possible)."""
+    profiles = [dict(p) for p in options.get("profiles", [])]
+    for item in overrides:
+        key, _, raw = item.partition("=")
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        for prof in profiles:
+            prof[key.strip()] = value
+    return {**options, "profiles": profiles}
+
+
+# ---------- Simulation eines Tages (Worker) ----------
+@dataclass
+class Job:
+    variant: str
+    options: dict
+    initial: dict          # entity_id → (state, attributes)
+    events: list           # Records ab warmup_start
+    warmup_start: float
+    start: float
+    end: float
+    location: Location
+    synth_sun: bool
+    travel_time: float
+
+
+def _cover_position(state: str, attrs: Optional[dict]) -> int:
+    if attrs and attrs.get("current_position") is not None:
+        return int(attrs["current_position"])
+    return 0 if state == "closed" else 100
+
+
+def _sun_records(hass, start: float, end: float) -> list[Record]:
+    from homeassistant.helpers.sun import get_astral_location
+    from .streams import sun_state
+    location, _elevation = get_astral_location(hass)
+    result = []
+    t = start
+    while t < end:
+        state, attrs = sun_state(location, datetime.fromtimestamp(t, timezone.utc))
+        result.append((t, "sun.sun", state, attrs))
+        t += SUN_INTERVAL
+    return result
+
+
+async def _async_simulate(job: Job) -> dict:
+    from custom_components.shutterpilot.audit import AuditTrail, RESULT_SENT
+    from custom_components.shutterpilot.const import RUNTIME_PROFILES
+
+    async with bench_hass(datetime.fromtimestamp(job.warmup_start, timezone.utc), job.location) as bench:
+        hass = bench.hass
+        bench.register_cover_services(job.travel_time)
+        covers = {p.get("cover_entity_id") for p in job.options.get("profiles", [])} - {None}
+        for eid, (state, attrs) in job.initial.items():
+            if eid not in covers:
+                hass.states.async_set(eid, state, attrs)
+        positions: dict[str, int] = {}
+        for cover in covers:
+            state, attrs = job.initial.get(cover, ("open", None))
+            positions[cover] = position = _cover_position(state, attrs)
+            hass.states.async_set(cover, "open" if position else "closed", {"current_position": position})
+        events = job.events
+        if job.synth_sun:
+            events = sorted(events + _sun_records(hass, job.warmup_start, job.end), key=lambda r: r[0])
+
+        entry = await bench.async_setup_shutterpilot(job.options, entities=False)
+        decisions: list[tuple] = []
+
+        class _RecordingAudit(AuditTrail):
+            """Audit trail that also reports commands and rule changes with the simulated time."""
+
+            def __init__(self, ctrl):
+                super().__init__()
+                self.ctrl = ctrl
+                self.rule = None
+
+            def append(self, source, rule, reason, target, result, *inputs):
+                super().append(source, rule, reason, target, result, *inputs)
+                sent = result == RESULT_SENT
+                if sent or rule != self.rule:
+                    decisions.append((bench.clock.timestamp(), self.ctrl.cover, self.ctrl.name,
+                                      rule, reason, target, sent, source))
+                    self.rule = rule
+
+        for ctrl in hass.data[DOMAIN][entry.entry_id][RUNTIME_PROFILES]:
+            ctrl._audit = _RecordingAudit(ctrl)
+
+        for ts, eid, state, attrs in events:
+            if eid in covers:
+                continue
+            await bench.clock.sleep_until(ts)
+            hass.states.async_set(eid, state, attrs)
+        await bench.clock.sleep_until(job.end)
+        await hass.async_block_till_done()
+
+    return _summarize(job, decisions, positions)
+
+
+def _summarize(job: Job, decisions: list[tuple], positions: dict[str, int]) -> dict:
+    """Per cover inside [start, end): commands, real moves (position changed) and time in shade.
+
+    Zeit im Sonnenschutz = Zeit, in der die Beschattungsregel die Entscheidung
+    trifft – auch wenn der Rollladen dafür nicht fahren musste.
+    """
+    covers: dict[str, dict] = {}
+    shade_since: dict[str, Optional[float]] = {}
+    for ts, cover, profile, rule, reason, target, sent, source in decisions:
+        stats = covers.setdefault(cover, {"profile": profile, "commands": 0, "moves": 0,
+                                          "by_rule": Counter(), "shade_s": 0.0, "timeline": []})
+        in_window = ts >= job.start
+        since = shade_since.get(cover)
+        if rule == "shade":
+            if since is None:
+                shade_since[cover] = ts
+        elif since is not None:
+            if in_window:
+                stats["shade_s"] += ts - max(since, job.start)
+            shade_since[cover] = None
+        if not sent:
+            continue
+        moved = target != positions.get(cover)
+        positions[cover] = target
+        if not in_window:
+            continue
+        stats["commands"] += 1
+        if moved:
+            stats["moves"] += 1
+            stats["by_rule"][rule or "?"] += 1
+            stats["timeline"].append((ts, target, rule, reason, source))
+    for cover, since in shade_since.items():
+        if since is not None:
+            covers[cover]["shade_s"] += job.end - max(since, job.start)
+    for stats in covers.values():
+        stats["by_rule"] = dict(stats["by_rule"])
+    return {"variant": job.variant, "start": job.start, "covers": covers}
+
+
+def simulate(job: Job) -> dict:
+    """Worker entry point (separate process)."""
+    import logging
+    logging.basicConfig(level=logging.ERROR)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return run(_async_simulate(job))
+
+
+# ---------- Aufteilung und Auswertung ----------
+def build_jobs(variants: dict[str, dict], records: list[Record], first: datetime, last: datetime,
+               warmup: float, location: Location, travel_time: float) -> list[Job]:
+    synth_sun = not any(r[1] == "sun.sun" and r[3] and "elevation" in r[3] for r in records)
+    days = []
+    day = first
+    while day < last:
+        days.append(day)
+        day += timedelta(days=1)  # Wanduhrzeit: bleibt auch bei Zeitumstellung Mitternacht
+    jobs = []
+    last_state: dict[str, tuple] = {}
+    idx = 0
+    for day in days:
+        start = day.timestamp()
+        end = min(last, day + timedelta(days=1)).timestamp()
+        warmup_start = start - warmup * 3600
+        while idx < len(records) and records[idx][0] < warmup_start:
+            ts, eid, state, attrs = records[idx]
+            last_state[eid] = (state, attrs)
+            idx += 1
+        lo = idx
+        hi = lo
+        while hi < len(records) and records[hi][0] < end:
+            hi += 1
+        events = records[lo:hi]
+        for name, options in variants.items():
+            jobs.append(Job(name, options, dict(last_state), events, warmup_start, start, end,
+                            location, synth_sun, travel_time))
+    return jobs
+
+
+def merge(results: list[dict]) -> dict[str, dict[str, dict]]:
+    """variant → cover → totals and timeline."""
+    merged: dict[str, dict[str, dict]] = {}
+    for res in sorted(results, key=lambda r: r["start"]):
+        for cover, stats in res["covers"].items():
+            total = merged.setdefault(res["variant"], {}).setdefault(
+                cover, {"profile": stats["profile"], "commands": 0, "moves": 0, "by_rule": Counter(),
+                        "shade_s": 0.0, "timeline": []})
+            total["commands"] += stats["commands"]
+            total["moves"] += stats["moves"]
+            total["by_rule"].update(stats["by_rule"])
+            total["shade_s"] += stats["shade_s"]
+            total["timeline"].extend(stats["timeline"])
+    return merged
+
+
+def _print_report(merged: dict) -> None:
+    variants = list(merged)
+    covers = sorted({c for v in merged.values() for c in v})
+    header = f"{'cover':<32}" + "".join(f" {v[:32]:>32}" for v in variants)
+    print(header)
+    print(" " * 32 + "".join(f" {'cmds':>7} {'moves':>7} {'shade h':>8} {'top':>7}" for _ in variants))
+    print("-" * len(header))
+    for cover in covers:
+        line = f"{cover:<32}"
+        for v in variants:
+            stats = merged[v].get(cover)
+            if not stats:
+                line += f" {'-':>7} {'-':>7} {'-':>8} {'':>7}"
+                continue
+            top = stats["by_rule"].most_common(1)[0][0] if stats["by_rule"] else ""
+            line += f" {stats['commands']:>7} {stats['moves']:>7} {stats['shade_s'] / 3600:>8.1f} {top[:7]:>7}"
+        print(line)
+    for v in variants:
+        commands = sum(s["commands"] for s in merged[v].values())
+        moves = sum(s["moves"] for s in merged[v].values())
+        shade = sum(s["shade_s"] for s in merged[v].values()) / 3600
+        rules = sum((s["by_rule"] for s in merged[v].values()), Counter())
+        print(f"\n{v}: {commands} commands, {moves} moves, {shade:.1f} h in shade, "
+              f"moves by rule: {dict(rules.most_common())}")
+
+
+def _report_json(merged: dict, time_zone) -> dict:
+    return {
+        variant: {
+            cover: {
+                "profile": s["profile"],
+                "commands": s["commands"],
+                "moves": s["moves"],
+                "by_rule": dict(s["by_rule"]),
+                "time_in_shade_h": round(s["shade_s"] / 3600, 2),
+                "timeline": [
+                    {"time": datetime.fromtimestamp(ts, time_zone).isoformat(timespec="seconds"),
+                     "position": target, "rule": rule, "reason": reason, "source": source}
+                    for ts, target, rule, reason, source in s["timeline"]
+                ],
+            }
+            for cover, s in covers.items()
+        }
+        for variant, covers in merged.items()
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", action="append", required=True, help="options/diagnostics JSON (repeatable)")
+    parser.add_argument("--history", action="append", required=True, help="history CSV/JSON (repeatable)")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="variant of the first config with KEY=VALUE for all profiles")
+    parser.add_argument("--from", dest="date_from", help="first local day YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", help="last local day YYYY-MM-DD (inclusive)")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP_HOURS, help="hours replayed before each day")
+    parser.add_argument("--travel-time", type=float, default=0.0, help="simulated cover travel time in s")
+    parser.add_argument("--latitude", type=float, default=LATITUDE)
+    parser.add_argument("--longitude", type=float, default=LONGITUDE)
+    parser.add_argument("--time-zone", default=TIME_ZONE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", help="write per-cover timelines as JSON")
+    args = parser.parse_args(argv)
+
+    variants = {os.path.basename(path): load_options(path) for path in args.config}
+    if args.set:
+        base = next(iter(variants.values()))
+        variants[" ".join(args.set)] = apply_overrides(base, args.set)
+    records = load_history(args.history)
+    if not records:
+        parser.error("history is empty")
+
+    tz = dt_util.get_time_zone(args.time_zone)
+    location = Location(args.latitude, args.longitude, args.time_zone)
+    first_local = datetime.fromtimestamp(records[0][0], tz)
+    last_local = datetime.fromtimestamp(records[-1][0], tz)
+    first = (datetime.strptime(args.date_from, "%Y-%m-%d").replace(tzinfo=tz) if args.date_from
+             else first_local.replace(hour=0, minute=0, second=0, microsecond=0))
+    last = (datetime.strptime(args.date_to, "%Y-%m-%d").replace(tzinfo=tz) + timedelta(days=1) if args.date_to
+            else last_local)
+    jobs = build_jobs(variants, records, first, last, args.warmup, location, args.travel_time)
+    print(f"Replaying {len(records)} records, {first:%Y-%m-%d} – {last:%Y-%m-%d %H:%M}, "
+          f"{len(jobs)} job(s) on {args.workers} worker(s)", file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=get_context("spawn")) as pool:
+        results = list(pool.map(simulate, jobs))
+    merged = merge(results)
+    _print_report(merged)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(_report_json(merged, tz), fh, indent=2, ensure_ascii=False)
+            fh.write("\n")
+        print(f"\nWrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Synthetic house: profile configs and sensor streams for the benchmarks.
+
+Alle Ströme sind deterministisch (Seed) und werden vorab als Zeitleiste
+erzeugt, damit der Treiber während der Messung nur noch States setzt.
+"""
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from homeassistant.helpers.sun import get_astral_location
+
+from .harness import seeded
+
+PROFILES_PER_SENSOR = 10  # ein Lux-/Temperatursensor pro 10 Rollläden
+DOOR_EVERY = 10           # jedes 10. Profil hat eine Tür
+
+AREAS = {
+    "living": {"area_name": "Wohnbereich", "area_mode": "sun",
+               "up_time_weekday": "07:00", "down_time_weekday": "22:00",
+               "up_time_weekend": "08:00", "down_time_weekend": "23:00"},
+    "sleeping": {"area_name": "Schlafbereich", "area_mode": "brightness",
+                 "brightness_sensor": "sensor.bench_lux_0",
+                 "brightness_down_lux": 200, "brightness_up_lux": 2000},
+    "children": {"area_name": "Kinderbereich", "area_mode": "time_only",
+                 "up_time_weekday": "06:45", "down_time_weekday": "19:30",
+                 "up_time_weekend": "08:00", "down_time_weekend": "20:00"},
+}
+_AREA_IDS = tuple(AREAS)
+_FACADES = (90, 135, 180, 225, 270)
+
+
+@dataclass(frozen=True)
+class StateChange:
+    at: datetime
+    entity_id: str
+    state: str
+    attributes: Optional[dict] = None
+
+
+def build_options(count: int, compact: bool = False) -> dict:
+    """Options for ``count`` profiles spread over three areas and five facades."""
+    profiles = []
+    for i in range(count):
+        facade = _FACADES[i % len(_FACADES)]
+        sensor = i // PROFILES_PER_SENSOR
+        prof = {
+            "id": f"bench{i:05d}",
+            "name": f"Bench {i:04d}",
+            "cover_entity_id": f"cover.bench_{i}",
+            "area": _AREA_IDS[i % len(_AREA_IDS)],
+            "window_sensor": f"binary_sensor.bench_window_{i}",
+            "lux_sensor": f"sensor.bench_lux_{sensor}",
+            "temp_sensor": f"sensor.bench_temp_{sensor}",
+            "lux_threshold": 30000,
+            "temp_threshold": 25,
+            "azimuth_min": facade - 60,
+            "azimuth_max": facade + 60,
+            "day_position": 100,
+            "night_position": 0,
+            "vent_position": 30,
+            "door_safe_position": 100,
+            "cooldown_sec": 120,
+        }
+        if i % DOOR_EVERY == 0:
+            prof["door_sensor"] = f"binary_sensor.bench_door_{i}"
+        profiles.append(prof)
+    return {"global_auto": True, "compact_entities": compact, "areas": AREAS, "profiles": profiles}
+
+
+def initial_states(hass, count: int, start: datetime) -> Iterator[StateChange]:
+    """States before setup (sun and sensors at ``start``, covers up, windows and doors closed)."""
+    location, _elevation = get_astral_location(hass)
+    state, attrs = sun_state(location, start)
+    yield StateChange(start, "sun.sun", state, attrs)
+    lux = 60000 * math.sin(math.radians(max(0.0, attrs["elevation"])))
+    for k in range(math.ceil(count / PROFILES_PER_SENSOR)):
+        yield StateChange(start, f"sensor.bench_lux_{k}", str(round(lux)))
+        yield StateChange(start, f"sensor.bench_temp_{k}", "20.0")
+    for i in range(count):
+        yield StateChange(start, f"cover.bench_{i}", "open", {"current_position": 100})
+        yield StateChange(start, f"binary_sensor.bench_window_{i}", "off")
+        if i % DOOR_EVERY == 0:
+            yield StateChange(start, f"binary_sensor.bench_door_{i}", "off")
+
+
+def sun_state(location, when: datetime) -> tuple[str, dict]:
+    elevation = location.solar_elevation(when)
+    azimuth = location.solar_azimuth(when)
+    state = "above_horizon" if elevation > -0.833 else "below_horizon"
+    return state, {"elevation": round(elevation, 2), "azimuth": round(azimuth, 2)}
+
+
+def timeline(hass, count: int, start: datetime, hours: float, seed: int) -> list[StateChange]:
+    """All sensor changes of the simulated period, sorted by time."""
+    end = start + timedelta(hours=hours)
+    location, _elevation = get_astral_location(hass)
+    events: list[StateChange] = []
+
+    # Sonne: wie die sun-Integration alle paar Minuten
+    t = start
+    while t < end:
+        state, attrs = sun_state(location, t)
+        events.append(StateChange(t, "sun.sun", state, attrs))
+        t += timedelta(minutes=4)
+
+    sensors = math.ceil(count / PROFILES_PER_SENSOR)
+    for k in range(sensors):
+        # Lux: Klarhimmel aus der Sonnenhöhe × Bewölkung (Random Walk), ca. jede Minute
+        rnd = seeded(seed, "lux", k)
+        cloud = rnd.uniform(0.3, 1.0)
+        t = start + timedelta(seconds=rnd.uniform(0, 60))
+        while t < end:
+            cloud = min(1.0, max(0.1, cloud + rnd.gauss(0, 0.08)))
+            elevation = max(0.0, location.solar_elevation(t))
+            lux = 120000 * math.sin(math.radians(elevation)) * cloud + rnd.uniform(0, 5)
+            events.append(StateChange(t, f"sensor.bench_lux_{k}", str(round(lux))))
+            t += timedelta(seconds=rnd.uniform(45, 75))
+        # Temperatur: Tagesgang, alle 5 Minuten
+        rnd = seeded(seed, "temp", k)
+        t = start + timedelta(seconds=rnd.uniform(0, 300))
+        while t < end:
+            hour = t.hour + t.minute / 60
+            temp = 21 + 7 * math.sin((hour - 9) / 24 * 2 * math.pi) + rnd.gauss(0, 0.3)
+            events.append(StateChange(t, f"sensor.bench_temp_{k}", f"{temp:.1f}"))
+            t += timedelta(minutes=5)
+
+    for i in range(count):
+        # Fenster: im Mittel alle 8 Stunden für 5–30 Minuten offen
+        rnd = seeded(seed, "window", i)
+        t = start + timedelta(hours=rnd.expovariate(1 / 8))
+        while t < end:
+            events.append(StateChange(t, f"binary_sensor.bench_window_{i}", "on"))
+            t += timedelta(minutes=rnd.uniform(5, 30))
+            events.append(StateChange(t, f"binary_sensor.bench_window_{i}", "off"))
+            t += timedelta(hours=rnd.expovariate(1 / 8))
+        if i % DOOR_EVERY:
+            continue
+        # Terrassentür: im Mittel stündlich für 1–5 Minuten offen
+        rnd = seeded(seed, "door", i)
+        t = start + timedelta(hours=rnd.expovariate(1))
+        while t < end:
+            events.append(StateChange(t, f"binary_sensor.bench_door_{i}", "on"))
+            t += timedelta(minutes=rnd.uniform(1, 5))
+            events.append(StateChange(t, f"binary_sensor.bench_door_{i}", "off"))
+            t += timedelta(hours=rnd.expovariate(1))
+
+    events = [e for e in events if e.at < end]
+    events.sort(key=lambda e: e.at)
+    return events
@@ -0,0 +1,338 @@
+"""Event-storm stress test with safety invariants.
+
+    python -m benchmarks.stress                          # 200 Profile, 20 000 Ereignisse, Seed 1
+    python -m benchmarks.stress --profiles 500 --events 100000 --runs 8
+    python -m benchmarks.stress --seed 17 --runs 1       # Fund reproduzieren
+    python -m benchmarks.stress --start "2026-06-22 23:30"  # Nachtstart, Bereichssensor noch ohne Daten
+
+Feuert zufällige, dicht verschachtelte Tür-, Fenster-, Lux-, Zeit- und
+Reload-Ereignisse auf viele Profile gleichzeitig und prüft laufend:
+
+- ``door_safe``: Ein Rollladen mit offener Tür wird nie unter ``door_safe`` gefahren.
+- ``ventilation``: Bei offenem Fenster und aktiver Fenster-Logik nie unter ``vent_position``.
+- ``*_settled``: Steht Tür/Fenster länger offen, muss die Position danach auch stimmen
+  (fängt fehlende Reaktionen, z. B. Ereignisse während eines Reloads).
+- ``no_data``: Liefert der Helligkeitssensor eines Bereichs (Modus Helligkeit) keine
+  Daten, hält das Profil; Nacht-, Beschattungs- und Standardregel dürfen nicht fahren.
+  Der Sensor startet ``unavailable`` und fällt zwischendurch aus (``dropout``).
+
+Alle Zufallsentscheidungen hängen am Seed; ein gefundener Verstoß lässt sich
+mit ``--seed`` wiederholen. Exit-Code 1 bei Verstößen.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Optional
+
+from homeassistant.core import ServiceCall
+from homeassistant.helpers.sun import get_astral_location
+
+from .harness import DOMAIN, REPO_ROOT, BenchHass, bench_hass, local_datetime, run, seeded
+from .streams import PROFILES_PER_SENSOR, build_options, initial_states, sun_state
+
+DEFAULT_PROFILES = 200
+DEFAULT_EVENTS = 20000
+DEFAULT_RATE = 50.0                 # Ereignisse pro simulierter Sekunde (Mittel, exponentiell verteilt)
+DEFAULT_START = "2026-06-22 20:00"  # Sonnenuntergang: Nacht, Helligkeits-Trigger und Beschattung wechseln
+DEFAULT_CHECK_EVERY = 1000
+
+# Ereignisart → Gewicht
+EVENT_MIX = {"door": 0.3, "window": 0.35, "lux": 0.3, "dropout": 0.02, "tick": 0.045, "reload": 0.005}
+# Regeln unterhalb von area_brightness: dürfen für Profile in Helligkeits-Bereichen nie entscheiden
+FALLTHROUGH_RULES = frozenset({"night", "shade", "default_open"})
+NO_DATA_STATES = frozenset({"unavailable", "unknown"})
+GRACE = 1.0    # s: so kurz nach dem Öffnen kann ein Befehl noch aus einer älteren Auswertung stammen
+SETTLE = 5.0   # s: danach muss die Position stimmen
+MAX_REPORTED = 20
+
+
+@dataclass
+class Violation:
+    at: float        # simulierte Sekunden seit Start
+    event: int       # Index des zuletzt gefeuerten Ereignisses
+    invariant: str
+    cover: str
+    position: int
+    required: int
+
+
+class InvariantChecker:
+    """Checks every cover command and, at checkpoints, every settled position."""
+
+    def __init__(self, bench: BenchHass, entry_id: str, profiles: list[dict], areas: Optional[dict] = None):
+        self._bench = bench
+        self._entry_id = entry_id
+        self._t0 = bench.clock.timestamp()
+        self.profiles = profiles
+        self._by_cover = {p["cover_entity_id"]: p for p in profiles}
+        # Rollladen → Helligkeitssensor seines Bereichs (nur Modus brightness)
+        self._area_sensor = {
+            p["cover_entity_id"]: area["brightness_sensor"]
+            for p in profiles
+            if (area := (areas or {}).get(p.get("area")) or {}).get("area_mode") == "brightness"
+        }
+        self._opened: dict[str, float] = {}   # Tür/Fenster → Zeitpunkt des Öffnens
+        self._controllers: dict[str, object] = {}
+        self._controllers_src: Optional[list] = None
+        self.violations: list[Violation] = []
+        self.event = 0
+
+    def sensor_changed(self, entity_id: str, is_open: bool) -> None:
+        if is_open:
+            self._opened.setdefault(entity_id, self._bench.clock.timestamp())
+        else:
+            self._opened.pop(entity_id, None)
+
+    def _open_for(self, entity_id: Optional[str]) -> Optional[float]:
+        opened = self._opened.get(entity_id) if entity_id else None
+        return None if opened is None else self._bench.clock.timestamp() - opened
+
+    def _controller(self, cover: str):
+        """Laufender Controller des Rollladens; None während eines Reloads."""
+        store = self._bench.hass.data.get(DOMAIN, {}).get(self._entry_id)
+        controllers = store.get("runtime_profiles") if store else None
+        if not controllers:
+            return None
+        if controllers is not self._controllers_src or len(controllers) != len(self._controllers):
+            self._controllers = {c.cover: c for c in controllers}
+            self._controllers_src = controllers
+        return self._controllers.get(cover)
+
+    def _latched(self, cover: str) -> Optional[bool]:
+        """Fenster-Logik des Profils aktiv? None während eines Reloads."""
+        ctrl = self._controller(cover)
+        return None if ctrl is None else ctrl._window_not_close
+
+    def _check_no_data(self, cover: str, position: int) -> None:
+        sensor = self._area_sensor.get(cover)
+        if sensor is None:
+            return
+        state = self._bench.hass.states.get(sensor)
+        if state is not None and state.state not in NO_DATA_STATES:
+            return
+        ctrl = self._controller(cover)
+        if ctrl is not None and ctrl._rules.last_rule in FALLTHROUGH_RULES:
+            current = self._bench.hass.states.get(cover)
+            held = current.attributes.get("current_position") if current else None
+            self._violate("no_data", cover, position, position if held is None else int(held))
+
+    def _violate(self, invariant: str, cover: str, position: int, required: int) -> None:
+        self.violations.append(Violation(
+            round(self._bench.clock.timestamp() - self._t0, 3), self.event, invariant, cover, position, required,
+        ))
+
+    def _check(self, cover: str, position: int, min_open: float, suffix: str = "") -> None:
+        prof = self._by_cover.get(cover)
+        if prof is None:
+            return
+        door_open = self._open_for(prof.get("door_sensor"))
+        if door_open is not None and door_open >= min_open and position < prof["door_safe_position"]:
+            self._violate("door_safe" + suffix, cover, position, prof["door_safe_position"])
+        window_open = self._open_for(prof.get("window_sensor"))
+        if (window_open is not None and window_open >= min_open and position < prof["vent_position"]
+                and self._latched(cover)):
+            self._violate("ventilation" + suffix, cover, position, prof["vent_position"])
+
+    def on_command(self, call: ServiceCall) -> None:
+        if call.domain != "cover":
+            return
+        position = {"open_cover": 100, "close_cover": 0}.get(call.service, call.data.get("position"))
+        if position is None:
+            return
+        ids = call.data.get("entity_id") or []
+        for cover in [ids] if isinstance(ids, str) else ids:
+            self._check(cover, int(position), GRACE)
+            self._check_no_data(cover, int(position))
+
+    def check_settled(self) -> None:
+        states = self._bench.hass.states
+        for prof in self.profiles:
+            state = states.get(prof["cover_entity_id"])
+            position = state.attributes.get("current_position") if state else None
+            if position is not None:
+                self._check(prof["cover_entity_id"], int(position), SETTLE, "_settled")
+
+
+def _stress_options(count: int, seed: int) -> dict:
+    """Benchmark options with varied door_safe/cooldown so rules and timers interleave."""
+    options = build_options(count)
+    rnd = seeded(seed, "config")
+    for prof in options["profiles"]:
+        prof["vent_position"] = rnd.choice((20, 30, 40))
+        prof["door_safe_position"] = rnd.choice((prof["vent_position"], 60, 80, 100))
+        prof["cooldown_sec"] = rnd.choice((0, 5, 30, 120))
+    return options
+
+
+async def _async_stress(count: int, events: int, rate: float, start: datetime, seed: int, check_every: int) -> dict:
+    from custom_components.shutterpilot.const import METRICS
+
+    async with bench_hass(start) as bench:
+        hass = bench.hass
+        options = _stress_options(count, seed)
+        checker = InvariantChecker(bench, "stress", options["profiles"], options["areas"])
+        bench.register_cover_services(on_command=checker.on_command)
+        for change in initial_states(hass, count, start):
+            hass.states.async_set(change.entity_id, change.state, change.attributes)
+        # Bereichs-Helligkeitssensoren kommen erst nach dem Setup online (erste lux-Ereignisse)
+        for area in options["areas"].values():
+            if area.get("brightness_sensor"):
+                hass.states.async_set(area["brightness_sensor"], "unavailable")
+        entry = await bench.async_setup_shutterpilot(options, entry_id="stress")
+        location, _elevation = get_astral_location(hass)
+
+        windows = [p["window_sensor"] for p in options["profiles"]]
+        doors = [p["door_sensor"] for p in options["profiles"] if p.get("door_sensor")]
+        lux_sensors = [f"sensor.bench_lux_{k}" for k in range(-(-count // PROFILES_PER_SENSOR))]
+        rnd = seeded(seed, "storm")
+        kinds, weights = list(EVENT_MIX), list(EVENT_MIX.values())
+        counts = dict.fromkeys(kinds, 0)
+        reload_task: Optional[asyncio.Task] = None
+        registries: list = []  # Metriken jeder Setup-Instanz (ein Reload legt ein neues Registry an)
+        commands_before = bench.commands.total
+
+        def track_metrics() -> None:
+            store = hass.data[DOMAIN].get(entry.entry_id)
+            if store is not None and not any(store[METRICS] is r for r in registries):
+                registries.append(store[METRICS])
+
+        def toggle(entity_id: str) -> None:
+            is_open = hass.states.get(entity_id).state != "on"
+            hass.states.async_set(entity_id, "on" if is_open else "off")
+            checker.sensor_changed(entity_id, is_open)
+
+        async def checkpoint() -> None:
+            if reload_task is not None:
+                await reload_task
+            await hass.async_block_till_done()
+            await asyncio.sleep(SETTLE)
+            await hass.async_block_till_done()
+            checker.check_settled()
+
+        bench.loop.reset_stats()
+        wall = time.perf_counter()
+        for n in range(events):
+            checker.event = n
+            await asyncio.sleep(rnd.expovariate(rate))
+            kind = rnd.choices(kinds, weights)[0]
+            counts[kind] += 1
+            if kind == "door" and doors:
+                toggle(rnd.choice(doors))
+            elif kind == "window":
+                toggle(rnd.choice(windows))
+            elif kind == "lux":
+                # Dunkel, Dämmerung oder Sonne – große Sprünge lösen Bereichs-Trigger und Beschattung aus
+                low, high = rnd.choice(((0, 150), (150, 2500), (2500, 90000)))
+                hass.states.async_set(rnd.choice(lux_sensors), str(round(rnd.uniform(low, high))))
+            elif kind == "dropout":
+                # Sensor fällt aus, bis das nächste lux-Ereignis ihn trifft
+                hass.states.async_set(rnd.choice(lux_sensors), rnd.choice(sorted(NO_DATA_STATES)))
+            elif kind == "tick":
+                await asyncio.sleep(rnd.uniform(20, 180))
+                state, attrs = sun_state(location, bench.clock.now())
+                hass.states.async_set("sun.sun", state, attrs)
+            elif kind == "reload" and (reload_task is None or reload_task.done()):
+                track_metrics()
+                # Nicht abwarten: weitere Ereignisse treffen auf Entladen/Setup
+                reload_task = hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+            if check_every and (n + 1) % check_every == 0:
+                await checkpoint()
+        await checkpoint()
+        wall = time.perf_counter() - wall
+        track_metrics()
+        evaluations = sum(r.summary().get("shutterpilot_evaluations_total", 0) for r in registries)
+
+        busy = bench.loop.busy
+        return {
+            "seed": seed,
+            "profiles": count,
+            "events": events,
+            "by_kind": counts,
+            "simulated_s": round(bench.clock.timestamp() - start.timestamp(), 1),
+            "wall_s": round(wall, 2),
+            "loop_busy_s": round(busy, 2),
+            "events_per_s": round(events / busy, 1) if busy else None,
+            "evaluations": int(evaluations),
+            "commands": bench.commands.total - commands_before,
+            "max_slice_ms": round(bench.loop.max_slice * 1000, 2),
+            "violations": len(checker.violations),
+            "violations_by_invariant": _count_by(checker.violations),
+            "first_violations": [asdict(v) for v in checker.violations[:MAX_REPORTED]],
+        }
+
+
+def _count_by(violations: list[Violation]) -> dict[str, int]:
+    result: dict[str, int] = {}
+    for v in violations:
+        result[v.invariant] = result.get(v.invariant, 0) + 1
+    return result
+
+
+def run_stress(count: int, events: int, rate: float, start: str, seed: int, check_every: int) -> dict:
+    """Entry point for the worker process."""
+    import logging
+    logging.basicConfig(level=logging.ERROR)
+    # Beim Abbau offene Hilfs-Tasks (z. B. Bewegungs-Flag) sind kein Befund
+    logging.getLogger("asyncio").setLevel(logging.CRITICAL)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return run(_async_stress(count, events, rate, local_datetime(start), seed, check_every))
+
+
+def _print_report(results: list[dict]) -> None:
+    header = f"{'seed':>6} {'events':>8} {'sim s':>8} {'wall s':>7} {'events/s':>9} {'evals':>8} {'cmds':>7} {'max ms':>7} {'violations':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['seed']:>6} {r['events']:>8} {r['simulated_s']:>8} {r['wall_s']:>7} {r['events_per_s']:>9} "
+              f"{r['evaluations']:>8} {r['commands']:>7} {r['max_slice_ms']:>7} {r['violations']:>10}")
+    for r in results:
+        if not r["violations"]:
+            continue
+        print(f"\nseed {r['seed']}: {r['violations_by_invariant']}")
+        for v in r["first_violations"]:
+            print(f"  t={v['at']:>9.3f}s event {v['event']:>6}  {v['invariant']:<20} {v['cover']} "
+                  f"→ {v['position']} (min {v['required']})")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=DEFAULT_PROFILES)
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="events per simulated second")
+    parser.add_argument("--start", default=DEFAULT_START, help="local start time 'YYYY-MM-DD HH:MM'")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=1, help="seeds seed..seed+runs-1, in parallel")
+    parser.add_argument("--check-every", type=int, default=DEFAULT_CHECK_EVERY,
+                        help="settle and check positions every N events (0 = only at the end)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", help="write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.seed, args.seed + max(1, args.runs))
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(seeds))),
+                             mp_context=get_context("spawn")) as pool:
+        futures = [
+            pool.submit(run_stress, args.profiles, args.events, args.rate, args.start, seed, args.check_every)
+            for seed in seeds
+        ]
+        results = [f.result() for f in futures]
+
+    _print_report(results)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump({"params": {k: v for k, v in vars(args).items() if k != "out"}, "runs": results}, fh, indent=2)
+            fh.write("\n")
+    return 1 if any(r["violations"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
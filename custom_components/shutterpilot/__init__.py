@@ -1,112 +1,311 @@
 from __future__ import annotations
+import asyncio
 import logging
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import CoreState, HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.helpers import event as hass_event
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.typing import ConfigType
+import voluptuous as vol
 
 from .const import (
-    DOMAIN, CONF_PROFILES, CONF_GLOBAL_AUTO, DATA, RUNTIME_PROFILES, UNSUBS,
+    DOMAIN, CONF_PROFILES, CONF_AREAS, CONF_GLOBAL_AUTO, CONF_COMPACT_ENTITIES, DATA, RUNTIME_PROFILES,
+    RUNTIME_AREAS, UNSUBS, LIGHT_ACTUATOR, SOLAR_MODEL, FUSED_INPUTS, METRICS, CONF_FUSED_INPUTS,
+    CONFIG_LOCK, APPLIED_VERSION, SIGNAL_CONFIG_UPDATED, CONF_SIMULATION, SIM_ENABLED, SIMULATION,
+    LOADED_PLATFORMS, RECONCILER, ADMISSION, P_ID,
 )
+from .actuator import LightActuator
+from .admission import StartupAdmission, watched_entities
+from .area import AreaController
+from .fusion import FusedInput
+from .metrics import MetricsRegistry, MetricsView
+from .reconcile import Reconciler
+from . import profiler
+from .profiler import profiled
+from .simulation import SimulationController, is_sim_profile_id
+from .solar import SolarModel
 from .coordinator import ProfileController
+from .config_manager import (
+    async_apply_patch, async_set_profiles_enabled, diff_to_patch, ensure_profile_ids, profile_unique_ids,
+)
+from . import websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SWITCH, Platform.NUMBER, Platform.SENSOR]  # UI-Entities
+SIM_PLATFORMS: list[Platform] = [Platform.COVER, Platform.BINARY_SENSOR]  # nur mit Simulation (Lux in sensor.py)
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up integration-wide parts (websocket API for the management card, metrics view, profiling)."""
+    websocket_api.async_register_commands(hass)
+    hass.http.register_view(MetricsView())
+
+    async def _profile(call: ServiceCall) -> ServiceResponse:
+        """Profile all entry points for a while; with response → wait for the report."""
+        if profiler.is_running():
+            raise HomeAssistantError("ShutterPilot profiling is already running")
+        job = profiler.async_profile(
+            hass, call.data["duration"], call.data["budget_ms"], call.data["top"]
+        )
+        if call.return_response:
+            return await job
+        # Ohne Antwort im Hintergrund laufen lassen (UI wartet sonst die ganze Dauer)
+        hass.async_create_task(job)
+        return None
+
+    hass.services.async_register(
+        DOMAIN, "profile", _profile,
+        schema=vol.Schema({
+            vol.Optional("duration", default=profiler.DEFAULT_DURATION): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+            vol.Optional("budget_ms", default=profiler.DEFAULT_BUDGET_MS): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional("top", default=profiler.DEFAULT_TOP): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up ShutterPilot from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    store = hass.data[DOMAIN][entry.entry_id] = {DATA:{}, RUNTIME_PROFILES:[], UNSUBS:[]}
+    metrics = MetricsRegistry(entry.entry_id)
+    store = hass.data[DOMAIN][entry.entry_id] = {
+        DATA:{}, RUNTIME_PROFILES:[], RUNTIME_AREAS:{}, UNSUBS:[],
+        CONFIG_LOCK: asyncio.Lock(), APPLIED_VERSION: None,
+        METRICS: metrics,
+        LIGHT_ACTUATOR: LightActuator(hass, metrics),
+        SOLAR_MODEL: SolarModel(),
+        FUSED_INPUTS: {},
+    }
+    sim_cfg = entry.options.get(CONF_SIMULATION) or {}
+    if sim_cfg.get(SIM_ENABLED):
+        store[SIMULATION] = SimulationController(hass, entry.entry_id, sim_cfg, metrics)
+
+    # Migration: jedes Profil bekommt eine stabile ID (für Patch-Updates)
+    profiles, migrated = ensure_profile_ids(entry.options.get(CONF_PROFILES, []))
+    if migrated:
+        hass.config_entries.async_update_entry(entry, options={**entry.options, CONF_PROFILES: profiles})
+        _LOGGER.info("Assigned IDs to %d profile(s)", len(profiles))
+
+    # Fused Inputs vor den Profilen, damit die erste Auswertung schon Werte hat
+    for key, fused_cfg in entry.options.get(CONF_FUSED_INPUTS, {}).items():
+        fused = FusedInput(hass, entry.entry_id, key, fused_cfg)
+        await fused.async_start()
+        store[FUSED_INPUTS][key] = fused
+
+    # Bereiche zuerst: Profile melden sich beim Start bei ihrem AreaController an
+    for area_id, area_cfg in entry.options.get(CONF_AREAS, {}).items():
+        area_ctrl = AreaController(hass, entry, area_id, area_cfg)
+        await area_ctrl.async_start()
+        store[RUNTIME_AREAS][area_id] = area_ctrl
 
     # Start controllers for all profiles defined in options
-    profiles = entry.options.get(CONF_PROFILES, [])
     runtime_profiles: list[ProfileController] = []
     for p in profiles:
         try:
             ctrl = ProfileController(hass, entry, p)
-            await ctrl.async_start()
+            await ctrl.async_start(evaluate=False)
             runtime_profiles.append(ctrl)
         except Exception as ex:
             _LOGGER.exception("Failed to start profile %s: %s", p.get("name","?"), ex)
 
     store[RUNTIME_PROFILES] = runtime_profiles
+    # Erste Auswertung aller Profile gegen einen Positions-Stand; nur abweichende Rollläden fahren
+    reconciler = store[RECONCILER] = Reconciler(hass)
+    if hass.state is CoreState.running:
+        await reconciler.async_plan(runtime_profiles)
+        entry.async_create_background_task(hass, reconciler.async_send(), "shutterpilot_reconcile")
+    else:
+        # HA startet noch: Entities kommen nach und nach online → erst nach dem Einschwingen abgleichen
+        admission = store[ADMISSION] = StartupAdmission(
+            hass, watched_entities(runtime_profiles, store[FUSED_INPUTS])
+        )
+        for ctrl in runtime_profiles:
+            ctrl.set_admission(admission)
+        entry.async_create_background_task(
+            hass, _async_reconcile_when_settled(admission, reconciler, store), "shutterpilot_reconcile"
+        )
+    _async_remove_stale_entities(hass, entry, runtime_profiles, store.get(SIMULATION))
 
     # Register services
+    @profiled
     async def _all_up(call: ServiceCall):
         for c in store[RUNTIME_PROFILES]:
             await c.open_cover()
 
+    @profiled
     async def _all_down(call: ServiceCall):
         for c in store[RUNTIME_PROFILES]:
             await c.close_cover_respecting_rules()
 
+    @profiled
     async def _stop(call: ServiceCall):
         for c in store[RUNTIME_PROFILES]:
             await c.stop_cover()
 
+    @profiled
     async def _recalc(call: ServiceCall):
         for c in store[RUNTIME_PROFILES]:
-            await c.evaluate_policy_and_apply()
+            await c.async_evaluate("recalculate_now")
 
+    @profiled
     async def _update_config(call: ServiceCall):
-        """Update config entry options (for card usage)."""
-        profiles = call.data.get("profiles", [])
-        areas = call.data.get("areas", {})
-        
-        _LOGGER.info("update_config service called with %d profiles and %d areas", 
-                     len(profiles) if profiles else 0, 
+        """Update profiles/areas from full lists (legacy card API, applied as patch)."""
+        profiles = call.data.get("profiles")
+        areas = call.data.get("areas")  # fehlt = unverändert, {} = leeren
+
+        _LOGGER.info("update_config service called with %d profiles and %d areas",
+                     len(profiles) if profiles else 0,
                      len(areas) if areas else 0)
-        
-        # Merge with existing options
-        new_options = {**entry.options}
-        if profiles is not None:
-            new_options[CONF_PROFILES] = profiles
-            _LOGGER.debug("Updated profiles: %s", [p.get('name', '?') for p in profiles])
-        if areas:
-            new_options["areas"] = areas
-            _LOGGER.debug("Updated areas: %s", list(areas.keys()))
-        
-        # Update config entry (this persists to storage)
-        hass.config_entries.async_update_entry(entry, options=new_options)
-        _LOGGER.info("Config entry updated and persisted to storage")
-        
-        # Schedule a reload as a background task AFTER this service returns
-        async def _do_reload():
-            import asyncio
-            await asyncio.sleep(0.1)  # Wait for service to complete
-            _LOGGER.info("Background: Reloading integration...")
-            await hass.config_entries.async_reload(entry.entry_id)
-            _LOGGER.info("Background: Integration reloaded successfully")
-        
-        hass.async_create_task(_do_reload())
-        _LOGGER.info("Config update service completed, reload scheduled")
-        
-        # Return immediately (don't wait for reload)
-        return None
+
+        # Diff gegen die aktuellen Optionen → nur Geändertes anwenden, kein Reload
+        patch = diff_to_patch(entry.options, profiles, areas)
+        await async_apply_patch(hass, entry, patch)
+
+    @profiled
+    async def _patch_config(call: ServiceCall) -> ServiceResponse:
+        """Add/update/remove single profiles and areas (optimistic concurrency)."""
+        return await async_apply_patch(hass, entry, dict(call.data))
+
+    @profiled
+    async def _set_profiles_enabled(call: ServiceCall):
+        """Enable/disable several profiles at once (replaces per-profile switches in compact mode)."""
+        names = call.data.get("profiles") or []
+        if isinstance(names, str):
+            names = [names]
+        area = call.data.get("area")
+        value = bool(call.data.get("enabled", True))
+
+        targets = [
+            c for c in store[RUNTIME_PROFILES]
+            if (not names or c.name in names) and (not area or c.area == area)
+        ]
+        if not targets:
+            _LOGGER.warning("set_profiles_enabled: no matching profiles (profiles=%s, area=%s)", names, area)
+            return
+
+        target_names = {c.name for c in targets}
+        for c in targets:
+            c.set_enabled(value)
+
+        # Persist in ONE options update instead of one per profile (already active → no reload)
+        async_set_profiles_enabled(hass, entry, target_names, value)
+        _LOGGER.info("%s %d profile(s) via service: %s", "Enabled" if value else "Disabled",
+                     len(targets), sorted(target_names))
 
     hass.services.async_register(DOMAIN, "all_up", _all_up)
     hass.services.async_register(DOMAIN, "all_down", _all_down)
     hass.services.async_register(DOMAIN, "stop", _stop)
     hass.services.async_register(DOMAIN, "recalculate_now", _recalc)
     hass.services.async_register(DOMAIN, "update_config", _update_config)
+    hass.services.async_register(
+        DOMAIN, "patch_config", _patch_config,
+        schema=vol.Schema({
+            vol.Optional("base_version"): cv.string,
+            vol.Optional("upsert_profiles"): vol.All(cv.ensure_list, [dict]),
+            vol.Optional("remove_profiles"): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional("upsert_areas"): vol.Schema({cv.string: dict}),
+            vol.Optional("remove_areas"): vol.All(cv.ensure_list, [cv.string]),
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    @profiled
+    async def _simulation_profiles(call: ServiceCall) -> ServiceResponse:
+        """Create one profile per simulated cover (or remove them again)."""
+        existing = {p[P_ID] for p in entry.options.get(CONF_PROFILES, []) if is_sim_profile_id(p.get(P_ID))}
+        if call.data.get("remove"):
+            return await async_apply_patch(hass, entry, {"remove_profiles": sorted(existing)})
+        sim: SimulationController | None = store.get(SIMULATION)
+        if sim is None:
+            raise HomeAssistantError("ShutterPilot simulation is not enabled")
+        profiles = sim.build_profiles(call.data.get("area"))
+        keep = {p[P_ID] for p in profiles}
+        return await async_apply_patch(hass, entry, {
+            "upsert_profiles": profiles,
+            "remove_profiles": sorted(existing - keep),  # weniger simulierte Rollläden als vorher
+        })
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    hass.services.async_register(DOMAIN, "set_profiles_enabled", _set_profiles_enabled)
+    hass.services.async_register(
+        DOMAIN, "simulation_profiles", _simulation_profiles,
+        schema=vol.Schema({
+            vol.Optional("area"): cv.string,
+            vol.Optional("remove", default=False): cv.boolean,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    platforms = PLATFORMS + SIM_PLATFORMS if SIMULATION in store else PLATFORMS
+    store[LOADED_PLATFORMS] = platforms
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    store[APPLIED_VERSION] = websocket_api.config_version(dict(entry.options))
     entry.async_on_unload(entry.add_update_listener(async_update_entry))
+    # Card-Abonnenten: neue Config/Controller → neu laden
+    async_dispatcher_send(hass, SIGNAL_CONFIG_UPDATED.format(entry.entry_id))
     _LOGGER.info("ShutterPilot setup complete with %d profile(s).", len(runtime_profiles))
     return True
 
+async def _async_reconcile_when_settled(admission: StartupAdmission, reconciler: Reconciler, store: dict) -> None:
+    """Startup: wait for the entities to settle, then ONE consolidated evaluation of all profiles."""
+    await admission.async_wait()
+    # Freigabe vor der Planung: Ereignisse währenddessen werden normal (geplant) ausgewertet
+    admission.release()
+    controllers = list(store.get(RUNTIME_PROFILES, []))
+    for ctrl in controllers:
+        ctrl.set_admission(None)
+    await reconciler.async_plan(controllers)
+    await reconciler.async_send()
+
+
+def _async_remove_stale_entities(
+    hass: HomeAssistant, entry: ConfigEntry, controllers: list, sim: SimulationController | None
+) -> None:
+    """Remove registry entries left over after switching compact mode or the simulation on/off."""
+    compact = entry.options.get(CONF_COMPACT_ENTITIES, False)
+    stale_prefixes = [] if compact else [f"{entry.entry_id}_area_status_"]
+    for c in controllers:
+        if not c.wants_own_entities():
+            stale_prefixes.extend(profile_unique_ids(entry.entry_id, c.name))
+    sim_prefix = f"{entry.entry_id}_sim_"
+    sim_ids = sim.unique_ids() if sim else set()
+
+    registry = er.async_get(hass)
+    for reg_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        uid = reg_entry.unique_id
+        stale = any(uid == p or (p.endswith("_area_status_") and uid.startswith(p)) for p in stale_prefixes)
+        # Simulation aus bzw. weniger simulierte Rollläden/Sensoren als vorher
+        stale = stale or (uid.startswith(sim_prefix) and uid not in sim_ids)
+        if stale:
+            _LOGGER.debug("Removing stale entity %s", reg_entry.entity_id)
+            registry.async_remove(reg_entry.entity_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     store = hass.data[DOMAIN].get(entry.entry_id)
     if store:
         for c in store.get(RUNTIME_PROFILES, []):
             await c.async_stop()
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+        for a in store.get(RUNTIME_AREAS, {}).values():
+            await a.async_stop()
+        store[LIGHT_ACTUATOR].async_stop()
+        for f in store.get(FUSED_INPUTS, {}).values():
+            await f.async_stop()
+    platforms = store.get(LOADED_PLATFORMS, PLATFORMS) if store else PLATFORMS
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
     return unload_ok
 
 async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle config entry update - reload to apply changes."""
+    store = hass.data.get(DOMAIN, {}).get(entry.entry_id) or {}
+    if store.get(APPLIED_VERSION) == websocket_api.config_version(dict(entry.options)):
+        # Änderung wurde bereits zur Laufzeit angewendet (Patch/Enable) → kein Reload
+        _LOGGER.debug("Config entry updated, changes already applied")
+        return
     _LOGGER.info("Config entry updated, reloading ShutterPilot integration")
     await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,227 @@
+"""Actuator layer: light command dedup/batching and cover movement budget.
+
+Die Auswertung läuft jede Minute pro Profil; früher wurde dabei jedes Mal
+``light.turn_on``/``light.turn_off`` gesendet. Der Aktor merkt sich den
+zuletzt gesendeten Zustand pro Licht, prüft den tatsächlichen Zustand und
+fasst Lichter mit gleichem Ziel in einem Service-Call zusammen.
+
+Das Bewegungsbudget begrenzt Fahrbefehle der Automatik pro Rollladen
+(Motorverschleiß, Buslast, Geräusch); Sicherheitsfahrten sind ausgenommen.
+"""
+from __future__ import annotations
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from homeassistant.core import Event, HomeAssistant, CALLBACK_TYPE, callback
+from homeassistant.const import STATE_ON, STATE_OFF
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+
+from .metrics import MetricsRegistry
+from .profiler import profiled
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sammelfenster: Anforderungen eines Auswertungsdurchlaufs (z. B. alle Profile
+# eines Bereichs oder recalculate_now) landen in einem gemeinsamen Call
+BATCH_DELAY = 0.25  # Sekunden
+BRIGHTNESS_TOLERANCE = 3  # 0-255, Rundung zwischen Prozent und Rohwert
+
+
+@dataclass(frozen=True)
+class LightTarget:
+    """Desired light state (brightness 0-255, None when off)."""
+
+    on: bool
+    brightness: Optional[int] = None
+
+
+class LightActuator:
+    """Shared light command layer of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, metrics: Optional[MetricsRegistry] = None):
+        self.hass = hass
+        self._metrics = metrics
+        self._commanded: dict[str, LightTarget] = {}
+        self._pending: dict[str, tuple[LightTarget, str]] = {}
+        self._unsub_flush: Optional[CALLBACK_TYPE] = None
+        self._unsub_state: dict[str, CALLBACK_TYPE] = {}
+        self._stats: dict[str, int] = {"requested": 0, "skipped": 0, "calls": 0, "lights": 0}
+
+    def request(self, entity_id: str, on: bool, brightness_pct: int = 100, reason: str = "") -> None:
+        """Queue a target state for a light; no-ops are dropped."""
+        target = LightTarget(True, round(brightness_pct / 100 * 255)) if on else LightTarget(False)
+        self._stats["requested"] += 1
+
+        if self._commanded.get(entity_id) == target or self._matches(entity_id, target):
+            # Bereits so befohlen (Befehl unterwegs, Licht seitdem unverändert) oder Licht ist schon so
+            self._remember(entity_id, target)
+            self._pending.pop(entity_id, None)
+            self._stats["skipped"] += 1
+            return
+
+        self._pending[entity_id] = (target, reason)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(self.hass, BATCH_DELAY, self._async_flush)
+
+    def _matches(self, entity_id: str, target: LightTarget) -> bool:
+        st = self.hass.states.get(entity_id)
+        if st is None:
+            return False
+        if not target.on:
+            return st.state == STATE_OFF
+        if st.state != STATE_ON:
+            return False
+        actual = st.attributes.get("brightness")
+        if actual is None:
+            return True  # Lichter ohne Dimmfunktion: "an" genügt
+        try:
+            return abs(int(actual) - target.brightness) <= BRIGHTNESS_TOLERANCE
+        except (TypeError, ValueError):
+            return False  # unbrauchbarer Helligkeitswert → Befehl senden
+
+    def _remember(self, entity_id: str, target: LightTarget) -> None:
+        """Store the commanded target; any later state change of the light forgets it again."""
+        self._commanded[entity_id] = target
+        if entity_id not in self._unsub_state:
+            self._unsub_state[entity_id] = async_track_state_change_event(
+                self.hass, [entity_id], self._on_light_change
+            )
+
+    @callback
+    def _on_light_change(self, event: Event) -> None:
+        # Manuelle (oder eigene, dann passt _matches) Änderung: nächste Anforderung prüft den Zustand neu
+        self._commanded.pop(event.data["entity_id"], None)
+
+    @profiled
+    async def _async_flush(self, _now=None) -> None:
+        self._unsub_flush = None
+        pending, self._pending = self._pending, {}
+
+        groups: dict[LightTarget, list[str]] = {}
+        for entity_id, (target, _reason) in pending.items():
+            groups.setdefault(target, []).append(entity_id)
+
+        for target, entity_ids in groups.items():
+            entity_ids.sort()
+            if target.on:
+                service, data = "turn_on", {"entity_id": entity_ids, "brightness": target.brightness}
+            else:
+                service, data = "turn_off", {"entity_id": entity_ids}
+            started = time.perf_counter()
+            try:
+                await self.hass.services.async_call("light", service, data, blocking=False)
+            except Exception as ex:
+                _LOGGER.warning("Error controlling light(s) %s: %s", ", ".join(entity_ids), ex)
+                continue
+            finally:
+                if self._metrics:
+                    self._metrics.inc("shutterpilot_light_commands_total")
+                    self._metrics.observe("shutterpilot_light_command_seconds", time.perf_counter() - started)
+            self._stats["calls"] += 1
+            self._stats["lights"] += len(entity_ids)
+            for entity_id in entity_ids:
+                self._remember(entity_id, target)
+            _LOGGER.info(
+                "Light(s) %s turned %s%s - Reason: %s", ", ".join(entity_ids),
+                "ON" if target.on else "OFF",
+                f" (brightness={target.brightness})" if target.on else "",
+                ", ".join(sorted({pending[e][1] for e in entity_ids})),
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._pending.clear()
+        for unsub in self._unsub_state.values():
+            unsub()
+        self._unsub_state.clear()
+        self._commanded.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        return dict(self._stats)
+
+
+# Standardwerte des Bewegungsbudgets (global einstellbar)
+DEFAULT_MAX_MOVES_PER_HOUR = 10
+DEFAULT_MIN_REVERSE_INTERVAL = 10  # Minuten zwischen Fahrten in Gegenrichtung
+DEFAULT_MIN_POSITION_DELTA = 5     # % Mindeständerung, die gesendet wird
+
+REJECT_NOOP = "noop"  # Rollladen steht bereits auf der Zielposition
+REJECT_DELTA = "min_delta"
+REJECT_REVERSE = "reverse_interval"
+REJECT_RATE = "max_moves"
+
+
+class MovementBudget:
+    """Anti-thrash limiter for the automatic moves of one cover."""
+
+    def __init__(self, max_per_hour: int = DEFAULT_MAX_MOVES_PER_HOUR,
+                 min_reverse_minutes: int = DEFAULT_MIN_REVERSE_INTERVAL,
+                 min_delta: int = DEFAULT_MIN_POSITION_DELTA):
+        self._moves: deque[datetime] = deque()
+        self._last_direction: int = 0
+        self._last_move: Optional[datetime] = None
+        self._last_target: Optional[int] = None  # zuletzt gesendetes Ziel (für Rollläden ohne Position)
+        self._stats: dict[str, int] = {
+            "moves": 0, "exempt": 0, REJECT_NOOP: 0, REJECT_DELTA: 0, REJECT_REVERSE: 0, REJECT_RATE: 0,
+        }
+        self.configure(max_per_hour, min_reverse_minutes, min_delta)
+
+    def configure(self, max_per_hour: int, min_reverse_minutes: int, min_delta: int):
+        self.max_per_hour = max(0, int(max_per_hour))  # 0 = unbegrenzt
+        self.min_reverse = timedelta(minutes=max(0, int(min_reverse_minutes)))
+        self.min_delta = max(0, int(min_delta))
+
+    def check(self, current: Optional[int], target: int, now: datetime, one_shot: bool = False) -> Optional[str]:
+        """Return the rejection reason for an automatic move, or None if allowed.
+
+        ``one_shot``: Zeitplan-/Bereichs-Trigger-Fahrt, die nur einmal ausgelöst wird;
+        Umkehr- und Ratenlimit gelten nicht, sonst ginge sie endgültig verloren.
+        """
+        self._expire(now)
+        if current is not None:
+            delta = abs(target - current)
+            if delta == 0:
+                return self._reject(REJECT_NOOP)
+            # Endlagen (0/100) immer anfahren, sonst kleine Korrekturen verwerfen
+            if delta < self.min_delta and target not in (0, 100):
+                return self._reject(REJECT_DELTA)
+            direction = 1 if target > current else -1
+            if (not one_shot and self._last_direction and direction != self._last_direction
+                    and self._last_move and now - self._last_move < self.min_reverse):
+                return self._reject(REJECT_REVERSE)
+        elif target == self._last_target:
+            # Position unbekannt: dasselbe Ziel erneut senden wäre eine Wiederholung (jede Minute!)
+            return self._reject(REJECT_NOOP)
+        if not one_shot and self.max_per_hour and len(self._moves) >= self.max_per_hour:
+            return self._reject(REJECT_RATE)
+        return None
+
+    def record(self, current: Optional[int], target: int, now: datetime, exempt: bool = False):
+        """Account a move that is actually sent (also safety moves)."""
+        self._expire(now)
+        self._moves.append(now)
+        self._last_move = now
+        self._last_target = target
+        if current is not None and target != current:
+            self._last_direction = 1 if target > current else -1
+        self._stats["moves"] += 1
+        if exempt:
+            self._stats["exempt"] += 1
+
+    def _reject(self, reason: str) -> str:
+        self._stats[reason] += 1
+        return reason
+
+    def _expire(self, now: datetime):
+        while self._moves and now - self._moves[0] >= timedelta(hours=1):
+            self._moves.popleft()
+
+    def get_stats(self) -> dict:
+        return {**self._stats, "moves_last_hour": len(self._moves)}
@@ -0,0 +1,143 @@
+"""Startup admission control: no evaluation storm while entities come online.
+
+Beim HA-Start wechseln alle Rollladen-, Fenster-, Tür- und Lux-Entities
+nacheinander von ``unavailable``/``unknown`` auf echte Werte. Jeder Wechsel
+hat bisher eine Auswertung angestoßen – mit halb geladenem Haus, also mit
+Fahrten, die Sekunden später wieder korrigiert werden. Solange HA startet,
+werden Auswertungs-Anstöße deshalb nur gezählt. Erst wenn HA läuft, alle
+beobachteten Entities Daten liefern und ``SETTLE_SECONDS`` lang keine mehr
+online gekommen ist (spätestens nach ``MAX_WAIT_SECONDS``), läuft EIN
+gemeinsamer Durchlauf: der Start-Abgleich (reconcile.py).
+
+Sicherheitsfahrten (Tür auf, Fenster auf bei aktiver Fenster-Logik) laufen
+nicht über die Auswertung und werden nie zurückgehalten.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Iterable, Mapping, Optional
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CoreState, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+if TYPE_CHECKING:
+    from .coordinator import ProfileController
+    from .fusion import FusedInput
+
+_LOGGER = logging.getLogger(__name__)
+
+SETTLE_SECONDS = 10     # so lange darf keine Entity mehr online kommen
+MAX_WAIT_SECONDS = 180  # spätestens dann wird ausgewertet (z. B. Sensor mit leerer Batterie)
+_POLL_SECONDS = 1.0
+
+
+def has_data(state: Optional[State]) -> bool:
+    """False for missing, ``unavailable`` and ``unknown`` states (= no data, not 0/off)."""
+    return state is not None and state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+
+
+def watched_entities(controllers: Iterable["ProfileController"],
+                     fused_inputs: Optional[Mapping[str, "FusedInput"]] = None) -> set[str]:
+    """Entities whose first real value the startup evaluation should wait for.
+
+    Neben den direkten Sensoren auch die Quellen genutzter Fused Inputs und die
+    Entities der eigenen Bedingung – die eigentlichen Eingänge des Profils.
+    """
+    ids: set[str] = set()
+    fused_inputs = fused_inputs or {}
+    for ctrl in controllers:
+        ids.update(e for e in (ctrl.cover, ctrl.window, ctrl.door, ctrl.lux_sensor, ctrl.temp_sensor) if e)
+        for key in (ctrl.lux_input, ctrl.temp_input):
+            fused = fused_inputs.get(key) if key else None
+            if fused is not None:
+                ids.update(fused.sensors)
+        if ctrl.shade_condition is not None:
+            ids.update(ctrl.shade_condition.entities)
+        area = ctrl.area_controller
+        if area is not None and area.brightness_sensor:
+            ids.add(area.brightness_sensor)
+    return ids
+
+
+class StartupAdmission:
+    """Holds evaluation requests of one config entry until the entities have settled."""
+
+    def __init__(self, hass: HomeAssistant, entity_ids: Iterable[str],
+                 settle: float = SETTLE_SECONDS, max_wait: float = MAX_WAIT_SECONDS):
+        self.hass = hass
+        self.entity_ids = sorted(set(entity_ids))
+        self.settle = settle
+        self.max_wait = max_wait
+        self.holding = True
+        self._last_change = 0.0
+        self._stats: dict = {
+            "entities": len(self.entity_ids),
+            "came_online": 0,     # Wechsel von unavailable/unknown auf einen echten Wert
+            "went_offline": 0,
+            "held": 0,            # zurückgehaltene Auswertungs-Anstöße
+            "waited_s": None,
+            "timed_out": False,
+            "missing": [],        # Entities ohne Daten bei Freigabe
+        }
+
+    def hold(self, source: str) -> bool:
+        """True if an evaluation request must wait for the consolidated startup evaluation."""
+        if not self.holding:
+            return False
+        self._stats["held"] += 1
+        return True
+
+    def missing(self) -> list[str]:
+        return [e for e in self.entity_ids if not has_data(self.hass.states.get(e))]
+
+    def _settled(self, now: float) -> bool:
+        return (
+            self.hass.state is CoreState.running
+            and now - self._last_change >= self.settle
+            and not self.missing()
+        )
+
+    @callback
+    def _on_change(self, event: Event) -> None:
+        old, new = has_data(event.data.get("old_state")), has_data(event.data.get("new_state"))
+        if old == new:
+            return  # normaler Wertewechsel, kein Online/Offline
+        self._stats["came_online" if new else "went_offline"] += 1
+        self._last_change = self.hass.loop.time()
+
+    async def async_wait(self) -> None:
+        """Return once HA runs, all entities have data and none changed availability for ``settle`` s."""
+        loop_time = self.hass.loop.time
+        started = self._last_change = loop_time()
+        deadline = started + self.max_wait
+        unsub = async_track_state_change_event(self.hass, self.entity_ids, self._on_change)
+        try:
+            while not self._settled(loop_time()):
+                now = loop_time()
+                if now >= deadline:
+                    self._stats["timed_out"] = True
+                    break
+                await asyncio.sleep(min(max(self._last_change + self.settle - now, _POLL_SECONDS), deadline - now))
+        finally:
+            unsub()
+        self._stats["waited_s"] = round(loop_time() - started, 1)
+        self._stats["missing"] = self.missing()
+
+    def release(self) -> None:
+        """Stop holding; later requests evaluate right away."""
+        self.holding = False
+        s = self._stats
+        if s["timed_out"]:
+            _LOGGER.warning(
+                "Startup admission: %d of %d entities still without data after %ss (%s), evaluating anyway",
+                len(s["missing"]), s["entities"], s["waited_s"], ", ".join(s["missing"][:10]),
+            )
+        _LOGGER.info(
+            "Startup admission: %d entities settled after %ss (%d came online, %d evaluation request(s) held), "
+            "running one consolidated evaluation",
+            s["entities"], s["waited_s"], s["came_online"], s["held"],
+        )
+
+    def get_stats(self) -> dict:
+        return {**self._stats, "holding": self.holding}
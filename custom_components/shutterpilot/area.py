@@ -0,0 +1,216 @@
+"""Area controller: evaluates the shared inputs of one area once.
+
+Bereichs-Modus, Helligkeits-Schwellwerte, Zeitplan und Trigger-Zustand
+gehören dem Bereich. Jede Änderung des Helligkeitssensors wird einmal
+ausgewertet; die Profile des Bereichs übernehmen die Entscheidung und
+wenden nur noch ihre eigenen Regeln an (Tür, Fenster, Positionen).
+"""
+from __future__ import annotations
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, CALLBACK_TYPE
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.event import async_track_state_change_event, async_track_time_change
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    A_NAME, A_MODE, A_UP_TIME_WEEK, A_DOWN_TIME_WEEK, A_UP_TIME_WEEKEND, A_DOWN_TIME_WEEKEND,
+    A_UP_EARLIEST, A_UP_LATEST, A_STAGGER_DELAY, A_USE_SCHEDULE, A_BRIGHTNESS_SENSOR, A_BRIGHTNESS_DOWN, A_BRIGHTNESS_UP,
+    MODE_TIME_ONLY, MODE_BRIGHTNESS, DOMAIN, METRICS,
+)
+
+from .admission import has_data
+from .profiler import profiled
+
+if TYPE_CHECKING:
+    from .coordinator import ProfileController
+
+_LOGGER = logging.getLogger(__name__)
+
+TRIGGER_DOWN = "down"
+TRIGGER_UP = "up"
+
+
+def _to_float(val, default):
+    try:
+        return float(val)
+    except Exception:
+        return default
+
+
+@dataclass
+class AreaDecision:
+    """Result of one area evaluation (brightness mode)."""
+
+    trigger: Optional[str]  # TRIGGER_DOWN / TRIGGER_UP / None (noch kein Trigger seit Reset)
+    seq: int                # Laufende Trigger-Nummer; jedes Profil wendet einen Trigger genau einmal an
+    lux: float
+    in_range: bool          # Zwischen den Schwellwerten → Position halten
+
+
+class AreaController:
+    """Owns mode, thresholds, schedule and trigger state of one area."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, area_id: str, cfg: dict):
+        self.hass = hass
+        self.entry = entry
+        self.area_id = area_id
+        self.members: list[ProfileController] = []
+        self._load_config(cfg)
+
+        # Trigger-Zustand (früher pro Profil, jetzt einmal pro Bereich)
+        self._triggered_up: bool = False
+        self._triggered_down: bool = False
+        self._trigger: Optional[str] = None
+        self._trigger_seq: int = 0
+        self.decision: Optional[AreaDecision] = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    def _load_config(self, cfg: dict):
+        self.cfg = cfg
+        self.name = cfg.get(A_NAME, self.area_id)
+        self.mode = cfg.get(A_MODE, MODE_TIME_ONLY)
+        self.brightness_sensor = cfg.get(A_BRIGHTNESS_SENSOR) or None
+        self.brightness_down = _to_float(cfg.get(A_BRIGHTNESS_DOWN, 5000), 5000)
+        self.brightness_up = _to_float(cfg.get(A_BRIGHTNESS_UP, 15000), 15000)
+        self.use_schedule = bool(cfg.get(A_USE_SCHEDULE, False))
+        self.stagger = max(0.0, _to_float(cfg.get(A_STAGGER_DELAY, 0), 0))
+
+    async def async_start(self):
+        if self.mode == MODE_BRIGHTNESS and self.brightness_sensor:
+            self._unsubs.append(
+                async_track_state_change_event(self.hass, [self.brightness_sensor], self._on_brightness_change)
+            )
+            _LOGGER.debug("Area %s: Subscribed to brightness sensor %s", self.area_id, self.brightness_sensor)
+        # Tägliches Reset um 3 Uhr für alle Profile des Bereichs
+        self._unsubs.append(async_track_time_change(self.hass, self._on_daily_reset, hour=3, minute=0, second=0))
+        self.evaluate()
+
+    async def async_stop(self):
+        for u in self._unsubs:
+            try:
+                u()
+            except Exception:
+                pass
+        self._unsubs.clear()
+
+    async def async_reconfigure(self, cfg: dict):
+        """Apply a changed area config; trigger state is kept."""
+        await self.async_stop()
+        self._load_config(cfg)
+        await self.async_start()
+
+    def add_member(self, profile: ProfileController):
+        if profile not in self.members:
+            self.members.append(profile)
+
+    def remove_member(self, profile: ProfileController):
+        if profile in self.members:
+            self.members.remove(profile)
+
+    # ---------- decision ----------
+    def evaluate(self) -> Optional[AreaDecision]:
+        """Evaluate the area inputs once (brightness mode) and store the decision."""
+        if self.mode != MODE_BRIGHTNESS or not self.brightness_sensor:
+            self.decision = None
+            return None
+
+        lux = self._brightness()
+        if lux is None:
+            # unavailable/unknown = keine Daten (nicht 0 lx): letzte Entscheidung halten, kein Nacht-Trigger
+            return self.decision
+        # TRIGGER-SYSTEM (wie in Original-Automationen):
+        # - triggered_down = False → Darf runterfahren wenn Lux < down
+        # - triggered_up = False → Darf hochfahren wenn Lux > up
+        # - Reset um 3 Uhr → beide Flags auf False
+        if lux < self.brightness_down and not self._triggered_down:
+            self._set_trigger(TRIGGER_DOWN)
+            _LOGGER.info("Area %s: 🌙 Brightness DOWN trigger: lux=%.0f < %.0f", self.area_id, lux, self.brightness_down)
+        elif lux > self.brightness_up and not self._triggered_up:
+            self._set_trigger(TRIGGER_UP)
+            _LOGGER.info("Area %s: ☀️ Brightness UP trigger: lux=%.0f > %.0f", self.area_id, lux, self.brightness_up)
+
+        self.decision = AreaDecision(
+            trigger=self._trigger,
+            seq=self._trigger_seq,
+            lux=lux,
+            in_range=self.brightness_down <= lux <= self.brightness_up,
+        )
+        return self.decision
+
+    def _set_trigger(self, trigger: str):
+        self._trigger = trigger
+        self._trigger_seq += 1
+        self._triggered_down = trigger == TRIGGER_DOWN
+        self._triggered_up = trigger == TRIGGER_UP
+
+    def _brightness(self) -> Optional[float]:
+        st = self.hass.states.get(self.brightness_sensor)
+        if not has_data(st):
+            return None
+        try:
+            return float(st.state)
+        except (TypeError, ValueError):
+            return None
+
+    def scheduled_times(self, now: Optional[datetime] = None) -> tuple[str, str]:
+        """Area up/down time for today (weekday/weekend).
+
+        Nur im time_only-Modus und nur wenn der Zeitplan ausdrücklich aktiviert
+        ist (``use_schedule``) – die Standardzeiten neu angelegter Bereiche
+        sollen keine Profile bewegen. Die Hochfahrzeit wird auf
+        ``up_earliest``/``up_latest`` begrenzt.
+        """
+        if self.mode != MODE_TIME_ONLY or not self.use_schedule:
+            return "", ""
+        now = now or dt_util.now()
+        if now.weekday() >= 5:
+            up, down = self.cfg.get(A_UP_TIME_WEEKEND) or "", self.cfg.get(A_DOWN_TIME_WEEKEND) or ""
+        else:
+            up, down = self.cfg.get(A_UP_TIME_WEEK) or "", self.cfg.get(A_DOWN_TIME_WEEK) or ""
+        if up:
+            # "HH:MM" (normalisiert) lässt sich als Text vergleichen
+            earliest, latest = self.cfg.get(A_UP_EARLIEST), self.cfg.get(A_UP_LATEST)
+            if earliest and up < earliest:
+                up = earliest
+            if latest and up > latest:
+                up = latest
+        return up, down
+
+    def stagger_offset(self, profile: "ProfileController") -> float:
+        """Seconds this member waits after a scheduled area time (stagger_delay × position in the area)."""
+        if profile not in self.members:
+            return 0.0
+        return self.members.index(profile) * self.stagger
+
+    # ---------- listeners ----------
+    async def async_evaluate_members(self):
+        for profile in list(self.members):
+            profile.request_evaluation(f"area_{self.area_id}")
+
+    @profiled
+    async def _on_brightness_change(self, event):
+        if not has_data(event.data.get("new_state")):
+            return  # Sensor (noch) nicht verfügbar: nichts Neues zu entscheiden
+        started = time.perf_counter()
+        self.evaluate()
+        await self.async_evaluate_members()
+        metrics = (self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id) or {}).get(METRICS)
+        if metrics:
+            metrics.inc("shutterpilot_area_events_total", area=self.area_id)
+            metrics.observe("shutterpilot_area_event_seconds", time.perf_counter() - started, area=self.area_id)
+
+    @profiled
+    async def _on_daily_reset(self, now):
+        """Tägliches Reset um 3 Uhr - Bereichs-Trigger und Profil-Flags zurücksetzen."""
+        _LOGGER.info("Area %s: 🌅 Daily reset at 03:00 - Resetting trigger flags", self.area_id)
+        self._triggered_up = False
+        self._triggered_down = False
+        for profile in self.members:
+            profile.reset_daily_state()
+        self.evaluate()
+        await self.async_evaluate_members()
@@ -0,0 +1,80 @@
+"""Decision audit trail per profile.
+
+Jede Auswertung hinterlässt einen kompakten Eintrag (Zeit, Auslöser,
+wichtige Eingänge, greifende Regel, Ziel, gesendet/unterdrückt) in einem
+Ringpuffer fester Größe. Die Slots werden beim Anlegen reserviert und
+danach nur überschrieben; identische Folgeentscheidungen (z. B. der
+Minuten-Tick) erhöhen nur den Zähler des letzten Eintrags. So bleibt der
+Puffer auch im Dauerbetrieb aktiv, ohne Debug-Logging einschalten zu müssen.
+"""
+from __future__ import annotations
+from typing import Optional
+
+from homeassistant.util import dt as dt_util
+
+DEFAULT_AUDIT_SIZE = 64  # Einträge pro Profil
+
+# Ergebnis eines Fahrbefehls (sonst der Ablehnungsgrund des Bewegungsbudgets)
+RESULT_SENT = "sent"
+RESULT_NONE = "none"           # Regel ohne Fahrbefehl (z. B. Cooldown)
+RESULT_PREEMPTED = "preempted"
+RESULT_PLANNED = "planned"     # an den Start-Abgleich übergeben (reconcile.py)
+
+# Slot-Layout: [ts_first, ts_last, count, source, rule, reason, target, result, lux, temp, elevation]
+_TS_LAST, _COUNT, _SOURCE = 1, 2, 3
+_DECISION = slice(4, 8)  # rule, reason, target, result
+
+
+class AuditTrail:
+    """Fixed-size ring buffer of evaluation records."""
+
+    __slots__ = ("_slots", "_next", "_last", "total")
+
+    def __init__(self, size: int = DEFAULT_AUDIT_SIZE):
+        self._slots: list[Optional[list]] = [None] * max(1, size)
+        self._next = 0
+        self._last: Optional[list] = None
+        self.total = 0
+
+    def append(self, source: str, rule: Optional[str], reason: Optional[str],
+               target: Optional[int], result: str,
+               lux: Optional[float] = None, temp: Optional[float] = None,
+               elevation: Optional[float] = None) -> None:
+        now = dt_util.utcnow().timestamp()
+        self.total += 1
+        last = self._last
+        if last is not None and last[_DECISION] == [rule, reason, target, result]:
+            # Gleiche Entscheidung wie zuvor → nur Zeit, Zähler und Eingänge aktualisieren
+            last[_TS_LAST] = now
+            last[_COUNT] += 1
+            last[_SOURCE] = source
+            last[8:] = (lux, temp, elevation)
+            return
+        slot = [now, now, 1, source, rule, reason, target, result, lux, temp, elevation]
+        self._slots[self._next] = slot
+        self._next = (self._next + 1) % len(self._slots)
+        self._last = slot
+
+    def records(self, limit: Optional[int] = None) -> list[dict]:
+        """Newest first, as JSON-serializable dicts."""
+        size = len(self._slots)
+        result: list[dict] = []
+        for i in range(1, size + 1):
+            slot = self._slots[(self._next - i) % size]
+            if slot is None or (limit is not None and len(result) >= limit):
+                break
+            ts_first, ts_last, count, source, rule, reason, target, res, lux, temp, elevation = slot
+            result.append({
+                "time": dt_util.utc_from_timestamp(ts_last).isoformat(),
+                "first": dt_util.utc_from_timestamp(ts_first).isoformat() if count > 1 else None,
+                "count": count,
+                "source": source,
+                "rule": rule,
+                "reason": reason,
+                "target": target,
+                "result": res,
+                "lux": lux,
+                "temp": temp,
+                "elevation": None if elevation is None else round(elevation, 1),
+            })
+        return result
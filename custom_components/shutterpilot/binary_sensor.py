@@ -0,0 +1,75 @@
+"""Simulated window and door sensors (only with simulation enabled, see simulation.py)."""
+from __future__ import annotations
+import logging
+from typing import Optional
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, SIMULATION
+from .simulation import SimulationController
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Set up simulated window/door sensors."""
+    store = hass.data.get(DOMAIN, {}).get(entry.entry_id) or {}
+    sim: Optional[SimulationController] = store.get(SIMULATION)
+    if sim is None:
+        return
+    entities = []
+    for i in range(sim.cover_count):
+        entities.append(SimulatedOpeningSensor(sim, i, "window"))
+        if sim.has_door(i):
+            entities.append(SimulatedOpeningSensor(sim, i, "door"))
+    async_add_entities(entities)
+
+
+class SimulatedOpeningSensor(BinarySensorEntity):
+    """Window or door that opens at random (Poisson) and closes again after a random time."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, sim: SimulationController, index: int, kind: str):
+        self._sim = sim
+        self.index = index
+        self.kind = kind
+        self._attr_name = f"{kind.capitalize()} {index}"
+        self._attr_unique_id = sim.unique_id(kind, index)
+        self._attr_device_info = sim.device_info
+        self._attr_device_class = BinarySensorDeviceClass.DOOR if kind == "door" else BinarySensorDeviceClass.WINDOW
+        self._attr_is_on = False
+        self._rate = sim.door_rate if kind == "door" else sim.window_rate
+        self._rng = sim.rng(kind, index)
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+    async def async_added_to_hass(self) -> None:
+        self._sim.register(self.kind, self.index, self)
+        self._schedule_open()
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._sim.unregister(self.kind, self.index)
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    def _schedule_open(self) -> None:
+        delay = self._sim.next_opening(self._rate, self._rng)
+        self._unsub = async_call_later(self.hass, delay, self._open) if delay is not None else None
+
+    @callback
+    def _open(self, _now) -> None:
+        self._attr_is_on = True
+        self.async_write_ha_state()
+        self._sim.sensor_event((self.index,))
+        self._unsub = async_call_later(self.hass, self._sim.opening_duration(self._rng), self._close)
+
+    @callback
+    def _close(self, _now) -> None:
+        self._attr_is_on = False
+        self.async_write_ha_state()
+        self._sim.sensor_event((self.index,))
+        self._schedule_open()
@@ -1,9 +1,14 @@
 from __future__ import annotations
+import copy
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers import selector
 from .const import *
+from .config_manager import new_profile_id
+from .horizon import HorizonError, compile_horizon
+from .expressions import ExpressionError, parse_condition
+from .actuator import DEFAULT_MAX_MOVES_PER_HOUR, DEFAULT_MIN_REVERSE_INTERVAL, DEFAULT_MIN_POSITION_DELTA
 
 def _opt(entry):
     return {**entry.data, **entry.options}
@@ -11,6 +16,28 @@ def _opt(entry):
 def _norm_empty(val):
     return None if (val is None or str(val).strip() == "") else val
 
+def _validate_horizon(prof: dict):
+    """Normalize the horizon field in place; returns an error message or None."""
+    spec = (prof.get(P_HORIZON) or "").strip()
+    if not spec:
+        prof[P_HORIZON] = None
+        return None
+    try:
+        table = compile_horizon(spec)
+    except HorizonError as ex:
+        return str(ex)
+    prof[P_HORIZON] = table.spec if table else None
+    return None
+
+def _validate_condition(prof: dict):
+    """Normalize the shade condition in place; returns an error message or None."""
+    try:
+        cond = parse_condition(prof.get(P_SHADE_CONDITION))
+    except ExpressionError as ex:
+        return str(ex)
+    prof[P_SHADE_CONDITION] = cond.source if cond else None
+    return None
+
 def _validate_time(val):
     """Validate time format HH:MM."""
     if not val or val.strip() == "":
@@ -119,8 +146,12 @@ class ShutterPilotConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, entry):
         self.entry = entry
-        self._profiles: list[dict] = list(entry.options.get(CONF_PROFILES, []))
-        self._areas: dict = dict(entry.options.get(CONF_AREAS, entry.data.get(CONF_AREAS, {})))
+        # Tiefe Kopien: die Schritte bearbeiten Profile/Bereiche in place, entry.options gehört den laufenden Controllern
+        self._profiles: list[dict] = copy.deepcopy(list(entry.options.get(CONF_PROFILES, [])))
+        self._areas: dict = copy.deepcopy(dict(entry.options.get(CONF_AREAS, entry.data.get(CONF_AREAS, {}))))
+        self._inputs: dict = copy.deepcopy(dict(entry.options.get(CONF_FUSED_INPUTS, {})))
+        self._simulation: dict = dict(entry.options.get(CONF_SIMULATION, {}))
+        self._edit_input: str | None = None
         self._base_opts: dict = {}
         self._edit_index: int | None = None
         self._edit_area: str | None = None
@@ -139,12 +170,18 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
             vol.Required(CONF_SUN_ELEVATION_END, default=data.get(CONF_SUN_ELEVATION_END, 10)): vol.All(int, vol.Range(min=-10, max=30)),
             vol.Required(CONF_SUN_OFFSET_UP, default=data.get(CONF_SUN_OFFSET_UP, 0)): vol.All(int, vol.Range(min=-120, max=120)),
             vol.Required(CONF_SUN_OFFSET_DOWN, default=data.get(CONF_SUN_OFFSET_DOWN, 0)): vol.All(int, vol.Range(min=-120, max=120)),
+            vol.Optional(CONF_COMPACT_ENTITIES, default=data.get(CONF_COMPACT_ENTITIES, False)): bool,
+            vol.Optional(CONF_MAX_MOVES_PER_HOUR, default=data.get(CONF_MAX_MOVES_PER_HOUR, DEFAULT_MAX_MOVES_PER_HOUR)): vol.All(int, vol.Range(min=0, max=120)),
+            vol.Optional(CONF_MIN_REVERSE_INTERVAL, default=data.get(CONF_MIN_REVERSE_INTERVAL, DEFAULT_MIN_REVERSE_INTERVAL)): vol.All(int, vol.Range(min=0, max=120)),
+            vol.Optional(CONF_MIN_POSITION_DELTA, default=data.get(CONF_MIN_POSITION_DELTA, DEFAULT_MIN_POSITION_DELTA)): vol.All(int, vol.Range(min=0, max=50)),
             vol.Optional("action", default="none"): vol.In([
                 "none",
                 "manage_areas",
+                "manage_inputs",
                 "add_profile",
                 "edit_profile",
-                "remove_profile"
+                "remove_profile",
+                "simulation",
             ]),
         })
 
@@ -169,30 +206,157 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
                 CONF_SUN_ELEVATION_END: user_input[CONF_SUN_ELEVATION_END],
                 CONF_SUN_OFFSET_UP: user_input[CONF_SUN_OFFSET_UP],
                 CONF_SUN_OFFSET_DOWN: user_input[CONF_SUN_OFFSET_DOWN],
+                CONF_COMPACT_ENTITIES: user_input.get(CONF_COMPACT_ENTITIES, False),
+                CONF_MAX_MOVES_PER_HOUR: user_input.get(CONF_MAX_MOVES_PER_HOUR, DEFAULT_MAX_MOVES_PER_HOUR),
+                CONF_MIN_REVERSE_INTERVAL: user_input.get(CONF_MIN_REVERSE_INTERVAL, DEFAULT_MIN_REVERSE_INTERVAL),
+                CONF_MIN_POSITION_DELTA: user_input.get(CONF_MIN_POSITION_DELTA, DEFAULT_MIN_POSITION_DELTA),
             }
             
             action = user_input.get("action", "none")
             if action == "manage_areas":
                 return await self.async_step_manage_areas()
+            if action == "manage_inputs":
+                return await self.async_step_manage_inputs()
             if action == "add_profile":
                 return await self.async_step_add_profile()
             if action == "remove_profile":
                 return await self.async_step_remove_profile_select()
             if action == "edit_profile":
                 return await self.async_step_edit_profile_select()
+            if action == "simulation":
+                return await self.async_step_simulation()
 
             # Speichern
             return self.async_create_entry(
                 title="",
                 data={
+                    **self.entry.options,  # Keys, die hier nicht bearbeitet werden, bleiben erhalten
                     **self._base_opts,
                     CONF_AREAS: self._areas,
-                    CONF_PROFILES: self._profiles
+                    CONF_PROFILES: self._profiles,
+                    CONF_FUSED_INPUTS: self._inputs,
+                    **({CONF_SIMULATION: self._simulation} if self._simulation else {}),
                 }
             )
 
         return self.async_show_form(step_id="init", data_schema=menu)
 
+    # ========== SIMULATION ==========
+
+    async def async_step_simulation(self, user_input=None):
+        """Virtuelle Rollläden und Sensoren für Last-/Dauertests (Entwickler-Feature)."""
+        cur = {**SIM_DEFAULTS, **self._simulation}
+        schema = vol.Schema({
+            vol.Required(SIM_ENABLED, default=cur[SIM_ENABLED]): bool,
+            vol.Required(SIM_COVERS, default=cur[SIM_COVERS]): vol.All(int, vol.Range(min=1, max=5000)),
+            vol.Required(SIM_TRAVEL_TIME, default=cur[SIM_TRAVEL_TIME]): vol.All(vol.Coerce(float), vol.Range(min=1, max=300)),
+            vol.Required(SIM_REPORT_INTERVAL, default=cur[SIM_REPORT_INTERVAL]): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
+            vol.Required(SIM_DROP_RATE, default=cur[SIM_DROP_RATE]): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+            vol.Required(SIM_JITTER, default=cur[SIM_JITTER]): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+            vol.Required(SIM_LUX_WAVEFORM, default=cur[SIM_LUX_WAVEFORM]): vol.In({
+                "sun": "Sonnenstand mit Bewölkung",
+                "sine": "Sinus",
+                "square": "Rechteck",
+                "random": "Zufallsverlauf",
+            }),
+            vol.Required(SIM_LUX_MAX, default=cur[SIM_LUX_MAX]): vol.All(int, vol.Range(min=0, max=200000)),
+            vol.Required(SIM_LUX_PERIOD, default=cur[SIM_LUX_PERIOD]): vol.All(int, vol.Range(min=60, max=86400)),
+            vol.Required(SIM_LUX_INTERVAL, default=cur[SIM_LUX_INTERVAL]): vol.All(int, vol.Range(min=1, max=3600)),
+            vol.Required(SIM_COVERS_PER_SENSOR, default=cur[SIM_COVERS_PER_SENSOR]): vol.All(int, vol.Range(min=1, max=1000)),
+            vol.Required(SIM_WINDOW_RATE, default=cur[SIM_WINDOW_RATE]): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+            vol.Required(SIM_DOOR_EVERY, default=cur[SIM_DOOR_EVERY]): vol.All(int, vol.Range(min=0, max=1000)),
+            vol.Required(SIM_DOOR_RATE, default=cur[SIM_DOOR_RATE]): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+            vol.Required(SIM_OPEN_DURATION, default=cur[SIM_OPEN_DURATION]): vol.All(int, vol.Range(min=1, max=86400)),
+            vol.Required(SIM_SEED, default=cur[SIM_SEED]): int,
+        })
+
+        if user_input is not None:
+            self._simulation = dict(user_input)
+            return await self.async_step_init()
+
+        return self.async_show_form(step_id="simulation", data_schema=schema)
+
+    # ========== FUSED INPUTS ==========
+
+    async def async_step_manage_inputs(self, user_input=None):
+        """Virtuelle Lux-/Temperatur-Eingänge aus mehreren Sensoren verwalten."""
+        menu_options = {
+            "back": "Zurück zum Hauptmenü",
+            "add_input": "➕ Neuen Fused Input hinzufügen",
+        }
+        for key, cfg in self._inputs.items():
+            menu_options[key] = f"✏️ {cfg.get(FI_NAME, key)} (Bearbeiten/Löschen)"
+
+        menu = vol.Schema({
+            vol.Optional("input_action", default="back"): vol.In(menu_options),
+        })
+
+        if user_input is not None:
+            action = user_input.get("input_action", "back")
+            if action == "back":
+                return await self.async_step_init()
+            self._edit_input = None if action == "add_input" else action
+            return await self.async_step_edit_input()
+
+        return self.async_show_form(step_id="manage_inputs", data_schema=menu)
+
+    async def async_step_edit_input(self, user_input=None):
+        """Fused Input anlegen/bearbeiten."""
+        cur = self._inputs.get(self._edit_input, {}) if self._edit_input else {}
+        fields = {
+            vol.Required(FI_NAME, default=cur.get(FI_NAME, "")): str,
+            vol.Required(FI_KIND, default=cur.get(FI_KIND, "lux")): vol.In({
+                "lux": "Helligkeit (Lux)",
+                "temperature": "Temperatur",
+            }),
+            vol.Required(FI_SENSORS, default=cur.get(FI_SENSORS, [])): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor", multiple=True)
+            ),
+            vol.Required(FI_METHOD, default=cur.get(FI_METHOD, FUSION_MAX)): vol.In({
+                FUSION_MAX: "Maximum",
+                FUSION_MEDIAN: "Median",
+                FUSION_MEAN: "Mittelwert",
+                FUSION_MIN: "Minimum",
+            }),
+            vol.Required(FI_STALE_TIMEOUT, default=cur.get(FI_STALE_TIMEOUT, 900)): vol.All(int, vol.Range(min=0, max=86400)),
+        }
+        if self._edit_input:
+            fields[vol.Optional("delete_input", default=False)] = bool
+        schema = vol.Schema(fields)
+
+        if user_input is not None:
+            if user_input.get("delete_input"):
+                self._inputs.pop(self._edit_input, None)
+                # Profile, die den Input nutzen, fallen auf ihren Einzelsensor zurück
+                for p in self._profiles:
+                    for k in (P_LUX_INPUT, P_TEMP_INPUT):
+                        if p.get(k) == self._edit_input:
+                            p[k] = None
+                return await self.async_step_manage_inputs()
+
+            if not user_input.get(FI_SENSORS):
+                return self.async_show_form(
+                    step_id="edit_input", data_schema=schema,
+                    errors={FI_SENSORS: "Mindestens ein Sensor erforderlich"}
+                )
+            key = self._edit_input
+            if key is None:
+                key = "".join(c if c.isalnum() else "_" for c in user_input[FI_NAME].lower()).strip("_") or "input"
+                base, n = key, 2
+                while key in self._inputs:
+                    key, n = f"{base}_{n}", n + 1
+            self._inputs[key] = {k: v for k, v in user_input.items() if k != "delete_input"}
+            return await self.async_step_manage_inputs()
+
+        return self.async_show_form(step_id="edit_input", data_schema=schema)
+
+    def _input_choices(self, kind: str) -> dict:
+        choices = {"": "Keiner (Einzelsensor verwenden)"}
+        for key, cfg in self._inputs.items():
+            if cfg.get(FI_KIND, "lux") == kind:
+                choices[key] = cfg.get(FI_NAME, key)
+        return choices
+
     # ========== BEREICHS-MANAGEMENT ==========
     
     async def async_step_manage_areas(self, user_input=None):
@@ -365,12 +529,15 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
                 vol.Required(A_STAGGER_DELAY, default=current.get(A_STAGGER_DELAY, 10)): vol.All(int, vol.Range(min=0, max=300)),
             }
         else:  # MODE_TIME_ONLY
-            # Nur Zeit: NUR Zeiten + Stagger (KEINE Earliest/Latest)
+            # Nur Zeit: Zeitplan (muss aktiviert werden) + Earliest/Latest + Stagger
             schema_fields = {
+                vol.Required(A_USE_SCHEDULE, default=current.get(A_USE_SCHEDULE, False)): bool,
                 vol.Required(A_UP_TIME_WEEK, default=current.get(A_UP_TIME_WEEK, "07:00")): str,
                 vol.Required(A_DOWN_TIME_WEEK, default=current.get(A_DOWN_TIME_WEEK, "22:00")): str,
                 vol.Required(A_UP_TIME_WEEKEND, default=current.get(A_UP_TIME_WEEKEND, "08:00")): str,
                 vol.Required(A_DOWN_TIME_WEEKEND, default=current.get(A_DOWN_TIME_WEEKEND, "23:00")): str,
+                vol.Required(A_UP_EARLIEST, default=current.get(A_UP_EARLIEST, "06:00")): str,
+                vol.Required(A_UP_LATEST, default=current.get(A_UP_LATEST, "09:00")): str,
                 vol.Required(A_STAGGER_DELAY, default=current.get(A_STAGGER_DELAY, 10)): vol.All(int, vol.Range(min=0, max=300)),
             }
         
@@ -393,6 +560,7 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
                 A_NAME: self._temp_area_data[A_NAME],
                 A_MODE: mode,
                 A_STAGGER_DELAY: user_input.get(A_STAGGER_DELAY, 10),
+                A_USE_SCHEDULE: user_input.get(A_USE_SCHEDULE, current.get(A_USE_SCHEDULE, False)),
             }
             
             # Zeit-Felder (für TIME_ONLY, SUN, GOLDEN_HOUR)
@@ -412,17 +580,11 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
                     A_DOWN_TIME_WEEKEND: current.get(A_DOWN_TIME_WEEKEND, "23:00"),
                 })
             
-            # Earliest/Latest (für SUN, GOLDEN_HOUR, BRIGHTNESS)
-            if mode in [MODE_SUN, MODE_GOLDEN_HOUR, MODE_BRIGHTNESS]:
-                area_data.update({
-                    A_UP_EARLIEST: _validate_time(user_input.get(A_UP_EARLIEST, "06:00")),
-                    A_UP_LATEST: _validate_time(user_input.get(A_UP_LATEST, "09:00")),
-                })
-            else:
-                area_data.update({
-                    A_UP_EARLIEST: current.get(A_UP_EARLIEST, "06:00"),
-                    A_UP_LATEST: current.get(A_UP_LATEST, "09:00"),
-                })
+            # Earliest/Latest (alle Modi; bei TIME_ONLY Begrenzung des Zeitplans)
+            area_data.update({
+                A_UP_EARLIEST: _validate_time(user_input.get(A_UP_EARLIEST, "06:00")),
+                A_UP_LATEST: _validate_time(user_input.get(A_UP_LATEST, "09:00")),
+            })
             
             # Helligkeits-Felder (nur für BRIGHTNESS)
             if mode == MODE_BRIGHTNESS:
@@ -475,6 +637,8 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
             vol.Optional(P_TEMP): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain="sensor", device_class="temperature")
             ),
+            vol.Optional(P_LUX_INPUT, default=""): vol.In(self._input_choices("lux")),
+            vol.Optional(P_TEMP_INPUT, default=""): vol.In(self._input_choices("temperature")),
             
             # Positionen
             vol.Required(P_DAY_POS, default=40): vol.All(int, vol.Range(min=0, max=100)),
@@ -491,6 +655,18 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
             # Sonnenposition
             vol.Optional(P_AZ_MIN, default=-360): vol.Coerce(float),
             vol.Optional(P_AZ_MAX, default=360): vol.Coerce(float),
+            vol.Optional(P_FACADE_AZIMUTH, default=-1): vol.All(vol.Coerce(float), vol.Range(min=-1, max=360)),
+            vol.Optional(P_WINDOW_TILT, default=90): vol.All(vol.Coerce(float), vol.Range(min=0, max=90)),
+            vol.Optional(P_OVERHANG_DEPTH, default=0): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+            vol.Optional(P_REVEAL_DEPTH, default=0): vol.All(vol.Coerce(float), vol.Range(min=0, max=2)),
+            vol.Optional(P_WINDOW_HEIGHT, default=1.5): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+            vol.Optional(P_WINDOW_WIDTH, default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+            vol.Optional(P_IRRADIANCE_TH, default=150): vol.All(vol.Coerce(float), vol.Range(min=0, max=1200)),
+            vol.Optional(P_HORIZON, default=""): str,
+            vol.Optional(P_SHADE_CONDITION, default=""): str,
+            vol.Optional(P_SLAT_TRACKING, default=False): bool,
+            vol.Optional(P_TILT_STEP, default=10): vol.All(int, vol.Range(min=1, max=50)),
+            vol.Optional(P_SLAT_RATIO, default=0.85): vol.All(vol.Coerce(float), vol.Range(min=0.3, max=1.5)),
             
             # Zeiten (überschreibt Bereich)
             vol.Optional(P_UP_TIME, default=""): str,
@@ -510,6 +686,7 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
             # Cooldown & Status
             vol.Optional(P_COOLDOWN, default=self._base_opts.get(CONF_DEFAULT_COOLDOWN, 120)): vol.All(int, vol.Range(min=0, max=1800)),
             vol.Optional(P_ENABLED, default=True): bool,
+            vol.Optional(P_EXPOSE_ENTITIES, default=False): bool,
             
             # Licht-Automation
             vol.Optional(P_LIGHT_ENTITY): selector.EntitySelector(
@@ -523,7 +700,7 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             prof = dict(user_input)
             # Normalisiere leere Felder
-            for k in (P_WINDOW, P_DOOR, P_LUX, P_TEMP, P_LIGHT_ENTITY):
+            for k in (P_WINDOW, P_DOOR, P_LUX, P_TEMP, P_LIGHT_ENTITY, P_LUX_INPUT, P_TEMP_INPUT):
                 prof[k] = _norm_empty(prof.get(k))
             # Validiere Zeitfelder
             for k in (P_UP_TIME, P_DOWN_TIME, P_INTERMEDIATE_TIME):
@@ -539,6 +716,13 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
                     prof[k] = normalized
                 else:
                     prof[k] = None
+            horizon_error = _validate_horizon(prof)
+            if horizon_error:
+                return self.async_show_form(step_id="add_profile", data_schema=schema, errors={P_HORIZON: horizon_error})
+            condition_error = _validate_condition(prof)
+            if condition_error:
+                return self.async_show_form(step_id="add_profile", data_schema=schema, errors={P_SHADE_CONDITION: condition_error})
+            prof[P_ID] = new_profile_id()
             self._profiles.append(prof)
             return await self.async_step_init()
         
@@ -598,6 +782,8 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
             vol.Optional(P_TEMP, default=cur.get(P_TEMP)): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain="sensor", device_class="temperature")
             ),
+            vol.Optional(P_LUX_INPUT, default=cur.get(P_LUX_INPUT) if cur.get(P_LUX_INPUT) in self._inputs else ""): vol.In(self._input_choices("lux")),
+            vol.Optional(P_TEMP_INPUT, default=cur.get(P_TEMP_INPUT) if cur.get(P_TEMP_INPUT) in self._inputs else ""): vol.In(self._input_choices("temperature")),
             
             # Positionen
             vol.Required(P_DAY_POS, default=cur.get(P_DAY_POS, 40)): vol.All(int, vol.Range(min=0, max=100)),
@@ -614,6 +800,18 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
             # Sonnenposition
             vol.Optional(P_AZ_MIN, default=cur.get(P_AZ_MIN, -360)): vol.Coerce(float),
             vol.Optional(P_AZ_MAX, default=cur.get(P_AZ_MAX, 360)): vol.Coerce(float),
+            vol.Optional(P_FACADE_AZIMUTH, default=cur.get(P_FACADE_AZIMUTH, -1)): vol.All(vol.Coerce(float), vol.Range(min=-1, max=360)),
+            vol.Optional(P_WINDOW_TILT, default=cur.get(P_WINDOW_TILT, 90)): vol.All(vol.Coerce(float), vol.Range(min=0, max=90)),
+            vol.Optional(P_OVERHANG_DEPTH, default=cur.get(P_OVERHANG_DEPTH, 0)): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+            vol.Optional(P_REVEAL_DEPTH, default=cur.get(P_REVEAL_DEPTH, 0)): vol.All(vol.Coerce(float), vol.Range(min=0, max=2)),
+            vol.Optional(P_WINDOW_HEIGHT, default=cur.get(P_WINDOW_HEIGHT, 1.5)): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+            vol.Optional(P_WINDOW_WIDTH, default=cur.get(P_WINDOW_WIDTH, 1.0)): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+            vol.Optional(P_IRRADIANCE_TH, default=cur.get(P_IRRADIANCE_TH, 150)): vol.All(vol.Coerce(float), vol.Range(min=0, max=1200)),
+            vol.Optional(P_HORIZON, default=cur.get(P_HORIZON) or ""): str,
+            vol.Optional(P_SHADE_CONDITION, default=cur.get(P_SHADE_CONDITION) or ""): str,
+            vol.Optional(P_SLAT_TRACKING, default=bool(cur.get(P_SLAT_TRACKING, False))): bool,
+            vol.Optional(P_TILT_STEP, default=cur.get(P_TILT_STEP, 10)): vol.All(int, vol.Range(min=1, max=50)),
+            vol.Optional(P_SLAT_RATIO, default=cur.get(P_SLAT_RATIO, 0.85)): vol.All(vol.Coerce(float), vol.Range(min=0.3, max=1.5)),
             
             # Zeiten
             vol.Optional(P_UP_TIME, default=cur.get(P_UP_TIME) or ""): str,
@@ -633,6 +831,7 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
             # Cooldown & Status
             vol.Optional(P_COOLDOWN, default=cur.get(P_COOLDOWN, self._base_opts.get(CONF_DEFAULT_COOLDOWN, 120))): vol.All(int, vol.Range(min=0, max=1800)),
             vol.Optional(P_ENABLED, default=bool(cur.get(P_ENABLED, True))): bool,
+            vol.Optional(P_EXPOSE_ENTITIES, default=bool(cur.get(P_EXPOSE_ENTITIES, False))): bool,
             
             # Licht-Automation
             vol.Optional(P_LIGHT_ENTITY, default=cur.get(P_LIGHT_ENTITY)): selector.EntitySelector(
@@ -646,7 +845,7 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             newp = dict(user_input)
             # Normalisiere leere Felder
-            for k in (P_WINDOW, P_DOOR, P_LUX, P_TEMP, P_LIGHT_ENTITY):
+            for k in (P_WINDOW, P_DOOR, P_LUX, P_TEMP, P_LIGHT_ENTITY, P_LUX_INPUT, P_TEMP_INPUT):
                 newp[k] = _norm_empty(newp.get(k))
             # Validiere Zeitfelder
             for k in (P_UP_TIME, P_DOWN_TIME, P_INTERMEDIATE_TIME):
@@ -662,6 +861,13 @@ class ShutterPilotOptionsFlow(config_entries.OptionsFlow):
                     newp[k] = normalized
                 else:
                     newp[k] = None
+            horizon_error = _validate_horizon(newp)
+            if horizon_error:
+                return self.async_show_form(step_id="edit_profile_form", data_schema=schema, errors={P_HORIZON: horizon_error})
+            condition_error = _validate_condition(newp)
+            if condition_error:
+                return self.async_show_form(step_id="edit_profile_form", data_schema=schema, errors={P_SHADE_CONDITION: condition_error})
+            newp[P_ID] = cur.get(P_ID) or new_profile_id()
             self._profiles[idx] = newp
             return await self.async_step_init()
         
@@ -0,0 +1,340 @@
+"""Patch-based config updates for profiles and areas.
+
+Instead of overwriting all options and reloading the integration, a patch
+adds, updates or removes single profiles (by ID) and areas (by key). The
+change is applied to the running controllers and entities directly; a
+``base_version`` protects against overwriting concurrent edits.
+"""
+from __future__ import annotations
+import logging
+import uuid
+from typing import Any, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    DOMAIN, CONF_PROFILES, CONF_AREAS,
+    RUNTIME_PROFILES, RUNTIME_AREAS, CONFIG_LOCK, APPLIED_VERSION,
+    P_ID, P_NAME, P_COVER, P_AREA, P_ENABLED, P_UP_TIME, P_DOWN_TIME, P_INTERMEDIATE_TIME,
+    A_NAME, A_MODE, A_UP_TIME_WEEK, A_DOWN_TIME_WEEK, A_UP_TIME_WEEKEND, A_DOWN_TIME_WEEKEND,
+    A_UP_EARLIEST, A_UP_LATEST, A_STAGGER_DELAY, A_USE_SCHEDULE, A_BRIGHTNESS_SENSOR, A_BRIGHTNESS_DOWN, A_BRIGHTNESS_UP,
+    MODE_TIME_ONLY, MODE_SUN, MODE_GOLDEN_HOUR, MODE_BRIGHTNESS,
+    SIGNAL_CONFIG_UPDATED, SIGNAL_PROFILES_CHANGED,
+)
+from .websocket_api import config_version
+
+_LOGGER = logging.getLogger(__name__)
+
+# Entity-Arten pro Profil (Teil der unique_id, siehe sensor.py / switch.py)
+PROFILE_ENTITY_KINDS = ("status", "last_action", "cooldown", "sun_elevation", "profile")
+
+AREA_KEYS = {
+    A_NAME, A_MODE, A_UP_TIME_WEEK, A_DOWN_TIME_WEEK, A_UP_TIME_WEEKEND, A_DOWN_TIME_WEEKEND,
+    A_UP_EARLIEST, A_UP_LATEST, A_STAGGER_DELAY, A_USE_SCHEDULE, A_BRIGHTNESS_SENSOR, A_BRIGHTNESS_DOWN, A_BRIGHTNESS_UP,
+}
+AREA_MODES = (MODE_TIME_ONLY, MODE_SUN, MODE_GOLDEN_HOUR, MODE_BRIGHTNESS)
+
+
+class ConfigConflict(HomeAssistantError):
+    """The patch was based on an outdated config version."""
+
+    def __init__(self, current_version: str) -> None:
+        super().__init__(f"Configuration was changed in the meantime (current version {current_version})")
+        self.current_version = current_version
+
+
+def new_profile_id() -> str:
+    """Short random profile ID."""
+    return uuid.uuid4().hex[:12]
+
+
+def ensure_profile_ids(profiles: list[dict]) -> tuple[list[dict], bool]:
+    """Give every profile a unique ID (migration of configs without IDs)."""
+    seen: set[str] = set()
+    result = []
+    changed = False
+    for p in profiles:
+        pid = p.get(P_ID)
+        if not pid or pid in seen:
+            p = {**p, P_ID: new_profile_id()}
+            changed = True
+        seen.add(p[P_ID])
+        result.append(p)
+    return result, changed
+
+
+def profile_unique_ids(entry_id: str, name: str) -> list[str]:
+    """Unique IDs of all per-profile entities."""
+    from .sensor import _sanitize_name
+
+    safe = _sanitize_name(name)
+    return [f"{entry_id}_{kind}_{safe}" for kind in PROFILE_ENTITY_KINDS]
+
+
+def diff_to_patch(options: dict, profiles: Optional[list], areas: Optional[dict]) -> dict:
+    """Turn a full profiles list / areas map (legacy update_config) into a patch.
+
+    Profiles without ID are matched to existing ones by name.
+    """
+    patch: dict[str, Any] = {}
+    if profiles is not None:
+        by_name = {p.get(P_NAME): p.get(P_ID) for p in options.get(CONF_PROFILES, [])}
+        upserts = []
+        for p in profiles:
+            if not p.get(P_ID) and by_name.get(p.get(P_NAME)):
+                p = {**p, P_ID: by_name[p.get(P_NAME)]}
+            upserts.append(p)
+        keep = {p.get(P_ID) for p in upserts}
+        patch["upsert_profiles"] = upserts
+        patch["remove_profiles"] = [
+            p[P_ID] for p in options.get(CONF_PROFILES, []) if p.get(P_ID) and p[P_ID] not in keep
+        ]
+    if areas is not None:  # {} = alle Bereiche entfernen, None = unverändert
+        patch["upsert_areas"] = dict(areas)
+        patch["remove_areas"] = [k for k in options.get(CONF_AREAS, {}) if k not in areas]
+    return patch
+
+
+def _profile_errors(prof: dict, areas: dict) -> list[str]:
+    """Run a patched profile through the options-flow checks; normalizes it in place."""
+    from .config_flow import _norm_empty, _validate_condition, _validate_horizon, _validate_time
+
+    label = prof.get(P_NAME) or prof.get(P_ID)
+    errors = []
+    if not isinstance(prof.get(P_NAME), str) or not prof[P_NAME].strip():
+        errors.append("name is required")
+    cover = prof.get(P_COVER)
+    if not isinstance(cover, str) or not cover.startswith("cover."):
+        errors.append(f"{P_COVER} must be a cover entity")
+    area = _norm_empty(prof.get(P_AREA))
+    if area not in (None, "none") and area not in areas:
+        errors.append(f"unknown area '{area}'")
+    for key in (P_UP_TIME, P_DOWN_TIME, P_INTERMEDIATE_TIME):
+        if prof.get(key):
+            normalized = _validate_time(prof[key])
+            if normalized is None:
+                errors.append(f"invalid time for {key} (expected HH:MM)")
+            prof[key] = normalized
+        else:
+            prof[key] = None
+    for check in (_validate_horizon, _validate_condition):
+        try:
+            error = check(prof)
+        except (AttributeError, TypeError):
+            error = "invalid value"  # z. B. Zahl statt Text
+        if error:
+            errors.append(error)
+    return [f"profile '{label}': {e}" for e in errors]
+
+
+def _area_errors(key: str, cfg: dict) -> list[str]:
+    """Check a patched area like the options flow does; normalizes times in place."""
+    from .config_flow import _validate_time
+
+    errors = []
+    unknown = sorted(set(cfg) - AREA_KEYS)
+    if unknown:
+        errors.append(f"unknown key(s) {', '.join(unknown)}")
+    if cfg.get(A_MODE, MODE_TIME_ONLY) not in AREA_MODES:
+        errors.append(f"unknown mode '{cfg.get(A_MODE)}'")
+    for field in (A_UP_TIME_WEEK, A_DOWN_TIME_WEEK, A_UP_TIME_WEEKEND, A_DOWN_TIME_WEEKEND, A_UP_EARLIEST, A_UP_LATEST):
+        if cfg.get(field):
+            normalized = _validate_time(cfg[field]) if isinstance(cfg[field], str) else None
+            if normalized is None:
+                errors.append(f"invalid time for {field} (expected HH:MM)")
+            else:
+                cfg[field] = normalized
+    return [f"area '{key}': {e}" for e in errors]
+
+
+def _merge(options: dict, patch: dict) -> tuple[dict, dict]:
+    """Apply a patch to the options. Returns (new_options, changes)."""
+    profiles = list(options.get(CONF_PROFILES, []))
+    areas = dict(options.get(CONF_AREAS, {}))
+    index = {p.get(P_ID): i for i, p in enumerate(profiles)}
+    changes = {"added": [], "updated": [], "removed": [], "areas": set()}
+
+    remove_ids = set(patch.get("remove_profiles") or [])
+    for pid in remove_ids:
+        if pid in index:
+            changes["removed"].append(profiles[index[pid]])
+    profiles = [p for p in profiles if p.get(P_ID) not in remove_ids]
+    index = {p.get(P_ID): i for i, p in enumerate(profiles)}
+
+    for key in patch.get("remove_areas") or []:
+        if areas.pop(key, None) is not None:
+            changes["areas"].add(key)
+    errors: list[str] = []
+    for key, cfg in (patch.get("upsert_areas") or {}).items():
+        cfg = dict(cfg)
+        errors.extend(_area_errors(key, cfg))
+        if areas.get(key) != cfg:
+            areas[key] = cfg
+            changes["areas"].add(key)
+
+    for p in patch.get("upsert_profiles") or []:
+        p = dict(p)
+        errors.extend(_profile_errors(p, areas))
+        pid = p.get(P_ID) or new_profile_id()
+        p[P_ID] = pid
+        if pid in index:
+            if profiles[index[pid]] != p:
+                profiles[index[pid]] = p
+                changes["updated"].append(pid)
+        else:
+            index[pid] = len(profiles)
+            profiles.append(p)
+            changes["added"].append(pid)
+
+    names = [p.get(P_NAME) for p in profiles]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        errors.append(f"duplicate profile name(s): {', '.join(map(str, duplicates))}")
+    if errors:
+        raise HomeAssistantError(f"Invalid config patch: {'; '.join(errors)}")
+
+    return {**options, CONF_PROFILES: profiles, CONF_AREAS: areas}, changes
+
+
+def _remove_profile_entities(hass: HomeAssistant, entry: ConfigEntry, name: str) -> None:
+    """Remove the per-profile entities (registry removal also removes the entity)."""
+    registry = er.async_get(hass)
+    for reg_entry in list(er.async_entries_for_config_entry(registry, entry.entry_id)):
+        if reg_entry.unique_id in profile_unique_ids(entry.entry_id, name):
+            registry.async_remove(reg_entry.entity_id)
+
+
+async def _async_apply_runtime(hass: HomeAssistant, entry: ConfigEntry, store: dict, changes: dict) -> None:
+    """Bring controllers and entities in line with the (already saved) options."""
+    from .area import AreaController
+    from .coordinator import ProfileController
+
+    # Bereiche zuerst, damit (neu gestartete) Profile den passenden AreaController finden
+    area_controllers: dict[str, AreaController] = store[RUNTIME_AREAS]
+    for key in changes["areas"]:
+        cfg = entry.options.get(CONF_AREAS, {}).get(key)
+        area_ctrl = area_controllers.get(key)
+        if cfg is None:
+            if area_ctrl:
+                await area_ctrl.async_stop()
+                del area_controllers[key]
+        elif area_ctrl:
+            await area_ctrl.async_reconfigure(cfg)
+        else:
+            area_ctrl = area_controllers[key] = AreaController(hass, entry, key, cfg)
+            await area_ctrl.async_start()
+
+    controllers: list[ProfileController] = store[RUNTIME_PROFILES]
+    by_id = {c.profile_id: c for c in controllers}
+    profiles = {p[P_ID]: p for p in entry.options.get(CONF_PROFILES, [])}
+    needs_entities: list[ProfileController] = []
+
+    for cfg in changes["removed"]:
+        ctrl = by_id.pop(cfg.get(P_ID), None)
+        if ctrl is None:
+            continue
+        await ctrl.async_stop()
+        controllers.remove(ctrl)
+        _remove_profile_entities(hass, entry, ctrl.name)
+        _LOGGER.info("Profile '%s' removed", ctrl.name)
+
+    for pid in changes["updated"]:
+        ctrl = by_id.get(pid)
+        if ctrl is None:
+            continue
+        old_name, had_entities = ctrl.name, ctrl.wants_own_entities()
+        await ctrl.async_reconfigure(profiles[pid])
+        if old_name != ctrl.name or had_entities != ctrl.wants_own_entities():
+            # unique_id hängt am Namen → Entities neu anlegen
+            if had_entities:
+                _remove_profile_entities(hass, entry, old_name)
+            if ctrl.wants_own_entities():
+                needs_entities.append(ctrl)
+        _LOGGER.info("Profile '%s' updated", ctrl.name)
+
+    # Geänderte Bereiche: Profile neu anbinden (Bereich neu/gelöscht) bzw. neu bewerten
+    for key in changes["areas"]:
+        area_ctrl = area_controllers.get(key)
+        for ctrl in controllers:
+            if ctrl.area == key and ctrl.area_controller is not area_ctrl:
+                await ctrl.async_reconfigure(profiles.get(ctrl.profile_id, ctrl.cfg))
+        if area_ctrl:
+            await area_ctrl.async_evaluate_members()
+
+    for pid in changes["added"]:
+        try:
+            ctrl = ProfileController(hass, entry, profiles[pid])
+            await ctrl.async_start()
+        except Exception as ex:
+            _LOGGER.exception("Failed to start profile %s: %s", profiles[pid].get(P_NAME, "?"), ex)
+            continue
+        controllers.append(ctrl)
+        needs_entities.append(ctrl)
+        _LOGGER.info("Profile '%s' added", ctrl.name)
+
+    # Plattformen legen Entities für neue/umbenannte Profile an und
+    # gleichen im Kompaktmodus die Bereichs-Sensoren ab
+    async_dispatcher_send(hass, SIGNAL_PROFILES_CHANGED.format(entry.entry_id), needs_entities)
+
+
+def async_save_options(hass: HomeAssistant, entry: ConfigEntry, options: dict) -> str:
+    """Persist options that are already active at runtime (no reload)."""
+    store = hass.data[DOMAIN][entry.entry_id]
+    version = config_version(options)
+    store[APPLIED_VERSION] = version
+    hass.config_entries.async_update_entry(entry, options=options)
+    return version
+
+
+def async_set_profiles_enabled(hass: HomeAssistant, entry: ConfigEntry, names: set[str], value: bool) -> str:
+    """Persist the enabled flag of some profiles (controllers are updated by the caller)."""
+    profiles = [
+        {**p, P_ENABLED: value} if p.get(P_NAME) in names else p
+        for p in entry.options.get(CONF_PROFILES, [])
+    ]
+    return async_save_options(hass, entry, {**entry.options, CONF_PROFILES: profiles})
+
+
+async def async_apply_patch(hass: HomeAssistant, entry: ConfigEntry, patch: dict) -> dict[str, Any]:
+    """Apply a profile/area patch and return the new config version.
+
+    Raises ConfigConflict if ``base_version`` is set and outdated.
+    """
+    store = hass.data[DOMAIN][entry.entry_id]
+    async with store[CONFIG_LOCK]:
+        current = config_version(dict(entry.options))
+        base = patch.get("base_version")
+        if base and base != current:
+            raise ConfigConflict(current)
+
+        new_options, changes = _merge(dict(entry.options), patch)
+        result = {
+            "version": current,
+            "added": list(changes["added"]),
+            "updated": list(changes["updated"]),
+            "removed": [p.get(P_ID) for p in changes["removed"]],
+            "areas": sorted(changes["areas"]),
+        }
+        if not (changes["added"] or changes["updated"] or changes["removed"] or changes["areas"]):
+            return result
+
+        result["version"] = async_save_options(hass, entry, new_options)
+
+        try:
+            await _async_apply_runtime(hass, entry, store, changes)
+        except Exception as ex:
+            _LOGGER.exception("Applying config patch failed, reloading: %s", ex)
+            hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+            return result
+
+    async_dispatcher_send(hass, SIGNAL_CONFIG_UPDATED.format(entry.entry_id))
+    _LOGGER.info(
+        "Config patch applied (version %s): +%d ~%d -%d profile(s), %d area(s)",
+        result["version"], len(result["added"]), len(result["updated"]),
+        len(result["removed"]), len(result["areas"]),
+    )
+    return result
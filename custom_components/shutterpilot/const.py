@@ -4,9 +4,63 @@ DOMAIN = "shutterpilot"
 CONF_GLOBAL_AUTO = "global_auto"
 CONF_DEFAULT_VPOS = "default_ventilation_position"
 CONF_DEFAULT_COOLDOWN = "default_cooldown"
+CONF_COMPACT_ENTITIES = "compact_entities"  # Kompaktmodus: ein Sammel-Statussensor pro Bereich statt Entities pro Profil
+CONF_MAX_MOVES_PER_HOUR = "max_moves_per_hour"        # Bewegungsbudget: max. Automatik-Fahrten pro Stunde und Rollladen
+CONF_MIN_REVERSE_INTERVAL = "min_reverse_interval"    # Minuten zwischen Fahrten in Gegenrichtung
+CONF_MIN_POSITION_DELTA = "min_position_delta"        # Mindest-Positionsänderung in %
 
 # Areas (Bereiche) - Zeit-Templates
 CONF_AREAS = "areas"
+CONF_FUSED_INPUTS = "fused_inputs"  # Virtuelle Lux-/Temperatur-Eingänge aus mehreren Sensoren
+
+# Fused-Input-Keys
+FI_NAME = "name"
+FI_KIND = "kind"                    # "lux" / "temperature"
+FI_SENSORS = "sensors"              # Liste von Sensor-Entities
+FI_METHOD = "method"                # max / min / median / mean
+FI_STALE_TIMEOUT = "stale_timeout"  # Sekunden; ältere Werte werden ignoriert (0 = aus)
+FUSION_MAX = "max"
+FUSION_MIN = "min"
+FUSION_MEDIAN = "median"
+FUSION_MEAN = "mean"
+
+# Simulation (Entwickler-Feature): virtuelle Rollläden und Sensoren für Last-/Dauertests
+CONF_SIMULATION = "simulation"
+SIM_ENABLED = "enabled"
+SIM_COVERS = "covers"                        # Anzahl virtueller Rollläden
+SIM_TRAVEL_TIME = "travel_time"              # Sekunden für 0 → 100 %
+SIM_REPORT_INTERVAL = "report_interval"      # Sekunden zwischen Positionsmeldungen während der Fahrt
+SIM_DROP_RATE = "drop_rate"                  # Anteil verlorener Befehle (0–1)
+SIM_JITTER = "jitter"                        # max. zufällige Verzögerung bis Fahrtbeginn in Sekunden
+SIM_LUX_WAVEFORM = "lux_waveform"            # sun / sine / square / random
+SIM_LUX_MAX = "lux_max"
+SIM_LUX_PERIOD = "lux_period"                # Periode für sine/square in Sekunden
+SIM_LUX_INTERVAL = "lux_interval"            # Sekunden zwischen Lux-Meldungen
+SIM_COVERS_PER_SENSOR = "covers_per_sensor"  # Rollläden pro Lux-Sensor
+SIM_WINDOW_RATE = "window_rate"              # Fensteröffnungen pro Stunde und Fenster
+SIM_DOOR_EVERY = "door_every"                # jeder n-te Rollladen hat eine Tür (0 = keine)
+SIM_DOOR_RATE = "door_rate"                  # Türöffnungen pro Stunde und Tür
+SIM_OPEN_DURATION = "open_duration"          # mittlere Öffnungsdauer in Sekunden
+SIM_SEED = "seed"
+LUX_WAVEFORMS = ("sun", "sine", "square", "random")
+SIM_DEFAULTS = {
+    SIM_ENABLED: False,
+    SIM_COVERS: 10,
+    SIM_TRAVEL_TIME: 25,
+    SIM_REPORT_INTERVAL: 2,
+    SIM_DROP_RATE: 0.01,
+    SIM_JITTER: 0.5,
+    SIM_LUX_WAVEFORM: "sun",
+    SIM_LUX_MAX: 60000,
+    SIM_LUX_PERIOD: 3600,
+    SIM_LUX_INTERVAL: 60,
+    SIM_COVERS_PER_SENSOR: 10,
+    SIM_WINDOW_RATE: 0.125,
+    SIM_DOOR_EVERY: 10,
+    SIM_DOOR_RATE: 1.0,
+    SIM_OPEN_DURATION: 300,
+    SIM_SEED: 1,
+}
 # Vordefinierte Standard-Bereiche (werden bei Setup angelegt)
 AREA_LIVING = "living"
 AREA_SLEEPING = "sleeping"
@@ -22,6 +76,7 @@ A_DOWN_TIME_WEEKEND = "down_time_weekend"
 A_UP_EARLIEST = "up_earliest"
 A_UP_LATEST = "up_latest"
 A_STAGGER_DELAY = "stagger_delay"
+A_USE_SCHEDULE = "use_schedule"  # bool: Zeitplan (time_only) gilt für Profile ohne eigene Zeiten
 A_MODE = "area_mode"  # time_only, sun, golden_hour, brightness
 A_BRIGHTNESS_SENSOR = "brightness_sensor"  # Helligkeitssensor für Bereich
 A_BRIGHTNESS_DOWN = "brightness_down_lux"   # Lux-Wert zum Runterfahren
@@ -35,6 +90,7 @@ MODE_BRIGHTNESS = "brightness"
 
 # Profiles
 CONF_PROFILES = "profiles"
+P_ID = "id"                    # Stabile Profil-ID (für Patch-Updates der Card)
 P_NAME = "name"
 P_COVER = "cover_entity_id"
 P_AREA = "area"                # Bereichs-Zuordnung (living/sleeping/children/none)
@@ -46,6 +102,8 @@ P_VPOS = "vent_position"
 P_DOOR_SAFE = "door_safe_position"
 P_LUX = "lux_sensor"
 P_TEMP = "temp_sensor"
+P_LUX_INPUT = "lux_input"      # Key eines Fused Inputs (ersetzt lux_sensor)
+P_TEMP_INPUT = "temp_input"    # Key eines Fused Inputs (ersetzt temp_sensor)
 P_LUX_TH = "lux_threshold"
 P_TEMP_TH = "temp_threshold"
 P_LUX_HYSTERESIS = "lux_hysteresis"      # Hysterese in % für Helligkeitssensor
@@ -54,8 +112,27 @@ P_UP_TIME = "up_time"          # "HH:MM" or "" (überschreibt Bereich)
 P_DOWN_TIME = "down_time"      # "HH:MM" or "" (überschreibt Bereich)
 P_AZ_MIN = "azimuth_min"       # float deg
 P_AZ_MAX = "azimuth_max"       # float deg
+
+# Fenstergeometrie (optional; ersetzt den Azimut-Bereich durch die Einstrahlung auf das Glas)
+P_FACADE_AZIMUTH = "facade_azimuth"      # Ausrichtung der Fassade in ° (0 = Nord, 180 = Süd), -1 = aus
+P_WINDOW_TILT = "window_tilt"            # 90 = senkrecht, 0 = waagerecht (Dachfenster)
+P_OVERHANG_DEPTH = "overhang_depth"      # Dachüberstand/Balkon über dem Fenster in m
+P_REVEAL_DEPTH = "reveal_depth"          # Laibungstiefe in m
+P_WINDOW_HEIGHT = "window_height"        # m
+P_WINDOW_WIDTH = "window_width"          # m
+P_IRRADIANCE_TH = "irradiance_threshold" # W/m² direkte Einstrahlung auf das Glas für Beschattung
+P_HORIZON = "horizon"                    # Horizont/Verschattung: "Azimut:Elevation, ..." (z. B. "150:5, 200:25")
+
+# Eigene Bedingung für die Beschattung (siehe expressions.py)
+P_SHADE_CONDITION = "shade_condition"    # Ausdruck, z. B. "input_boolean.guest_mode == off and sensor.temp > 24"
+
+# Lamellennachführung (Raffstore)
+P_SLAT_TRACKING = "slat_tracking"        # bool: Lamellen beim Beschatten nach Sonnenstand stellen
+P_TILT_STEP = "tilt_step"                # Quantisierung der Lamellenposition in %
+P_SLAT_RATIO = "slat_ratio"              # Lamellenabstand / Lamellenbreite
 P_COOLDOWN = "cooldown_sec"    # int sec
 P_ENABLED = "enabled"          # bool
+P_EXPOSE_ENTITIES = "expose_entities"  # bool: Im Kompaktmodus trotzdem eigene Entities anlegen
 
 # Erweiterte Features
 P_WINDOW_OPEN_DELAY = "window_open_delay"    # Verzögerung beim Öffnen (Sekunden)
@@ -88,3 +165,19 @@ DATA = "data"
 RUNTIME_PROFILES = "runtime_profiles"
 RUNTIME_AREAS = "runtime_areas"
 UNSUBS = "unsubs"
+CONFIG_LOCK = "config_lock"            # Serialisiert Patch-Updates
+APPLIED_VERSION = "applied_version"    # Config-Version, die zur Laufzeit schon aktiv ist
+LIGHT_ACTUATOR = "light_actuator"      # Gemeinsamer Licht-Aktor (Dedup + Sammel-Calls)
+FUSED_INPUTS = "fused_inputs"          # Laufende FusedInput-Objekte pro Key
+SOLAR_MODEL = "solar_model"            # Fenstergeometrie aller Profile, ein Rechendurchlauf pro Sonnenstand
+METRICS = "metrics"                    # Zähler/Latenz-Histogramme (Diagnose, /api/shutterpilot/metrics)
+SIMULATION = "simulation"              # SimulationController (nur wenn Simulation aktiv)
+LOADED_PLATFORMS = "loaded_platforms"  # Tatsächlich weitergeleitete Plattformen (für Unload)
+RECONCILER = "reconciler"              # Start-Abgleich aller Rollläden (reconcile.py)
+ADMISSION = "admission"                # Start-Backpressure während HA startet (admission.py)
+
+# Dispatcher signals (format with entry_id)
+SIGNAL_CONFIG_UPDATED = "shutterpilot_config_updated_{}"
+SIGNAL_STATUS_UPDATED = "shutterpilot_status_updated_{}"
+SIGNAL_FUSED_INPUT_UPDATED = "shutterpilot_fused_input_{}_{}"  # entry_id, Key
+SIGNAL_PROFILES_CHANGED = "shutterpilot_profiles_changed_{}"  # Profile hinzugefügt/umbenannt → Entities anlegen
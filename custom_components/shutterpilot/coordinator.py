@@ -1,12 +1,14 @@
 from __future__ import annotations
 import asyncio
 import logging
+import time
 from datetime import timedelta, datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from homeassistant.core import HomeAssistant, CALLBACK_TYPE
+from homeassistant.core import HomeAssistant, CALLBACK_TYPE, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_ON
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers.event import (
     async_track_state_change_event,
     async_track_sunrise,
@@ -14,27 +16,73 @@ from homeassistant.helpers.event import (
     async_track_time_interval,
     async_call_later,
 )
+from homeassistant.util import dt as dt_util
 
 from .const import (
-    CONF_GLOBAL_AUTO, CONF_DEFAULT_VPOS, CONF_DEFAULT_COOLDOWN,
+    CONF_GLOBAL_AUTO, CONF_DEFAULT_VPOS, CONF_DEFAULT_COOLDOWN, CONF_COMPACT_ENTITIES,
     CONF_AREAS, CONF_SUMMER_START, CONF_SUMMER_END, CONF_SUN_ELEVATION_END,
     CONF_SUN_OFFSET_UP, CONF_SUN_OFFSET_DOWN,
+    CONF_MAX_MOVES_PER_HOUR, CONF_MIN_REVERSE_INTERVAL, CONF_MIN_POSITION_DELTA,
     AREA_LIVING, AREA_SLEEPING, AREA_CHILDREN,
     A_NAME, A_MODE, A_UP_TIME_WEEK, A_DOWN_TIME_WEEK, A_UP_TIME_WEEKEND,
     A_DOWN_TIME_WEEKEND, A_UP_EARLIEST, A_UP_LATEST, A_STAGGER_DELAY,
     A_BRIGHTNESS_SENSOR, A_BRIGHTNESS_DOWN, A_BRIGHTNESS_UP,
     MODE_TIME_ONLY, MODE_SUN, MODE_GOLDEN_HOUR, MODE_BRIGHTNESS,
-    P_NAME, P_COVER, P_AREA, P_WINDOW, P_DOOR, P_DAY_POS, P_NIGHT_POS, P_VPOS,
-    P_DOOR_SAFE, P_LUX, P_TEMP, P_LUX_TH, P_TEMP_TH, P_LUX_HYSTERESIS, P_TEMP_HYSTERESIS,
-    P_UP_TIME, P_DOWN_TIME, P_AZ_MIN, P_AZ_MAX, P_COOLDOWN, P_ENABLED,
+    P_ID, P_NAME, P_COVER, P_AREA, P_WINDOW, P_DOOR, P_DAY_POS, P_NIGHT_POS, P_VPOS,
+    P_DOOR_SAFE, P_LUX, P_TEMP, P_LUX_INPUT, P_TEMP_INPUT, P_LUX_TH, P_TEMP_TH, P_LUX_HYSTERESIS, P_TEMP_HYSTERESIS,
+    P_UP_TIME, P_DOWN_TIME, P_AZ_MIN, P_AZ_MAX, P_COOLDOWN, P_ENABLED, P_EXPOSE_ENTITIES,
     P_WINDOW_OPEN_DELAY, P_WINDOW_CLOSE_DELAY, P_INTERMEDIATE_POS, P_INTERMEDIATE_TIME,
     P_HEAT_PROTECTION, P_HEAT_PROTECTION_TEMP, P_KEEP_SUNPROTECT, P_BRIGHTNESS_END_DELAY,
     P_NO_CLOSE_SUMMER,
     P_LIGHT_ENTITY, P_LIGHT_BRIGHTNESS, P_LIGHT_ON_SHADE, P_LIGHT_ON_NIGHT,
+    P_FACADE_AZIMUTH, P_WINDOW_TILT, P_OVERHANG_DEPTH, P_REVEAL_DEPTH, P_WINDOW_HEIGHT,
+    P_WINDOW_WIDTH, P_IRRADIANCE_TH, P_HORIZON, P_SLAT_TRACKING, P_TILT_STEP, P_SLAT_RATIO,
+    P_SHADE_CONDITION,
+    DOMAIN, RUNTIME_AREAS, LIGHT_ACTUATOR, SOLAR_MODEL, FUSED_INPUTS, METRICS,
+    SIGNAL_STATUS_UPDATED, SIGNAL_FUSED_INPUT_UPDATED,
+)
+from .admission import has_data
+from .actuator import (
+    LightActuator, MovementBudget, REJECT_DELTA, REJECT_REVERSE, REJECT_RATE,
+    DEFAULT_MAX_MOVES_PER_HOUR, DEFAULT_MIN_REVERSE_INTERVAL, DEFAULT_MIN_POSITION_DELTA,
+)
+from .audit import AuditTrail, RESULT_SENT, RESULT_NONE, RESULT_PREEMPTED, RESULT_PLANNED
+from .area import AreaController, AreaDecision, TRIGGER_DOWN, TRIGGER_UP
+from .expressions import Condition, ExpressionError, parse_condition
+from .metrics import MetricsRegistry
+from .profiler import profiled
+from .reconcile import SUPERSEDED
+from .horizon import HorizonError, HorizonTable, compile_horizon
+from .hysteresis import SchmittTrigger
+from .rules import (
+    Outcome, Rule, RuleEngine,
+    INPUT_DOOR, INPUT_WINDOW, INPUT_LATCH, INPUT_COOLDOWN, INPUT_CLOCK, INPUT_AREA,
+    INPUT_SUN, INPUT_LUX, INPUT_TEMP, INPUT_CONDITION,
+)
+from .solar import (
+    DEFAULT_IRRADIANCE_THRESHOLD, DEFAULT_SLAT_RATIO, Exposure, SolarModel, WindowGeometry,
+    cutoff_tilt, quantize,
 )
 
+if TYPE_CHECKING:
+    from .admission import StartupAdmission
+    from .reconcile import Reconciler
+
 _LOGGER = logging.getLogger(__name__)
 
+# Welche Regel-Eingänge ein Auswertungs-Anstoß ändert (unbekannte Quelle → alle Regeln neu)
+_SOURCE_INPUTS: dict[str, tuple[str, ...]] = {
+    "tick": (INPUT_CLOCK, INPUT_SUN, INPUT_COOLDOWN),
+    "sun_event": (INPUT_SUN,),
+    "lux_change": (INPUT_LUX,),
+    "temp_change": (INPUT_TEMP,),
+    "door_closed": (INPUT_DOOR,),
+    "window_closed": (INPUT_WINDOW, INPUT_COOLDOWN),
+    "cooldown_expired": (INPUT_COOLDOWN,),
+    "schedule_stagger": (INPUT_CLOCK,),
+    "condition_change": (INPUT_CONDITION,),
+}
+
 def _to_int(val, default):
     try:
         return int(val)
@@ -54,7 +102,67 @@ class ProfileController:
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry, cfg: dict):
         self.hass = hass
         self.entry = entry
+        # Hysterese: Schmitt-Trigger für Lux/Temperatur (Zustand bleibt bei Rekonfiguration erhalten)
+        self._lux_trigger = SchmittTrigger(20000, 20)
+        self._temp_trigger = SchmittTrigger(26, 10)
+        # Bewegungsbudget pro Rollladen (Grenzen global, siehe _load_config)
+        self._budget = MovementBudget()
+        self._last_exposure: Optional[Exposure] = None
+        self._horizon_blocked: bool = False
+        self._last_tilt: Optional[int] = None  # zuletzt gesendete (quantisierte) Lamellenposition
+        # Regeltabelle mit deklarierten Eingängen; Ergebnisse werden bis zur Änderung eines Eingangs wiederverwendet
+        self._rules = self._build_rules()
+        # Audit-Trail: kompakter Eintrag pro Auswertung (Ringpuffer fester Größe)
+        self._audit = AuditTrail()
+        self._cmd: Optional[tuple[int, str]] = None  # (Ziel, gesendet/Ablehnungsgrund) des letzten Fahrbefehls
+        self._audit_inputs: tuple = (None, None, None)  # lux, temp, elevation der letzten Sonnen-/Beschattungsregel
+        self._metrics: Optional[MetricsRegistry] = None  # wird in async_start aufgelöst
+        # Start-Abgleich (reconcile.py): solange gesetzt, werden Fahrten nur geplant statt gesendet
+        self._reconciler: Optional[Reconciler] = None
+        self._move_seq = 0  # zählt Fahrentscheidungen; eine neuere verwirft die geplante Abgleich-Fahrt
+        self._admission: Optional[StartupAdmission] = None  # hält Auswertungen während des HA-Starts zurück
+        self._load_config(cfg)
+
+        self._cooldown_until: Optional[datetime] = None
+        self._cooldown_timer: Optional[CALLBACK_TYPE] = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+        
+        # Status tracking for sensors
+        self._last_action_reason: str = "unknown"
+        self._status: str = "inactive"
+        self._sensor_update_callbacks: list[CALLBACK_TYPE] = []
+        self._published_status: Optional[dict] = None  # Letzter per WebSocket verteilter Status
+        
+        self._brightness_end_timer: Optional[CALLBACK_TYPE] = None
+        
+        # Trigger-basiertes System (wie input_boolean.rolladen_triggered in den Original-Automationen)
+        self._system_is_moving_cover: bool = False  # Flag: Wir bewegen gerade den Rollladen
+        # Trigger-Flags (hoch/runter) liegen im AreaController; hier nur der zuletzt angewendete Trigger
+        self.area_controller: Optional[AreaController] = None
+        self._area_trigger_seq: Optional[int] = None
+        # Gestaffelter Bereichs-Zeitplan: Timer läuft für (Datum, Richtung), danach ist die Fahrt fällig
+        self._schedule_timer: Optional[CALLBACK_TYPE] = None
+        self._schedule_key: Optional[tuple] = None
+        self._schedule_due: Optional[str] = None
+        self._window_not_close: bool = False  # Flag: Rollladen ist unten, Fenster/Tür-Logik aktiv (wie input_boolean.window_not_close)
+        self._last_cover_position: Optional[int] = None  # Letzte bekannte Position
+        self._reset_timer: Optional[CALLBACK_TYPE] = None  # Timer für tägliches Reset
+
+        # Single-Flight-Auswertung: höchstens ein Lauf pro Profil, neuere Anstöße → ein Folgelauf
+        self._eval_task: Optional[asyncio.Task] = None
+        self._eval_pending: Optional[str] = None  # Quelle des gesammelten Folgelaufs
+        self._eval_stats: dict[str, int] = {
+            "requested": 0,    # Anstöße insgesamt
+            "runs": 0,         # tatsächlich ausgeführte Läufe
+            "concurrent": 0,   # Anstöße während eines laufenden Laufs
+            "collapsed": 0,    # Anstöße, die in einen bereits geplanten Folgelauf fielen
+            "preempted": 0,    # durch Sicherheits-Trigger abgebrochene Läufe
+        }
+
+    def _load_config(self, cfg: dict):
+        """Read profile settings (also used when the profile is patched at runtime)."""
         self.cfg = cfg
+        self.profile_id = cfg.get(P_ID)
         self.name = cfg.get(P_NAME, "Cover")
         self.cover = cfg.get(P_COVER)
         self.area = cfg.get(P_AREA, "none")  # Bereichs-Zuordnung
@@ -62,20 +170,58 @@ class ProfileController:
         self.door = cfg.get(P_DOOR) or None
         self.day_pos = _to_int(cfg.get(P_DAY_POS, 40), 40)
         self.night_pos = _to_int(cfg.get(P_NIGHT_POS, 0), 0)
-        self.vpos = _to_int(cfg.get(P_VPOS, entry.options.get(CONF_DEFAULT_VPOS, 30)), 30)
+        self.vpos = _to_int(cfg.get(P_VPOS, self.entry.options.get(CONF_DEFAULT_VPOS, 30)), 30)
         self.door_safe = _to_int(cfg.get(P_DOOR_SAFE, self.vpos), self.vpos)
         self.lux_sensor = cfg.get(P_LUX) or None
         self.temp_sensor = cfg.get(P_TEMP) or None
+        # Fused Inputs (mehrere Sensoren, einmal pro Update berechnet) haben Vorrang vor Einzelsensoren
+        self.lux_input = cfg.get(P_LUX_INPUT) or None
+        self.temp_input = cfg.get(P_TEMP_INPUT) or None
         self.lux_th = _to_float(cfg.get(P_LUX_TH, 20000), 20000)
         self.temp_th = _to_float(cfg.get(P_TEMP_TH, 26), 26)
         self.lux_hysteresis = _to_int(cfg.get(P_LUX_HYSTERESIS, 20), 20)
         self.temp_hysteresis = _to_int(cfg.get(P_TEMP_HYSTERESIS, 10), 10)
+        self._lux_trigger.configure(self.lux_th, self.lux_hysteresis)
+        self._temp_trigger.configure(self.temp_th, self.temp_hysteresis)
+        opts = self.entry.options
+        self._budget.configure(
+            _to_int(opts.get(CONF_MAX_MOVES_PER_HOUR, DEFAULT_MAX_MOVES_PER_HOUR), DEFAULT_MAX_MOVES_PER_HOUR),
+            _to_int(opts.get(CONF_MIN_REVERSE_INTERVAL, DEFAULT_MIN_REVERSE_INTERVAL), DEFAULT_MIN_REVERSE_INTERVAL),
+            _to_int(opts.get(CONF_MIN_POSITION_DELTA, DEFAULT_MIN_POSITION_DELTA), DEFAULT_MIN_POSITION_DELTA),
+        )
         self.az_min = _to_float(cfg.get(P_AZ_MIN, -360), -360)
         self.az_max = _to_float(cfg.get(P_AZ_MAX, 360), 360)
+        facade_az = _to_float(cfg.get(P_FACADE_AZIMUTH, -1), -1)
+        self.geometry: Optional[WindowGeometry] = WindowGeometry(
+            azimuth=facade_az % 360,
+            tilt=_to_float(cfg.get(P_WINDOW_TILT, 90), 90),
+            overhang=_to_float(cfg.get(P_OVERHANG_DEPTH, 0), 0),
+            reveal=_to_float(cfg.get(P_REVEAL_DEPTH, 0), 0),
+            height=_to_float(cfg.get(P_WINDOW_HEIGHT, 1.5), 1.5),
+            width=_to_float(cfg.get(P_WINDOW_WIDTH, 1.0), 1.0),
+        ) if facade_az >= 0 else None
+        try:
+            # Kompilierte Lookup-Tabelle; gleiche Angaben teilen sich eine Tabelle
+            self.horizon: Optional[HorizonTable] = compile_horizon(cfg.get(P_HORIZON))
+        except HorizonError as ex:
+            _LOGGER.warning("Profile %s: ignoring invalid horizon: %s", self.name, ex)
+            self.horizon = None
+        try:
+            # Einmal kompiliert; abhängige Entities werden in async_start abonniert
+            self.shade_condition: Optional[Condition] = parse_condition(cfg.get(P_SHADE_CONDITION))
+        except ExpressionError as ex:
+            _LOGGER.warning("Profile %s: ignoring invalid shade condition: %s", self.name, ex)
+            self.shade_condition = None
+        self._condition_result: Optional[bool] = None
+        self.slat_tracking = bool(cfg.get(P_SLAT_TRACKING, False))
+        self.tilt_step = max(1, _to_int(cfg.get(P_TILT_STEP, 10), 10))
+        self.slat_ratio = _to_float(cfg.get(P_SLAT_RATIO, DEFAULT_SLAT_RATIO), DEFAULT_SLAT_RATIO)
+        self.irradiance_th = _to_float(cfg.get(P_IRRADIANCE_TH, DEFAULT_IRRADIANCE_THRESHOLD), DEFAULT_IRRADIANCE_THRESHOLD)
         self.up_time = cfg.get(P_UP_TIME) or ""
         self.down_time = cfg.get(P_DOWN_TIME) or ""
-        self.cooldown = _to_int(cfg.get(P_COOLDOWN, entry.options.get(CONF_DEFAULT_COOLDOWN, 120)), 120)
+        self.cooldown = _to_int(cfg.get(P_COOLDOWN, self.entry.options.get(CONF_DEFAULT_COOLDOWN, 120)), 120)
         self.enabled = bool(cfg.get(P_ENABLED, True))
+        self.expose_entities = bool(cfg.get(P_EXPOSE_ENTITIES, False))
         
         # Erweiterte Features
         self.window_open_delay = _to_int(cfg.get(P_WINDOW_OPEN_DELAY, 0), 0)
@@ -93,33 +239,22 @@ class ProfileController:
         self.light_brightness = _to_int(cfg.get(P_LIGHT_BRIGHTNESS, 80), 80)
         self.light_on_shade = bool(cfg.get(P_LIGHT_ON_SHADE, True))
         self.light_on_night = bool(cfg.get(P_LIGHT_ON_NIGHT, True))
-        
-        # Lade Bereichs-Konfiguration
-        self._area_config = self._get_area_config()
+        self._rules.invalidate_all()  # Schwellwerte/Sensoren können sich geändert haben
 
-        self._cooldown_until: Optional[datetime] = None
-        self._cooldown_timer: Optional[CALLBACK_TYPE] = None
-        self._unsubs: list[CALLBACK_TYPE] = []
-        
-        # Status tracking for sensors
-        self._last_action_reason: str = "unknown"
-        self._status: str = "inactive"
-        self._sensor_update_callbacks: list[CALLBACK_TYPE] = []
-        
-        # Hysterese-Tracking
-        self._last_lux_trigger_active: Optional[bool] = None
-        self._last_temp_trigger_active: Optional[bool] = None
-        self._brightness_end_timer: Optional[CALLBACK_TYPE] = None
-        
-        # Trigger-basiertes System (wie input_boolean.rolladen_triggered in den Original-Automationen)
-        self._system_is_moving_cover: bool = False  # Flag: Wir bewegen gerade den Rollladen
-        self._triggered_up: bool = False  # Flag: System hat HOCH getriggert (darf nicht nochmal hoch bis Reset)
-        self._triggered_down: bool = False  # Flag: System hat RUNTER getriggert (darf nicht nochmal runter bis Reset)
-        self._window_not_close: bool = False  # Flag: Rollladen ist unten, Fenster/Tür-Logik aktiv (wie input_boolean.window_not_close)
-        self._last_cover_position: Optional[int] = None  # Letzte bekannte Position
-        self._reset_timer: Optional[CALLBACK_TYPE] = None  # Timer für tägliches Reset
+    async def async_reconfigure(self, cfg: dict):
+        """Apply a changed profile/area config without recreating the controller.
 
-    async def async_start(self):
+        Runtime state (trigger flags, cooldown, sensor callbacks) is kept, so
+        existing entities stay bound to this controller.
+        """
+        await self.async_stop()
+        if cfg.get(P_AREA, "none") != self.area:
+            self._area_trigger_seq = None  # anderer Bereich → dessen aktuellen Trigger übernehmen
+        self._load_config(cfg)
+        await self.async_start()
+
+    async def async_start(self, evaluate: bool = True):
+        """Subscribe to inputs; ``evaluate=False`` leaves the first evaluation to the startup reconciliation."""
         if not self.cover:
             _LOGGER.warning("Profile %s has no cover_entity_id; skipping", self.name)
             return
@@ -129,22 +264,40 @@ class ProfileController:
         # Validation happens during actual operations instead
         _LOGGER.debug("Profile %s: Starting (entity validation deferred to runtime)", self.name)
 
+        store = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id) or {}
+        self._metrics = store.get(METRICS)
+
+        # Fenstergeometrie beim gemeinsamen Sonnenmodell anmelden
+        solar = self._resolve_solar_model()
+        if solar:
+            solar.set_window(self._solar_key, self.geometry)
+
         # Subscribe to events
         if self.window:
             self._unsubs.append(async_track_state_change_event(self.hass, [self.window], self._on_window_change))
         if self.door:
             self._unsubs.append(async_track_state_change_event(self.hass, [self.door], self._on_door_change))
-        if self.lux_sensor:
-            self._unsubs.append(async_track_state_change_event(self.hass, [self.lux_sensor], self._on_env_change))
-        if self.temp_sensor:
-            self._unsubs.append(async_track_state_change_event(self.hass, [self.temp_sensor], self._on_env_change))
+        if self.lux_input:
+            self._unsubs.append(async_dispatcher_connect(
+                self.hass, SIGNAL_FUSED_INPUT_UPDATED.format(self.entry.entry_id, self.lux_input), self._on_fused_lux_change
+            ))
+        elif self.lux_sensor:
+            self._unsubs.append(async_track_state_change_event(self.hass, [self.lux_sensor], self._on_lux_change))
+        if self.temp_input:
+            self._unsubs.append(async_dispatcher_connect(
+                self.hass, SIGNAL_FUSED_INPUT_UPDATED.format(self.entry.entry_id, self.temp_input), self._on_fused_temp_change
+            ))
+        elif self.temp_sensor:
+            self._unsubs.append(async_track_state_change_event(self.hass, [self.temp_sensor], self._on_temp_change))
+        if self.shade_condition and self.shade_condition.entities:
+            self._unsubs.append(async_track_state_change_event(
+                self.hass, sorted(self.shade_condition.entities), self._on_condition_change
+            ))
         
-        # Subscribe to area brightness sensor if in brightness mode
-        area_mode = self._area_config.get(A_MODE, MODE_TIME_ONLY)
-        area_brightness_sensor = self._area_config.get(A_BRIGHTNESS_SENSOR)
-        if area_mode == MODE_BRIGHTNESS and area_brightness_sensor:
-            self._unsubs.append(async_track_state_change_event(self.hass, [area_brightness_sensor], self._on_env_change))
-            _LOGGER.debug("Profile %s: Subscribed to area brightness sensor %s", self.name, area_brightness_sensor)
+        # Bereich: Helligkeitssensor, Zeitplan und Tages-Reset wertet der AreaController einmal für alle aus
+        self.area_controller = self._resolve_area_controller()
+        if self.area_controller:
+            self.area_controller.add_member(self)
         
         # Subscribe to cover state changes to detect manual changes
         self._unsubs.append(async_track_state_change_event(self.hass, [self.cover], self._on_cover_change))
@@ -155,17 +308,21 @@ class ProfileController:
         self._unsubs.append(async_track_sunset(self.hass, self._on_sun_event))
         self._unsubs.append(async_track_time_interval(self.hass, self._on_tick, timedelta(minutes=1)))
         
-        # Tägliches Reset um 3 Uhr (wie in der Original-Automation)
-        from homeassistant.helpers.event import async_track_time_change
-        self._unsubs.append(async_track_time_change(self.hass, self._on_daily_reset, hour=3, minute=0, second=0))
-        _LOGGER.debug("Profile %s: Scheduled daily reset at 03:00", self.name)
+        # Tägliches Reset um 3 Uhr (wie in der Original-Automation); mit Bereich übernimmt das der AreaController
+        if not self.area_controller:
+            from homeassistant.helpers.event import async_track_time_change
+            self._unsubs.append(async_track_time_change(self.hass, self._on_daily_reset, hour=3, minute=0, second=0))
+            _LOGGER.debug("Profile %s: Scheduled daily reset at 03:00", self.name)
 
         # First evaluation
         self._update_status("active", "initialization")
-        await self.evaluate_policy_and_apply()
+        if evaluate:
+            await self.async_evaluate("start")
         _LOGGER.info("Started profile '%s' for %s (cooldown=%ss)", self.name, self.cover, self.cooldown)
 
     async def async_stop(self):
+        self._cancel_evaluation()
+
         # cancel cooldown timer if any
         if self._cooldown_timer:
             try:
@@ -173,6 +330,7 @@ class ProfileController:
             except Exception:
                 pass
             self._cooldown_timer = None
+        self._cancel_schedule_timer()
 
         for u in self._unsubs:
             try:
@@ -181,10 +339,23 @@ class ProfileController:
                 pass
         self._unsubs.clear()
 
+        if self.area_controller:
+            self.area_controller.remove_member(self)
+            self.area_controller = None
+
+        solar = self._resolve_solar_model()
+        if solar:
+            solar.set_window(self._solar_key, None)
+
     # ---------- public actions ----------
-    async def open_cover(self):
+    async def open_cover(self, policy: bool = False, one_shot: bool = False):
         if not self._validate_cover_exists():
             return
+        if self._plan_move(100, policy, "open_cover", one_shot):
+            return
+        if not self._movement_allowed(100, policy, one_shot):
+            return
+        self._last_tilt = None
         await self._svc("cover.open_cover", fallback=("cover.set_cover_position", {"position": 100}))
 
     async def stop_cover(self):
@@ -192,6 +363,10 @@ class ProfileController:
             return
         await self._svc("cover.stop_cover", fallback=None)
 
+    def _vent_target(self) -> int:
+        """Lüftungsposition; bei offener Tür gilt der Aussperrschutz (nie unter door_safe)."""
+        return max(self.vpos, self.door_safe) if self._is_on(self.door) else self.vpos
+
     async def close_cover_respecting_rules(self):
         if not self._validate_cover_exists():
             return
@@ -202,148 +377,273 @@ class ProfileController:
         else:
             await self._svc("cover.close_cover", fallback=("cover.set_cover_position", {"position": int(self.night_pos)}))
 
-    async def evaluate_policy_and_apply(self):
+    # ---------- single-flight evaluation ----------
+    def request_evaluation(self, source: str, preempt: bool = False, force: bool = False) -> Optional[asyncio.Task]:
+        """Request an evaluation; at most one run per profile is in flight.
+
+        Requests arriving during a run collapse into ONE follow-up run that
+        reads the latest inputs. preempt=True cancels the running evaluation
+        first (safety triggers). While HA starts, requests are held by the
+        startup admission (None is returned) unless force=True.
+        """
+        self._eval_stats["requested"] += 1
+        if self._metrics:
+            self._metrics.inc("shutterpilot_events_total", self.name, self.area)
+        # Abhängige Regeln sofort markieren, damit zusammengefasste Anstöße sich addieren
+        if source.startswith("area_"):
+            self._rules.invalidate(INPUT_AREA)
+        elif source in _SOURCE_INPUTS:
+            self._rules.invalidate(*_SOURCE_INPUTS[source])
+        else:
+            self._rules.invalidate_all()
+        # Start-Backpressure (admission.py): Eingänge sind markiert, ausgewertet wird einmal nach dem Einschwingen
+        if not force and self._admission is not None and self._admission.hold(source):
+            return None
+        if self._eval_task is not None and not self._eval_task.done():
+            if preempt:
+                self._preempt_evaluation()
+            else:
+                self._eval_stats["concurrent"] += 1
+                if self._eval_pending is not None:
+                    self._eval_stats["collapsed"] += 1
+                self._eval_pending = source
+                return self._eval_task
+        self._eval_pending = None
+        self._eval_task = self.hass.async_create_task(self._async_evaluation_loop(source))
+        return self._eval_task
+
+    async def async_evaluate(self, source: str):
+        """Request an evaluation and wait until it (and any follow-up) finished."""
+        task = self.request_evaluation(source, force=True)
+        await asyncio.wait({task})
+
+    def _preempt_evaluation(self):
+        """Safety trigger: abort a running evaluation before moving the cover."""
+        if self._eval_task is not None and not self._eval_task.done():
+            self._eval_stats["preempted"] += 1
+        self._cancel_evaluation()
+
+    def _cancel_evaluation(self):
+        """Drop the running and the pending evaluation (e.g. before a safety move)."""
+        self._eval_pending = None
+        if self._eval_task is not None and not self._eval_task.done():
+            self._eval_task.cancel()
+        self._eval_task = None
+
+    @profiled
+    async def _async_evaluation_loop(self, source: str):
+        while True:
+            self._eval_stats["runs"] += 1
+            _LOGGER.debug("[%s] Evaluation (source=%s)", self.name, source)
+            started = time.perf_counter()
+            try:
+                await self.evaluate_policy_and_apply(source)
+            except asyncio.CancelledError:
+                _LOGGER.debug("[%s] Evaluation (source=%s) preempted", self.name, source)
+                raise
+            except Exception as ex:
+                _LOGGER.exception("[%s] Evaluation (source=%s) failed: %s", self.name, source, ex)
+            finally:
+                if self._metrics:
+                    self._metrics.inc("shutterpilot_evaluations_total", self.name, self.area)
+                    self._metrics.observe("shutterpilot_evaluation_seconds", time.perf_counter() - started,
+                                          self.name, self.area)
+            if self._eval_pending is None:
+                return
+            # Latest wins: ein Folgelauf für alle zwischenzeitlichen Anstöße
+            source, self._eval_pending = self._eval_pending, None
+
+    def get_evaluation_stats(self) -> dict[str, int]:
+        """Counters of the single-flight evaluator."""
+        return dict(self._eval_stats)
+
+    def get_hysteresis_state(self) -> dict:
+        """State and suppressed-transition counters of the lux/temperature triggers."""
+        return {"lux": self._lux_trigger.as_dict(), "temp": self._temp_trigger.as_dict()}
+
+    async def evaluate_policy_and_apply(self, source: str = "manual"):
         """Compute policy and apply considering door/window/cooldown."""
         if not self._auto_allowed():
             _LOGGER.debug("[%s] Auto disabled, skipping", self.name)
             self._update_status("inactive", "auto_disabled")
+            self._record_audit(source, None, "auto_disabled")
             return
         
         # Validate cover exists before doing anything
         if not self._validate_cover_exists():
             self._update_status("inactive", "cover_not_found")
+            self._record_audit(source, None, "cover_not_found")
             return
 
+        # Regeltabelle: nur Regeln mit geänderten Eingängen werden neu berechnet
+        outcome = self._rules.evaluate()
+        if outcome is None:
+            self._record_audit(source, None, None)
+            return
+        if outcome.reason is not None:
+            self._update_status(outcome.status, outcome.reason)
+        self._cmd = None
+        try:
+            if outcome.apply is not None:
+                await outcome.apply()
+        except asyncio.CancelledError:
+            self._record_audit(source, self._rules.last_rule, outcome.reason, RESULT_PREEMPTED)
+            raise
+        self._record_audit(source, self._rules.last_rule, outcome.reason or self._last_action_reason)
+
+    def _record_audit(self, source: str, rule: Optional[str], reason: Optional[str],
+                      result: Optional[str] = None):
+        """Append the decision (and the move it caused, if any) to the audit trail."""
+        target, sent = self._cmd or (None, RESULT_NONE)
+        self._cmd = None
+        self._audit.append(source, rule, reason, target, result or sent, *self._audit_inputs)
+
+    def get_audit(self, limit: Optional[int] = None) -> list[dict]:
+        """Recent decisions, newest first."""
+        return self._audit.records(limit)
+
+    # ---------- rule table (Priorität: kleiner = wichtiger) ----------
+    def _build_rules(self) -> RuleEngine:
+        return RuleEngine([
+            Rule("door", 10, frozenset({INPUT_DOOR, INPUT_LATCH}), self._rule_door),
+            Rule("window", 20, frozenset({INPUT_WINDOW, INPUT_LATCH}), self._rule_window),
+            Rule("cooldown", 30, frozenset({INPUT_WINDOW, INPUT_COOLDOWN, INPUT_CLOCK}), self._rule_cooldown),
+            Rule("schedule", 40, frozenset({INPUT_CLOCK, INPUT_AREA}), self._rule_schedule),
+            Rule("area_brightness", 50, frozenset({INPUT_AREA}), self._rule_area_brightness),
+            Rule("night", 60, frozenset({INPUT_SUN, INPUT_CLOCK}), self._rule_night),
+            Rule("shade", 70, frozenset({INPUT_SUN, INPUT_CLOCK, INPUT_LUX, INPUT_TEMP, INPUT_CONDITION}), self._rule_shade),
+            Rule("default_open", 80, frozenset(), self._rule_default_open),
+        ])
+
+    def _rule_door(self) -> Optional[Outcome]:
         # TÜR-AUSSPERRSCHUTZ: IMMER aktiv (unabhängig von window_not_close)
-        if self.door:
-            door_state_obj = self.hass.states.get(self.door)
-            if door_state_obj:
-                door_state = door_state_obj.state
-                if door_state == "open" or (door_state == STATE_ON):
-                    # Tür komplett offen → Aussperrschutz
-                    _LOGGER.debug("[%s] Door OPEN → door_safe (Aussperrschutz)", self.name)
-                    self._update_status("active", "door_open")
-                    await self._set_pos(self.door_safe)
-                    return
-                elif door_state == "tilted" and self._window_not_close:
-                    # Tür gekippt UND Fenster-Logik aktiv → Lüftungsposition
-                    _LOGGER.debug("[%s] Door TILTED + window_not_close=True → ventilation", self.name)
-                    self._update_status("active", "door_tilted")
-                    await self._set_pos(self.vpos)
-                    return
+        if not self.door:
+            return None
+        door_state_obj = self.hass.states.get(self.door)
+        if not door_state_obj:
+            return None
+        door_state = door_state_obj.state
+        if door_state == "open" or (door_state == STATE_ON):
+            # Tür komplett offen → Aussperrschutz
+            _LOGGER.debug("[%s] Door OPEN → door_safe (Aussperrschutz)", self.name)
+            return Outcome("door_open", lambda: self._set_pos(self.door_safe))
+        if door_state == "tilted" and self._window_not_close:
+            # Tür gekippt UND Fenster-Logik aktiv → Lüftungsposition
+            _LOGGER.debug("[%s] Door TILTED + window_not_close=True → ventilation", self.name)
+            return Outcome("door_tilted", lambda: self._set_pos(self.vpos))
+        return None
 
+    def _rule_window(self) -> Optional[Outcome]:
         # FENSTER-LOGIK: Nur aktiv wenn Rollladen unten/runtergefahren ist (window_not_close = True)
-        if self._is_on(self.window) and self._window_not_close:
+        if not self._is_on(self.window):
+            return None
+        if self._window_not_close:
             _LOGGER.debug("[%s] Window open + window_not_close=True → ventilation", self.name)
-            self._update_status("active", "window_open")
-            await self._set_pos(self.vpos)
-            return
-        elif self._is_on(self.window) and not self._window_not_close:
-            _LOGGER.debug("[%s] Window open but window_not_close=False (cover is up) → ignoring", self.name)
-            # Rollladen ist oben, Fenster-Öffnung wird ignoriert
-            pass
+            return Outcome("window_open", lambda: self._set_pos(self.vpos))
+        # Rollladen ist oben, Fenster-Öffnung wird ignoriert
+        _LOGGER.debug("[%s] Window open but window_not_close=False (cover is up) → ignoring", self.name)
+        return None
 
+    def _rule_cooldown(self) -> Optional[Outcome]:
         # cooldown after window close -> wait out
-        if self._cooldown_until and datetime.now() < self._cooldown_until:
-            left = (self._cooldown_until - datetime.now()).total_seconds()
+        if self._cooldown_until and dt_util.now() < self._cooldown_until:
+            left = (self._cooldown_until - dt_util.now()).total_seconds()
             _LOGGER.debug("[%s] Cooldown active (%.1fs left), skip", self.name, left)
-            self._update_status("cooldown", "cooldown_active")
-            return
+            return Outcome("cooldown_active", status="cooldown")
+        return None
 
+    def _rule_schedule(self) -> Optional[Outcome]:
         try:
-            now_str = datetime.now().strftime("%H:%M")
+            now = dt_util.now()
+            now_str = now.strftime("%H:%M")
         except Exception as ex:
             _LOGGER.warning("[%s] Error getting current time: %s", self.name, ex)
-            now_str = ""
+            now, now_str = None, ""
         
-        if self.down_time and now_str == self.down_time:
-            _LOGGER.debug("[%s] Time match down_time=%s → night_pos", self.name, self.down_time)
-            self._update_status("active", "time_schedule_down")
-            await self._set_pos(self.night_pos)
-            return
-        if self.up_time and now_str == self.up_time:
-            _LOGGER.debug("[%s] Time match up_time=%s → open", self.name, self.up_time)
-            self._update_status("active", "time_schedule_up")
-            await self.open_cover()
-            return
-        
-        # Helligkeits-basierte Steuerung (wenn Bereich im Brightness-Modus)
-        area_mode = self._area_config.get(A_MODE, MODE_TIME_ONLY)
-        if area_mode == MODE_BRIGHTNESS:
-            area_brightness_sensor = self._area_config.get(A_BRIGHTNESS_SENSOR)
-            brightness_down = _to_float(self._area_config.get(A_BRIGHTNESS_DOWN, 5000), 5000)
-            brightness_up = _to_float(self._area_config.get(A_BRIGHTNESS_UP, 15000), 15000)
-            
-            if area_brightness_sensor:
-                current_brightness = self._float_state(area_brightness_sensor, 0.0)
-                
-                # TRIGGER-SYSTEM (wie in Original-Automationen):
-                # - triggered_down = False → Darf runterfahren wenn Lux < down
-                # - triggered_up = False → Darf hochfahren wenn Lux > up
-                # - Nach Aktion → entsprechendes Flag auf True
-                # - Erlaubt manuelle Änderungen JEDERZEIT (Position bleibt)
-                # - Reset um 3 Uhr → beide Flags auf False
-                
-                if current_brightness < brightness_down and not self._triggered_down:
-                    # Dunkel UND noch nicht runter getriggert → Rollladen runterfahren
-                    # PRÜFE: Ist Fenster/Tür offen? → Nur Lüftungsposition!
-                    if self._is_on(self.window) or self._is_on(self.door):
-                        _LOGGER.info("[%s] 🌙 Brightness DOWN trigger + Window/Door OPEN → ventilation position", 
-                                      self.name)
-                        self._update_status("active", "brightness_low_with_window_open")
-                        await self._set_pos(self.vpos)
-                    else:
-                        _LOGGER.info("[%s] 🌙 Brightness DOWN trigger: lux=%.0f < %.0f → closing to night position", 
-                                      self.name, current_brightness, brightness_down)
-                        self._update_status("active", f"brightness_low_{int(current_brightness)}")
-                        await self._set_pos(self.night_pos)
-                    
-                    self._triggered_down = True  # RUNTER-TRIGGER SETZEN
-                    self._triggered_up = False   # HOCH-TRIGGER ZURÜCKSETZEN (kann jetzt wieder hoch)
-                    self._window_not_close = True  # FENSTER-LOGIK AKTIVIEREN!
-                    
-                    # Light automation: Turn on light when dark
-                    if self.light_on_night:
-                        await self._control_light(True, "brightness_low")
-                    return
-                elif current_brightness > brightness_up and not self._triggered_up:
-                    # Hell UND noch nicht hoch getriggert → Rollladen hochfahren
-                    _LOGGER.info("[%s] ☀️ Brightness UP trigger: lux=%.0f > %.0f → opening", 
-                                  self.name, current_brightness, brightness_up)
-                    self._update_status("active", f"brightness_high_{int(current_brightness)}")
-                    self._triggered_up = True    # HOCH-TRIGGER SETZEN
-                    self._triggered_down = False # RUNTER-TRIGGER ZURÜCKSETZEN (kann jetzt wieder runter)
-                    self._window_not_close = False  # FENSTER-LOGIK DEAKTIVIEREN!
-                    await self.open_cover()
-                    # Light automation: Turn off light when bright
-                    await self._control_light(False, "brightness_high")
-                    return
-                elif current_brightness >= brightness_down and current_brightness <= brightness_up:
-                    # In Hysterese-Bereich → aktuellen Zustand beibehalten
-                    _LOGGER.debug("[%s] 🔄 Brightness in range [%.0f - %.0f] → maintaining position", 
-                                  self.name, brightness_down, brightness_up)
-                    self._update_status("active", f"brightness_hold_{int(current_brightness)}")
-                    return
-                elif self._triggered_down and current_brightness < brightness_down:
-                    # Bereits runtergefahren → keine weitere Aktion
-                    _LOGGER.debug("[%s] 🔒 Already triggered DOWN - waiting for UP trigger or manual change", 
-                                  self.name)
-                    return
-                elif self._triggered_up and current_brightness > brightness_up:
-                    # Bereits hochgefahren → keine weitere Aktion
-                    _LOGGER.debug("[%s] 🔒 Already triggered UP - waiting for DOWN trigger or manual change", 
-                                  self.name)
-                    return
-                else:
-                    # Zwischen den Schwellwerten → aktuellen Zustand beibehalten
-                    _LOGGER.debug("[%s] Brightness mode: lux=%.0f in range [%.0f - %.0f] → maintaining current state", 
-                                  self.name, current_brightness, brightness_down, brightness_up)
-                    self._update_status("active", f"brightness_hold_{int(current_brightness)}")
-                    return
-            else:
-                _LOGGER.warning("[%s] Area mode is BRIGHTNESS but no brightness sensor configured!", self.name)
+        # Profil-Zeiten überschreiben den Zeitplan des Bereichs
+        area = self.area_controller
+        area_up, area_down = area.scheduled_times(now) if area else ("", "")
+        up_time = self.up_time or area_up
+        down_time = self.down_time or area_down
+        direction = None
+        if down_time and now_str == down_time:
+            direction = TRIGGER_DOWN
+        elif up_time and now_str == up_time:
+            direction = TRIGGER_UP
+        own_time = self.down_time if direction == TRIGGER_DOWN else self.up_time
+        if direction and not own_time and area.stagger_offset(self) > 0:
+            # Bereichs-Zeitplan: Mitglieder nacheinander fahren (stagger_delay), nicht alle zur vollen Minute
+            self._start_schedule_timer((now.date(), direction), area.stagger_offset(self))
+            direction = None
+        if direction is None and self._schedule_due:
+            # Fällige gestaffelte Fahrt: genau einmal anwenden, ein abgebrochener Lauf holt sie nach
+            due = self._schedule_due
+            return Outcome(f"time_schedule_{due}", lambda: self._apply_schedule(due, staggered=True), once=True)
+        if direction:
+            _LOGGER.debug("[%s] Time match %s_time=%s → %s", self.name, direction,
+                          down_time if direction == TRIGGER_DOWN else up_time, direction)
+            return Outcome(f"time_schedule_{direction}", lambda: self._apply_schedule(direction))
+        return None
 
-        # Solar/env policy
+    async def _apply_schedule(self, direction: str, staggered: bool = False):
+        if direction == TRIGGER_DOWN:
+            await self._set_pos(self.night_pos, policy=True, one_shot=True)
+        else:
+            await self.open_cover(policy=True, one_shot=True)
+        if staggered and self._schedule_due == direction:
+            self._schedule_due = None
+
+    def _start_schedule_timer(self, key: tuple, delay: float):
+        if key == self._schedule_key:
+            return  # läuft schon bzw. wurde heute schon ausgelöst
+        self._cancel_schedule_timer()
+        self._schedule_key = key
+
+        @callback
+        def _due(_now):
+            self._schedule_timer = None
+            self._schedule_due = key[1]
+            self.request_evaluation("schedule_stagger")
+
+        _LOGGER.debug("[%s] Area schedule %s: staggered by %.0fs", self.name, key[1], delay)
+        self._schedule_timer = async_call_later(self.hass, delay, _due)
+
+    def _cancel_schedule_timer(self):
+        if self._schedule_timer:
+            try:
+                self._schedule_timer()
+            except Exception:
+                pass
+            self._schedule_timer = None
+
+    def _rule_area_brightness(self) -> Optional[Outcome]:
+        # Helligkeits-basierte Steuerung: Entscheidung trifft der Bereich einmal für alle Profile
+        area = self.area_controller
+        if not area or area.mode != MODE_BRIGHTNESS:
+            return None
+        decision = area.decision or area.evaluate()
+        if not decision:
+            if area.brightness_sensor:
+                # Keine Daten (unavailable/unknown) → halten; None ließe Nacht/Beschattung/Standard fahren
+                _LOGGER.debug("[%s] Area brightness sensor has no data yet → holding", self.name)
+                return Outcome(None)
+            _LOGGER.warning("[%s] Area mode is BRIGHTNESS but no brightness sensor configured!", self.name)
+            return None
+        # Neuer Bereichs-Trigger → genau einmal anwenden, danach gilt die (manuelle) Position.
+        # Als angewendet gilt er erst nach _apply_area_trigger; ein abgebrochener Lauf holt ihn nach.
+        if decision.trigger and decision.seq != self._area_trigger_seq:
+            return Outcome(None, lambda: self._apply_area_trigger(decision), once=True)
+        if decision.in_range:
+            # In Hysterese-Bereich → aktuellen Zustand beibehalten
+            _LOGGER.debug("[%s] 🔄 Brightness in range [%.0f - %.0f] → maintaining position", 
+                          self.name, area.brightness_down, area.brightness_up)
+            return Outcome(f"brightness_hold_{int(decision.lux)}")
+        # Bereits getriggert → keine weitere Aktion
+        _LOGGER.debug("[%s] 🔒 Already triggered %s - waiting for next trigger or manual change", 
+                      self.name, (decision.trigger or "-").upper())
+        return Outcome(None)
+
+    def _sun_position(self) -> tuple[float, float]:
         sun_state = self.hass.states.get("sun.sun")
         try:
             elevation = float(sun_state.attributes.get("elevation", 0)) if sun_state else 0.0
@@ -352,46 +652,135 @@ class ProfileController:
             _LOGGER.warning("[%s] Error reading sun data: %s; using defaults", self.name, ex)
             elevation = 0.0
             azimuth = 0.0
+        return elevation, azimuth
 
-        lux = self._float_state(self.lux_sensor, 0.0)
-        temp = self._float_state(self.temp_sensor, 0.0)
+    def _rule_night(self) -> Optional[Outcome]:
+        elevation, _azimuth = self._sun_position()
+        if elevation >= 0:
+            return None
+        self._audit_inputs = (None, None, elevation)
+        _LOGGER.debug("[%s] Night (elev=%.1f) → night_pos", self.name, elevation)
 
-        in_az = (self.az_min <= azimuth <= self.az_max)
-        should_shade = (elevation > 10 and in_az) and (lux >= self.lux_th or temp >= self.temp_th)
-
-        if elevation < 0:  # night
-            _LOGGER.debug("[%s] Night (elev=%.1f) → night_pos", self.name, elevation)
-            self._update_status("active", "night_mode")
-            await self._set_pos(self.night_pos)
+        async def _apply():
+            await self._set_pos(self.night_pos, policy=True)
             # Light automation: Turn on light at night
             if self.light_on_night:
                 await self._control_light(True, "night_mode")
-        elif should_shade:
-            reason = "sun_shade"
-            if lux >= self.lux_th:
-                reason = f"sun_shade_lux_{int(lux)}"
-            elif temp >= self.temp_th:
-                reason = f"sun_shade_temp_{temp:.1f}"
-            _LOGGER.debug("[%s] Shade (elev=%.1f, az=%.1f, lux=%.0f, temp=%.1f) → day_pos", self.name, elevation, azimuth, lux, temp)
-            self._update_status("active", reason)
-            await self._set_pos(self.day_pos)
+
+        return Outcome("night_mode", _apply)
+
+    def _rule_shade(self) -> Optional[Outcome]:
+        # Solar/env policy
+        elevation, azimuth = self._sun_position()
+        lux = self._read_input(self.lux_input, self.lux_sensor)
+        temp = self._read_input(self.temp_input, self.temp_sensor)
+
+        # Schmitt-Trigger: an ab Schwellwert, aus erst unter Schwellwert - Hysterese, Mindest-Verweildauer.
+        # Kein gültiger Wert (unavailable/veraltet) → letzten Zustand halten statt 0 anzunehmen
+        now = dt_util.now()
+        lux_active = bool(self._lux_trigger.active) if lux is None else self._lux_trigger.update(lux, now)
+        temp_active = bool(self._temp_trigger.active) if temp is None else self._temp_trigger.update(temp, now)
+        lux_raw, temp_raw = lux, temp
+        self._audit_inputs = (lux_raw, temp_raw, elevation)
+        lux = lux or 0.0
+        temp = temp or 0.0
+
+        # Sonne auf dem Glas: mit Fenstergeometrie über die Einstrahlung, sonst Azimut-Bereich
+        self._last_exposure = self._solar_exposure(elevation, azimuth)
+        if self._last_exposure is not None:
+            sun_on_glass = self._last_exposure.irradiance >= self.irradiance_th
+        else:
+            in_az = (self.az_min <= azimuth <= self.az_max)
+            sun_on_glass = elevation > 10 and in_az
+        # Horizont: Nachbarhaus/Bäume verdecken die Sonne → kein direktes Licht
+        self._horizon_blocked = bool(sun_on_glass and self.horizon and not self.horizon.is_sunlit(azimuth, elevation))
+        if self._horizon_blocked:
+            _LOGGER.debug("[%s] Sun below horizon profile (az=%.1f, elev=%.1f < %.1f)",
+                          self.name, azimuth, elevation, self.horizon.min_elevation(azimuth))
+            sun_on_glass = False
+        if not (sun_on_glass and (lux_active or temp_active)):
+            return None
+        if self.shade_condition is not None:
+            # Eigene Bedingung (vorkompiliert, kein Template-Rendering)
+            self._condition_result = self.shade_condition.evaluate(
+                self.hass.states.get,
+                {"lux": lux_raw, "temp": temp_raw, "elevation": elevation, "azimuth": azimuth},
+            )
+            if not self._condition_result:
+                _LOGGER.debug("[%s] Shade condition '%s' is false → no shading", self.name, self.shade_condition.source)
+                return None
+
+        reason = "sun_shade"
+        if lux_active:
+            reason = f"sun_shade_lux_{int(lux)}"
+        elif temp_active:
+            reason = f"sun_shade_temp_{temp:.1f}"
+        _LOGGER.debug("[%s] Shade (elev=%.1f, az=%.1f, lux=%.0f, temp=%.1f) → day_pos", self.name, elevation, azimuth, lux, temp)
+
+        async def _apply():
+            await self._set_pos(self.day_pos, policy=True)
+            if self.slat_tracking:
+                await self._track_slats(elevation, azimuth)
             # Light automation: Turn on light when shading
             if self.light_on_shade:
                 await self._control_light(True, "shading")
-        else:
+
+        return Outcome(reason, _apply)
+
+    def _rule_default_open(self) -> Optional[Outcome]:
+        async def _apply():
             _LOGGER.debug("[%s] Default → open", self.name)
-            self._update_status("active", "default_open")
-            await self.open_cover()
+            await self.open_cover(policy=True)
             # Light automation: Turn off light when opening
             await self._control_light(False, "cover_open")
 
+        return Outcome("default_open", _apply)
+
+    def get_rule_state(self) -> dict:
+        """Rule table with cached outcomes and recompute/reuse counters."""
+        return self._rules.as_dict()
+
+    async def _apply_area_trigger(self, decision: AreaDecision):
+        """Apply a brightness trigger of the area with this profile's window/door/position rules.
+
+        The trigger counts as applied only once this completed; a preempted run retries it.
+        """
+        if decision.trigger == TRIGGER_DOWN:
+            # PRÜFE: Ist Fenster/Tür offen? → Nur Lüftungsposition (bei offener Tür nie unter door_safe)!
+            if self._is_on(self.window) or self._is_on(self.door):
+                _LOGGER.info("[%s] 🌙 Brightness DOWN trigger + Window/Door OPEN → ventilation position", 
+                              self.name)
+                self._update_status("active", "brightness_low_with_window_open")
+                await self._set_pos(self._vent_target())
+            else:
+                _LOGGER.info("[%s] 🌙 Brightness DOWN trigger: lux=%.0f → closing to night position", 
+                              self.name, decision.lux)
+                self._update_status("active", f"brightness_low_{int(decision.lux)}")
+                await self._set_pos(self.night_pos, policy=True, one_shot=True)
+            self._set_window_not_close(True)  # FENSTER-LOGIK AKTIVIEREN!
+            # Light automation: Turn on light when dark
+            if self.light_on_night:
+                await self._control_light(True, "brightness_low")
+        else:
+            _LOGGER.info("[%s] ☀️ Brightness UP trigger: lux=%.0f → opening", self.name, decision.lux)
+            self._update_status("active", f"brightness_high_{int(decision.lux)}")
+            self._set_window_not_close(False)  # FENSTER-LOGIK DEAKTIVIEREN!
+            await self.open_cover(policy=True, one_shot=True)
+            # Light automation: Turn off light when bright
+            await self._control_light(False, "brightness_high")
+        self._area_trigger_seq = decision.seq
+
     # ---------- internal listeners ----------
+    @profiled
     async def _on_window_change(self, event):
+        self._rules.invalidate(INPUT_WINDOW, INPUT_COOLDOWN)
         if not self._auto_allowed():
             return
 
         to_state = event.data.get("new_state")
-        if to_state and to_state.state == STATE_ON:
+        if not has_data(to_state):
+            return  # unavailable/unknown = keine Daten: letzten Fensterzustand halten
+        if to_state.state == STATE_ON:
             # window opened
             # NUR reagieren wenn window_not_close = True (Rollladen ist unten)!
             if self._window_not_close:
@@ -403,18 +792,24 @@ class ProfileController:
                         pass
                     self._cooldown_timer = None
                 self._cooldown_until = None
+                self._preempt_evaluation()  # laufende Auswertung darf die Lüftungsposition nicht überschreiben
                 _LOGGER.info("[%s] 🪟 Window opened + window_not_close=True → ventilation pos=%s%%", 
                             self.name, self.vpos)
                 self._update_status("active", "window_opened")
-                await self._set_pos(self.vpos)
+                self._cmd = None
+                await self._set_pos(self._vent_target())
+                self._record_audit("window_opened", "window", "window_opened")
             else:
                 _LOGGER.info("[%s] 🪟 Window opened but window_not_close=False → ignoring (cover is up)", 
                             self.name)
                 # Rollladen ist oben, Fenster wird ignoriert
+        elif not has_data(event.data.get("old_state")):
+            # Sensor kommt (wieder) online und meldet zu: kein Schließen beobachtet → kein Cooldown
+            self.request_evaluation("window_closed")
         else:
             # window closed → plan cooldown
             cd = max(0, int(self.cooldown))
-            self._cooldown_until = datetime.now() + timedelta(seconds=cd)
+            self._cooldown_until = dt_util.now() + timedelta(seconds=cd)
             _LOGGER.debug("[%s] Window closed → start cooldown %ss (until %s)", self.name, cd, self._cooldown_until)
             self._update_status("cooldown", "window_closed_cooldown")
 
@@ -429,14 +824,15 @@ class ProfileController:
             if cd <= 1:
                 # fast path: evaluate immediately
                 self._cooldown_until = None
-                self.hass.async_create_task(self.evaluate_policy_and_apply())
+                self.request_evaluation("window_closed")
             else:
                 # schedule evaluation right after cooldown
+                @callback
                 def _after(_now):
                     self._cooldown_timer = None
                     self._cooldown_until = None
                     self._update_status("active", "cooldown_expired")
-                    self.hass.async_create_task(self.evaluate_policy_and_apply())
+                    self.request_evaluation("cooldown_expired")
 
                 self._cooldown_timer = async_call_later(self.hass, cd, _after)
                 
@@ -448,7 +844,7 @@ class ProfileController:
                     while elapsed < cd and self._cooldown_until:
                         await asyncio.sleep(update_interval)
                         elapsed += update_interval
-                        if self._cooldown_until and datetime.now() < self._cooldown_until:
+                        if self._cooldown_until and dt_util.now() < self._cooldown_until:
                             # Trigger sensor update without changing reason
                             for callback in self._sensor_update_callbacks:
                                 try:
@@ -464,12 +860,14 @@ class ProfileController:
                 except Exception as ex:
                     _LOGGER.debug("[%s] Could not start cooldown ticker: %s", self.name, ex)
 
+    @profiled
     async def _on_door_change(self, event):
+        self._rules.invalidate(INPUT_DOOR)
         if not self._auto_allowed():
             return
         to_state = event.data.get("new_state")
-        if not to_state:
-            return
+        if not has_data(to_state):
+            return  # unavailable/unknown = keine Daten, nicht "Tür zu"
         
         door_state = to_state.state
         
@@ -481,26 +879,53 @@ class ProfileController:
         if door_state == "open" or (door_state == STATE_ON and not hasattr(to_state, 'attributes')):
             # Tür komplett offen → AUSSPERRSCHUTZ (IMMER aktiv!)
             _LOGGER.info("[%s] 🚪 Door OPEN → Aussperrschutz (door_safe=%d%%)", self.name, self.door_safe)
+            self._preempt_evaluation()  # Sicherheit geht vor: laufende Auswertung abbrechen
             self._update_status("active", "door_open_lockout")
+            self._cmd = None
             await self._set_pos(self.door_safe)
+            self._record_audit("door_open", "door", "door_open_lockout")
         elif door_state == "tilted":
             # Tür gekippt → Wie Fenster-Lüftung (NUR wenn window_not_close = True)
             if self._window_not_close:
                 _LOGGER.info("[%s] 🚪 Door TILTED + window_not_close=True → ventilation pos=%d%%", 
                             self.name, self.vpos)
                 self._update_status("active", "door_tilted")
+                self._cmd = None
                 await self._set_pos(self.vpos)
+                self._record_audit("door_tilted", "door", "door_tilted")
             else:
                 _LOGGER.info("[%s] 🚪 Door TILTED but window_not_close=False → ignoring (cover is up)", 
                             self.name)
         else:  # "closed" or STATE_OFF
             # Tür geschlossen → Re-evaluate
             _LOGGER.debug("[%s] Door closed → re-evaluate", self.name)
-            await self.evaluate_policy_and_apply()
+            self.request_evaluation("door_closed")
+
+    @profiled
+    async def _on_lux_change(self, event):
+        if has_data(event.data.get("new_state")):
+            self.request_evaluation("lux_change")
+
+    @profiled
+    async def _on_temp_change(self, event):
+        if has_data(event.data.get("new_state")):
+            self.request_evaluation("temp_change")
+
+    @profiled
+    async def _on_condition_change(self, event):
+        self.request_evaluation("condition_change")
 
-    async def _on_env_change(self, event):
-        await self.evaluate_policy_and_apply()
+    @callback
+    @profiled
+    def _on_fused_lux_change(self):
+        self.request_evaluation("lux_change")
+
+    @callback
+    @profiled
+    def _on_fused_temp_change(self):
+        self.request_evaluation("temp_change")
     
+    @profiled
     async def _on_cover_change(self, event):
         """Detect manual cover changes - Position wird beibehalten, System wartet auf nächsten Trigger."""
         if not self._auto_allowed():
@@ -543,49 +968,118 @@ class ProfileController:
         except (ValueError, TypeError, AttributeError) as ex:
             _LOGGER.debug("[%s] Error processing cover change: %s", self.name, ex)
 
+    @profiled
     async def _on_sun_event(self, *args):
-        await self.evaluate_policy_and_apply()
+        self.request_evaluation("sun_event")
 
+    @profiled
     async def _on_tick(self, now):
-        await self.evaluate_policy_and_apply()
+        self.request_evaluation("tick")
     
+    @profiled
     async def _on_daily_reset(self, now):
         """Tägliches Reset um 3 Uhr - Alle Trigger zurücksetzen (wie Reset Rolladen Trigger Automation)."""
         _LOGGER.info("[%s] 🌅 Daily reset at 03:00 - Resetting all trigger flags", self.name)
-        self._triggered_up = False
-        self._triggered_down = False
-        self._window_not_close = False  # Auch window_not_close zurücksetzen
-        self._update_status("active", "daily_reset")
+        self.reset_daily_state()
         # Nach Reset: Sofort neu evaluieren (kann jetzt wieder fahren)
-        await self.evaluate_policy_and_apply()
+        self.request_evaluation("daily_reset")
+
+    def reset_daily_state(self):
+        """Reset per-window flags (trigger flags are reset by the area)."""
+        self._set_window_not_close(False)  # Auch window_not_close zurücksetzen
+        self._schedule_due = None  # nicht angewendete Zeitplan-Fahrt vom Vortag verfällt
+        self._update_status("active", "daily_reset")
 
     # ---------- helpers ----------
+    def _set_window_not_close(self, value: bool):
+        if value != self._window_not_close:
+            self._window_not_close = value
+            self._rules.invalidate(INPUT_LATCH)
+
     def _is_on(self, entity_id: Optional[str]) -> bool:
         if not entity_id:
             return False
         st = self.hass.states.get(entity_id)
         return bool(st and st.state == STATE_ON)
 
+    def _read_input(self, fused_key: Optional[str], entity_id: Optional[str]) -> Optional[float]:
+        """Lux/temperature input: fused input if configured, else the single sensor (None = no valid value)."""
+        if fused_key:
+            store = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id) or {}
+            fused = store.get(FUSED_INPUTS, {}).get(fused_key)
+            return fused.value if fused else None
+        return self._float_state(entity_id, None)
+
     def _float_state(self, entity_id: Optional[str], default: float) -> float:
         if not entity_id:
             return default
         st = self.hass.states.get(entity_id)
+        if not has_data(st):
+            return default  # unavailable/unknown = keine Daten
         try:
             return float(st.state)
-        except Exception:
+        except (TypeError, ValueError):
             return default
 
     def _auto_allowed(self) -> bool:
         opt = self.entry.options
         return bool(opt.get(CONF_GLOBAL_AUTO, True) and self.enabled)
     
-    def _get_area_config(self) -> dict:
-        """Lade die Bereichs-Konfiguration für dieses Profil."""
+    def _resolve_area_controller(self) -> Optional[AreaController]:
         if self.area == "none" or not self.area:
-            return {}
-        areas = self.entry.options.get(CONF_AREAS, {})
-        return areas.get(self.area, {})
-    
+            return None
+        store = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id) or {}
+        return store.get(RUNTIME_AREAS, {}).get(self.area)
+
+    @property
+    def _solar_key(self) -> str:
+        return self.profile_id or self.name
+
+    def _resolve_solar_model(self) -> Optional[SolarModel]:
+        store = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id) or {}
+        return store.get(SOLAR_MODEL)
+
+    def _solar_exposure(self, elevation: float, azimuth: float) -> Optional[Exposure]:
+        """Exposure of this window (None without façade geometry)."""
+        if self.geometry is None:
+            return None
+        solar = self._resolve_solar_model()
+        if solar is None:
+            return None
+        return solar.exposure(self._solar_key, elevation, azimuth)
+
+    def get_solar_state(self) -> Optional[dict]:
+        """Last computed incidence/sunlit fraction/irradiance (diagnostics)."""
+        exp = self._last_exposure
+        state: dict = {}
+        if self.geometry is not None and exp is not None:
+            state.update({
+                "incidence_angle": round(exp.incidence_angle, 1),
+                "sunlit_fraction": round(exp.sunlit_fraction, 2),
+                "irradiance": round(exp.irradiance),
+                "threshold": self.irradiance_th,
+            })
+        if self.horizon is not None:
+            state.update({"horizon": self.horizon.spec, "horizon_blocked": self._horizon_blocked})
+        if self.slat_tracking:
+            state.update({"tilt": self._last_tilt, "tilt_step": self.tilt_step})
+        return state or None
+
+    def get_condition_state(self) -> Optional[dict]:
+        """Shade condition with its dependencies and last result (diagnostics)."""
+        if self.shade_condition is None:
+            return None
+        return {
+            "expression": self.shade_condition.source,
+            "entities": sorted(self.shade_condition.entities),
+            "inputs": sorted(self.shade_condition.inputs),
+            "result": self._condition_result,
+        }
+
+    def _resolve_light_actuator(self) -> Optional[LightActuator]:
+        store = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id) or {}
+        return store.get(LIGHT_ACTUATOR)
+
     def _validate_cover_exists(self) -> bool:
         """Validate cover entity exists at runtime. Returns True if OK."""
         if not self.cover:
@@ -594,10 +1088,10 @@ class ProfileController:
         if not cover_state:
             # Only log once per minute to avoid spam
             if not hasattr(self, '_last_cover_warning'):
-                self._last_cover_warning = datetime.now()
+                self._last_cover_warning = dt_util.now()
                 _LOGGER.warning("[%s] Cover entity %s not found (will retry)", self.name, self.cover)
-            elif (datetime.now() - self._last_cover_warning).total_seconds() > 60:
-                self._last_cover_warning = datetime.now()
+            elif (dt_util.now() - self._last_cover_warning).total_seconds() > 60:
+                self._last_cover_warning = dt_util.now()
                 _LOGGER.warning("[%s] Cover entity %s still not found", self.name, self.cover)
             return False
         return True
@@ -610,13 +1104,16 @@ class ProfileController:
         
         # Set flag to indicate system is moving cover (prevents manual change detection)
         self._system_is_moving_cover = True
+        started = time.perf_counter()
         
+        sent = False
         try:
             domain, srv = service.split(".")
             if self.hass.services.has_service(domain, srv):
                 payload = dict(data or {})
                 payload["entity_id"] = self.cover
                 await self.hass.services.async_call(domain, srv, payload, blocking=False)
+                sent = True
             elif fallback:
                 # Try fallback if primary service not available
                 f_domain, f_srv = fallback[0].split(".")
@@ -624,6 +1121,7 @@ class ProfileController:
                 f_data["entity_id"] = self.cover
                 if self.hass.services.has_service(f_domain, f_srv):
                     await self.hass.services.async_call(f_domain, f_srv, f_data, blocking=False)
+                    sent = True
                 else:
                     _LOGGER.warning("[%s] Neither %s nor fallback %s available for %s", 
                                   self.name, service, fallback[0], self.cover)
@@ -634,33 +1132,178 @@ class ProfileController:
             _LOGGER.exception("[%s] Error calling service %s for %s: %s", 
                            self.name, service, self.cover, ex)
         finally:
-            # Reset flag after a short delay (cover needs time to start moving)
-            async def _reset_flag():
-                await asyncio.sleep(2)  # 2 seconds should be enough for cover to start
-                self._system_is_moving_cover = False
-                _LOGGER.debug("[%s] System movement flag reset", self.name)
-            
-            self.hass.async_create_task(_reset_flag())
+            if sent:
+                self.command_sent(time.perf_counter() - started)
+            self._schedule_moving_flag_reset()
+
+    def command_sent(self, seconds: Optional[float] = None):
+        """Count a cover service call that actually went out (metrics)."""
+        if self._metrics:
+            self._metrics.inc("shutterpilot_commands_total", self.name, self.area)
+            if seconds is not None:
+                self._metrics.observe("shutterpilot_command_seconds", seconds, self.name, self.area)
 
-    async def _set_pos(self, pos: int):
+    def _schedule_moving_flag_reset(self):
+        """Reset the system-move flag after a short delay (cover needs time to start moving)."""
+        async def _reset_flag():
+            await asyncio.sleep(2)  # 2 seconds should be enough for cover to start
+            self._system_is_moving_cover = False
+            _LOGGER.debug("[%s] System movement flag reset", self.name)
+
+        self.hass.async_create_task(_reset_flag())
+
+    async def _set_pos(self, pos: int, policy: bool = False, one_shot: bool = False):
         pos = max(0, min(100, int(pos)))
+        if self._plan_move(pos, policy, "set_cover_position", one_shot):
+            return
+        if not self._movement_allowed(pos, policy, one_shot):
+            return
+        self._last_tilt = None  # Fahrt verstellt die Lamellen
         await self._svc("cover.set_cover_position", {"position": pos})
+
+    async def _track_slats(self, elevation: float, azimuth: float):
+        """Set the slats to the quantized cut-off angle; only sent when the step changes."""
+        facade = self.geometry.azimuth if self.geometry else None
+        target = quantize(cutoff_tilt(elevation, azimuth, facade, self.slat_ratio), self.tilt_step)
+        if target == self._last_tilt:
+            return
+        if self._reconciler is not None and self._reconciler.will_move(self):
+            # Fahrt des Start-Abgleichs verstellt die Lamellen → erst danach nachführen
+            return
+        _LOGGER.debug("[%s] Slat tracking: tilt %s → %d%% (elev=%.1f, az=%.1f)",
+                      self.name, self._last_tilt, target, elevation, azimuth)
+        self._last_tilt = target
+        await self._svc("cover.set_cover_tilt_position", {"tilt_position": target})
     
+    def current_position(self) -> Optional[int]:
+        state = self.hass.states.get(self.cover) if self.cover else None
+        return _to_int(state.attributes.get("current_position"), None) if state else None
+
+    def _movement_allowed(self, target: int, policy: bool, one_shot: bool = False) -> bool:
+        reason = self._check_budget(self.current_position(), target, policy, one_shot)
+        self._cmd = (target, reason or RESULT_SENT)
+        return reason is None
+
+    def _check_budget(self, current: Optional[int], target: int, policy: bool,
+                      one_shot: bool = False) -> Optional[str]:
+        """Movement budget: only automatic (policy) moves can be rejected; all moves are counted.
+
+        One-shot moves (schedule, area trigger) are only checked for no-op/minimum delta.
+        """
+        now = dt_util.now()
+        if policy:
+            reason = self._budget.check(current, target, now, one_shot)
+            if reason:
+                _LOGGER.debug("[%s] Move %s → %s%% rejected by movement budget (%s)",
+                              self.name, current, target, reason)
+                return reason
+        self._budget.record(current, target, now, exempt=not policy)
+        return None
+
+    # ---------- startup reconciliation (reconcile.py) ----------
+    def set_admission(self, admission: Optional[StartupAdmission]):
+        self._admission = admission
+
+    def set_reconciler(self, reconciler: Optional[Reconciler]):
+        self._reconciler = reconciler
+
+    def _plan_move(self, target: int, policy: bool, service: str, one_shot: bool = False) -> bool:
+        """Count the move decision; during the reconciliation only plan it (True = planned, not sent)."""
+        self._move_seq += 1
+        if self._reconciler is None:
+            return False
+        self._reconciler.plan(self, target, policy, service, self._move_seq, one_shot)
+        self._cmd = (target, RESULT_PLANNED)
+        return True
+
+    def accept_reconciled_move(self, seq: int, target: int, policy: bool, current: Optional[int],
+                               one_shot: bool = False) -> Optional[str]:
+        """The reconciliation is about to send the planned move in a grouped call.
+
+        Returns None if it may be sent (counted like an own move), else why not.
+        """
+        if seq != self._move_seq or (self._eval_task is not None and not self._eval_task.done()):
+            return SUPERSEDED
+        reason = self._check_budget(current, target, policy, one_shot)
+        if reason:
+            return reason
+        self._last_tilt = None
+        self._system_is_moving_cover = True
+        self._schedule_moving_flag_reset()
+        return None  # gezählt wird erst der gesendete Sammel-Call (command_sent)
+
+    def get_movement_stats(self) -> dict:
+        """Moves and budget rejections of this cover."""
+        return self._budget.get_stats()
+
+    def get_movement_summary(self) -> dict:
+        """Compact movement counters for the status sensor (no-op moves not counted)."""
+        stats = self._budget.get_stats()
+        return {
+            "moves_last_hour": stats["moves_last_hour"],
+            "moves_rejected": stats[REJECT_DELTA] + stats[REJECT_REVERSE] + stats[REJECT_RATE],
+        }
+
     # ---------- Status tracking helpers ----------
     def _update_status(self, status: str, reason: str):
         """Update status and trigger sensor callbacks."""
         self._status = status
         self._last_action_reason = reason
-        # Trigger all sensor update callbacks
+        self._notify_sensors()
+
+    def _notify_sensors(self):
+        """Trigger all sensor update callbacks and the websocket delta."""
+        started = time.perf_counter()
         for callback in self._sensor_update_callbacks:
             try:
                 callback()
             except Exception as ex:
                 _LOGGER.warning("[%s] Error in sensor update callback: %s", self.name, ex)
+        self._publish_status()
+        if self._metrics:
+            self._metrics.observe("shutterpilot_publish_seconds", time.perf_counter() - started, self.name, self.area)
+
+    def _publish_status(self):
+        """Send a status delta to websocket subscribers (only if something changed)."""
+        current = self.get_status_dict()
+        if current == self._published_status:
+            return
+        self._published_status = current
+        async_dispatcher_send(self.hass, SIGNAL_STATUS_UPDATED.format(self.entry.entry_id), self.name, current)
+
+    def get_status_dict(self) -> dict:
+        """Compact runtime status (for websocket subscribers)."""
+        return {
+            "status": self._status,
+            "reason": self._last_action_reason,
+            "enabled": self.enabled,
+            "cooldown_until": self._cooldown_until.isoformat() if self._cooldown_until else None,
+        }
     
-    def register_sensor_callback(self, callback: CALLBACK_TYPE):
+    def set_enabled(self, value: bool):
+        """Enable/disable this profile at runtime."""
+        self.enabled = bool(value)
+        self._notify_sensors()
+
+    def wants_own_entities(self) -> bool:
+        """Per-profile entities: always in normal mode, in compact mode only if flagged."""
+        if not self.entry.options.get(CONF_COMPACT_ENTITIES, False):
+            return True
+        return self.expose_entities
+
+    def add_update_listener(self, callback: CALLBACK_TYPE):
         """Register a callback to be called when status updates."""
         self._sensor_update_callbacks.append(callback)
+
+    def remove_update_listener(self, callback: CALLBACK_TYPE):
+        """Unregister a status callback (no-op if it is not registered)."""
+        if callback in self._sensor_update_callbacks:
+            self._sensor_update_callbacks.remove(callback)
+
+    @property
+    def cooldown_until(self) -> Optional[datetime]:
+        """End of the running cooldown after a window was closed, else None."""
+        return self._cooldown_until
     
     def get_status(self) -> str:
         """Get current status."""
@@ -672,8 +1315,8 @@ class ProfileController:
     
     def get_cooldown_remaining(self) -> float:
         """Get remaining cooldown time in seconds."""
-        if self._cooldown_until and datetime.now() < self._cooldown_until:
-            return (self._cooldown_until - datetime.now()).total_seconds()
+        if self._cooldown_until and dt_util.now() < self._cooldown_until:
+            return (self._cooldown_until - dt_util.now()).total_seconds()
         return 0.0
     
     def get_sun_data(self) -> tuple[float, float]:
@@ -687,40 +1330,15 @@ class ProfileController:
             return (0.0, 0.0)
     
     async def _control_light(self, turn_on: bool, reason: str):
-        """Control light based on cover action."""
+        """Control light based on cover action (deduplicated/batched by the LightActuator)."""
         if not self.light_entity:
             return  # No light configured
-        
-        light_state = self.hass.states.get(self.light_entity)
-        if not light_state:
+
+        if not self.hass.states.get(self.light_entity):
             _LOGGER.debug("[%s] Light entity %s not found", self.name, self.light_entity)
             return
-        
-        try:
-            if turn_on:
-                # Turn on light with brightness
-                brightness = int((self.light_brightness / 100) * 255)  # Convert 0-100% to 0-255
-                await self.hass.services.async_call(
-                    "light",
-                    "turn_on",
-                    {
-                        "entity_id": self.light_entity,
-                        "brightness": brightness,
-                    },
-                    blocking=False,
-                )
-                _LOGGER.info("[%s] Light %s turned ON (brightness=%d%%) - Reason: %s", 
-                           self.name, self.light_entity, self.light_brightness, reason)
-            else:
-                # Turn off light
-                await self.hass.services.async_call(
-                    "light",
-                    "turn_off",
-                    {"entity_id": self.light_entity},
-                    blocking=False,
-                )
-                _LOGGER.info("[%s] Light %s turned OFF - Reason: %s", 
-                           self.name, self.light_entity, reason)
-        except Exception as ex:
-            _LOGGER.warning("[%s] Error controlling light %s: %s", 
-                          self.name, self.light_entity, ex)
+
+        actuator = self._resolve_light_actuator()
+        if actuator is None:
+            return
+        actuator.request(self.light_entity, turn_on, self.light_brightness, f"{self.name}: {reason}")
@@ -0,0 +1,151 @@
+"""Simulated covers (only with simulation enabled, see simulation.py)."""
+from __future__ import annotations
+import logging
+from typing import Optional
+
+from homeassistant.components.cover import (
+    ATTR_POSITION, CoverDeviceClass, CoverEntity, CoverEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, SIMULATION
+from .simulation import SimulationController
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Set up simulated covers."""
+    store = hass.data.get(DOMAIN, {}).get(entry.entry_id) or {}
+    sim: Optional[SimulationController] = store.get(SIMULATION)
+    if sim is None:
+        return
+    async_add_entities([SimulatedCover(sim, i) for i in range(sim.cover_count)])
+    _LOGGER.info("Simulation: created %d cover(s)", sim.cover_count)
+
+
+class SimulatedCover(CoverEntity):
+    """Virtual shutter with travel time, periodic position reports, dropped commands and jitter."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_device_class = CoverDeviceClass.SHUTTER
+    _attr_supported_features = (
+        CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE
+        | CoverEntityFeature.SET_POSITION | CoverEntityFeature.STOP
+    )
+
+    def __init__(self, sim: SimulationController, index: int):
+        self._sim = sim
+        self.index = index
+        self._attr_name = f"Cover {index}"
+        self._attr_unique_id = sim.unique_id("cover", index)
+        self._attr_device_info = sim.device_info
+        self._rng = sim.rng("cover", index)
+        # Jeder Motor ist etwas anders schnell
+        self._speed = 100 / (sim.travel_time * self._rng.uniform(0.9, 1.1))  # % pro Sekunde
+        self._position = 100.0
+        self._target: Optional[float] = None
+        self._last_update = 0.0
+        self._commanded_at = 0.0
+        self._unsub_start: Optional[CALLBACK_TYPE] = None
+        self._unsub_report: Optional[CALLBACK_TYPE] = None
+
+    @property
+    def current_cover_position(self) -> int:
+        return round(self._position)
+
+    @property
+    def is_closed(self) -> bool:
+        return self._position <= 0
+
+    @property
+    def is_opening(self) -> bool:
+        return self._target is not None and self._target > self._position
+
+    @property
+    def is_closing(self) -> bool:
+        return self._target is not None and self._target < self._position
+
+    async def async_added_to_hass(self) -> None:
+        self._sim.register("cover", self.index, self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._sim.unregister("cover", self.index)
+        for unsub in (self._unsub_start, self._unsub_report):
+            if unsub:
+                unsub()
+        self._unsub_start = self._unsub_report = None
+
+    async def async_open_cover(self, **kwargs) -> None:
+        self._command(100)
+
+    async def async_close_cover(self, **kwargs) -> None:
+        self._command(0)
+
+    async def async_set_cover_position(self, **kwargs) -> None:
+        self._command(kwargs[ATTR_POSITION])
+
+    async def async_stop_cover(self, **kwargs) -> None:
+        self._command(None)
+
+    @callback
+    def _command(self, target: Optional[float]) -> None:
+        """Command arrives at the motor: maybe lost, otherwise starts after a random delay."""
+        delay = self._sim.command_received(self.index, self._rng)
+        if delay is None:
+            _LOGGER.debug("Simulation: %s dropped command %s", self.entity_id, target)
+            return
+        received = self.hass.loop.time()
+
+        @callback
+        def _start(_now) -> None:
+            self._unsub_start = None
+            self._start(target, received)
+
+        if self._unsub_start:
+            self._unsub_start()
+        self._unsub_start = async_call_later(self.hass, delay, _start)
+
+    @callback
+    def _start(self, target: Optional[float], received: float) -> None:
+        self._advance()
+        if self._unsub_report:
+            self._unsub_report()
+            self._unsub_report = None
+        if target is None:  # Stopp
+            self._target = None
+            self.async_write_ha_state()
+            return
+        self._target = float(target)
+        self._commanded_at = received
+        self._last_update = self.hass.loop.time()
+        self._report(None)
+
+    def _advance(self) -> None:
+        """Move the position according to the time since the last update."""
+        if self._target is None:
+            return
+        now = self.hass.loop.time()
+        step = self._speed * (now - self._last_update)
+        self._last_update = now
+        if abs(self._target - self._position) <= step + 1e-6:
+            self._position = self._target
+        else:
+            self._position += step if self._target > self._position else -step
+
+    @callback
+    def _report(self, _now) -> None:
+        """Periodic position report while moving."""
+        self._unsub_report = None
+        self._advance()
+        if self._target is not None and self._position == self._target:
+            self._target = None
+            self._sim.move_settled(self.hass.loop.time() - self._commanded_at)
+        if self._target is not None:
+            remaining = abs(self._target - self._position) / self._speed
+            self._unsub_report = async_call_later(
+                self.hass, min(self._sim.report_interval, remaining), self._report
+            )
+        self.async_write_ha_state()
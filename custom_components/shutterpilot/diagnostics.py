@@ -4,7 +4,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 
-from .const import DOMAIN, RUNTIME_PROFILES, CONF_PROFILES, CONF_GLOBAL_AUTO
+from .const import DOMAIN, RUNTIME_PROFILES, RUNTIME_AREAS, LIGHT_ACTUATOR, SOLAR_MODEL, FUSED_INPUTS, METRICS, SIMULATION, RECONCILER, ADMISSION, CONF_PROFILES, CONF_GLOBAL_AUTO, CONF_COMPACT_ENTITIES
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
@@ -27,6 +27,7 @@ async def async_get_config_entry_diagnostics(
         "global_auto": options.get(CONF_GLOBAL_AUTO, True),
         "default_ventilation_position": options.get("default_ventilation_position", 30),
         "default_cooldown": options.get("default_cooldown", 120),
+        "compact_entities": options.get(CONF_COMPACT_ENTITIES, False),
     }
     
     # Profiles Configuration
@@ -96,10 +97,43 @@ async def async_get_config_entry_diagnostics(
                 "lux_state": lux_state,
                 "temp_state": temp_state,
                 "sun_data": sun_data,
-                "cooldown_active": ctrl._cooldown_until is not None,
-                "cooldown_until": ctrl._cooldown_until.isoformat() if ctrl._cooldown_until else None,
+                "cooldown_active": ctrl.cooldown_until is not None,
+                "cooldown_until": ctrl.cooldown_until.isoformat() if ctrl.cooldown_until else None,
+                "evaluation": ctrl.get_evaluation_stats(),
+                "hysteresis": ctrl.get_hysteresis_state(),
+                "movement": ctrl.get_movement_stats(),
+                "solar": ctrl.get_solar_state(),
+                "rules": ctrl.get_rule_state(),
+                "shade_condition": ctrl.get_condition_state(),
+                "audit": ctrl.get_audit(),
             }
             
             data["runtime"]["profile_status"].append(profile_status)
+
+        data["runtime"]["areas"] = {
+            area_id: {
+                "mode": area.mode,
+                "members": [c.name for c in area.members],
+                "trigger": area.decision.trigger if area.decision else None,
+                "trigger_seq": area.decision.seq if area.decision else None,
+                "lux": area.decision.lux if area.decision else None,
+            }
+            for area_id, area in store.get(RUNTIME_AREAS, {}).items()
+        }
+        if store.get(LIGHT_ACTUATOR):
+            data["runtime"]["light_actuator"] = store[LIGHT_ACTUATOR].get_stats()
+        data["runtime"]["fused_inputs"] = {
+            key: fused.as_dict() for key, fused in store.get(FUSED_INPUTS, {}).items()
+        }
+        if store.get(SOLAR_MODEL):
+            data["runtime"]["solar_model"] = store[SOLAR_MODEL].get_stats()
+        if store.get(METRICS):
+            data["runtime"]["metrics"] = store[METRICS].summary()
+        if store.get(SIMULATION):
+            data["runtime"]["simulation"] = store[SIMULATION].get_stats()
+        if store.get(RECONCILER):
+            data["runtime"]["reconciliation"] = store[RECONCILER].get_stats()
+        if store.get(ADMISSION):
+            data["runtime"]["startup_admission"] = store[ADMISSION].get_stats()
     
     return data
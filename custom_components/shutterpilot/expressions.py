@@ -0,0 +1,228 @@
+"""Small, safe condition language for profiles.
+
+Beispiel: ``input_boolean.guest_mode == off and sensor.wohnzimmer_temp > 24``
+
+Unterstützt werden ``and``/``or``/``not``, Vergleiche (``< <= > >= == !=``,
+auch verkettet), ``+ - * /``, Klammern, Zahlen, Texte in Anführungszeichen,
+``on``/``off``/``true``/``false``, Entity-IDs (Zustand), ``entity.attribut``
+(Attribut) sowie die ShutterPilot-Eingänge ``lux``, ``temp``, ``elevation``
+und ``azimuth``. Der Ausdruck wird beim Laden einmal geparst und in
+verschachtelte Closures übersetzt; die verwendeten Entities werden dabei
+ermittelt. Es gibt kein ``eval`` und kein Template-Rendering pro Auswertung.
+
+Entity-IDs werden vor dem Parsen durch Platzhalter ersetzt, damit auch
+Object-IDs mit führender Ziffer (``sensor.2nd_floor``) gültig sind. Gerechnet
+wird nur mit Zahlen (kein ``"a" * 10**9``).
+"""
+from __future__ import annotations
+import ast
+import operator
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Optional
+
+# Eingänge, die ShutterPilot selbst bereitstellt
+INPUT_NAMES = frozenset({"lux", "temp", "elevation", "azimuth"})
+_CONSTANTS = {"on": "on", "off": "off", "true": True, "false": False}
+_TRUTHY_STATES = frozenset({"on", "open", "home", "true", "active"})
+
+_COMPARE: dict[type, Callable[[Any, Any], bool]] = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+_ARITH: dict[type, Callable[[float, float], float]] = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+}
+
+# Texte in Anführungszeichen bleiben unangetastet; sonst ist domain.object_id eine Entity-Referenz
+_ENTITY_RE = re.compile(r"""("[^"]*"|'[^']*')|(?<![\w.])([a-z_][a-z0-9_]*\.[a-z0-9_]+)""", re.IGNORECASE)
+_PLACEHOLDER = "_sp_entity_{}"
+_PLACEHOLDER_RE = re.compile(_PLACEHOLDER.format(r"\d+"))
+
+# (State-Getter, Eingänge) → Wert
+Evaluator = Callable[[Callable[[str], Any], Mapping[str, Optional[float]]], Any]
+
+
+class ExpressionError(ValueError):
+    """Invalid condition expression."""
+
+
+@dataclass(frozen=True)
+class Condition:
+    """Compiled expression with its dependencies."""
+
+    source: str
+    entities: frozenset[str]
+    inputs: frozenset[str]
+    _fn: Evaluator
+
+    def evaluate(self, get_state: Callable[[str], Any], inputs: Mapping[str, Optional[float]]) -> bool:
+        """Evaluate against current states; unavailable values make comparisons false."""
+        try:
+            return _truthy(self._fn(get_state, inputs))
+        except (TypeError, ValueError, ZeroDivisionError):
+            return False
+
+
+def _coerce(value: Any) -> Any:
+    """State string → float if numeric, else lower-case text (None stays None)."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value).lower()
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, str):
+        return value in _TRUTHY_STATES
+    return bool(value)
+
+
+def _compare(op: Callable[[Any, Any], bool], left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False  # unavailable/unknown
+    if isinstance(left, str) != isinstance(right, str):
+        # Zahl gegen Text ("unavailable" > 24) ist nie wahr, außer bei !=
+        return op is operator.ne
+    return op(left, right)
+
+
+def _number(value: Any) -> float:
+    """Arithmetic operand; text (also numeric-looking ``str * int``) is rejected."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError("arithmetic needs numbers")
+    return value
+
+
+def _tokenize_entities(source: str) -> tuple[str, dict[str, str]]:
+    """Replace entity references by valid Python names (placeholder → entity ID)."""
+    refs: dict[str, str] = {}
+    names: dict[str, str] = {}
+
+    def _sub(match: re.Match) -> str:
+        if match.group(1):
+            return match.group(1)
+        entity_id = match.group(2).lower()
+        if entity_id not in names:
+            names[entity_id] = _PLACEHOLDER.format(len(names))
+            refs[names[entity_id]] = entity_id
+        return names[entity_id]
+
+    return _ENTITY_RE.sub(_sub, source), refs
+
+
+def _restore(message: str, refs: Mapping[str, str]) -> str:
+    """Put the entity IDs back into a message that mentions placeholders."""
+    return _PLACEHOLDER_RE.sub(lambda m: refs.get(m.group(0), m.group(0)), message)
+
+
+def _entity_id(node: ast.AST, refs: Mapping[str, str]) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return refs.get(node.id)
+    return None
+
+
+def _compile(node: ast.AST, entities: set[str], inputs: set[str], refs: Mapping[str, str]) -> Evaluator:
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(v, entities, inputs, refs) for v in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda s, i: all(_truthy(p(s, i)) for p in parts)
+        return lambda s, i: any(_truthy(p(s, i)) for p in parts)
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile(node.operand, entities, inputs, refs)
+        if isinstance(node.op, ast.Not):
+            return lambda s, i: not _truthy(operand(s, i))
+        if isinstance(node.op, ast.USub):
+            return lambda s, i: -_number(operand(s, i))
+        raise ExpressionError("Unsupported operator")
+
+    if isinstance(node, ast.Compare):
+        first = _compile(node.left, entities, inputs, refs)
+        chain = []
+        for op, comp in zip(node.ops, node.comparators):
+            if type(op) not in _COMPARE:
+                raise ExpressionError("Unsupported comparison")
+            chain.append((_COMPARE[type(op)], _compile(comp, entities, inputs, refs)))
+
+        def _cmp(s, i):
+            left = first(s, i)
+            for fn, right_fn in chain:
+                right = right_fn(s, i)
+                if not _compare(fn, left, right):
+                    return False
+                left = right
+            return True
+        return _cmp
+
+    if isinstance(node, ast.BinOp):
+        if type(node.op) not in _ARITH:
+            raise ExpressionError("Unsupported arithmetic operator")
+        if any(isinstance(n, ast.Constant) and isinstance(n.value, str) for n in (node.left, node.right)):
+            raise ExpressionError("Arithmetic only works on numbers, not text")
+        fn = _ARITH[type(node.op)]
+        left, right = _compile(node.left, entities, inputs, refs), _compile(node.right, entities, inputs, refs)
+        return lambda s, i: fn(_number(left(s, i)), _number(right(s, i)))
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool)):
+        value = _coerce(node.value)
+        return lambda s, i: value
+
+    entity_id = _entity_id(node, refs)
+    if entity_id:
+        entities.add(entity_id)
+
+        def _state(s, i):
+            st = s(entity_id)
+            return _coerce(st.state) if st is not None else None
+        return _state
+
+    if isinstance(node, ast.Name):
+        name = node.id.lower()
+        if name in _CONSTANTS:
+            value = _CONSTANTS[name]
+            return lambda s, i: value
+        if name in INPUT_NAMES:
+            inputs.add(name)
+            return lambda s, i: i.get(name)
+        raise ExpressionError(f"Unknown name '{node.id}' (allowed: {', '.join(sorted(INPUT_NAMES))} or an entity ID)")
+
+    if isinstance(node, ast.Attribute):
+        entity_id, attr = _entity_id(node.value, refs), node.attr
+        if entity_id:
+            entities.add(entity_id)
+
+            def _attr(s, i):
+                st = s(entity_id)
+                return _coerce(st.attributes.get(attr)) if st is not None else None
+            return _attr
+
+    raise ExpressionError(f"Unsupported expression '{ast.unparse(node)[:60]}'")
+
+
+@lru_cache(maxsize=64)
+def compile_condition(source: str) -> Condition:
+    """Parse and compile an expression once; raises ExpressionError."""
+    text, refs = _tokenize_entities(source.strip())
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError as ex:
+        raise ExpressionError(_restore(f"Syntax error: {ex.msg}", refs)) from ex
+    entities: set[str] = set()
+    inputs: set[str] = set()
+    try:
+        fn = _compile(tree.body, entities, inputs, refs)
+    except ExpressionError as ex:
+        # Meldungen zeigen die Entity-IDs, nicht die internen Platzhalter
+        raise ExpressionError(_restore(str(ex), refs)) from None
+    return Condition(source.strip(), frozenset(entities), frozenset(inputs), fn)
+
+
+def parse_condition(source: Optional[str]) -> Optional[Condition]:
+    """Compiled condition or None for an empty field."""
+    if not source or not source.strip():
+        return None
+    return compile_condition(source.strip())
@@ -0,0 +1,132 @@
+"""Fused (virtual) lux/temperature inputs.
+
+Ein Fused Input fasst mehrere Sensoren (z. B. alle Helligkeitssensoren einer
+Fassade) zu einem robusten Wert zusammen: Maximum, Minimum, Median oder
+Mittelwert über alle gültigen Sensoren. ``unavailable``/``unknown``, nicht
+numerische und veraltete Werte (älter als ``stale_timeout``) werden
+ignoriert. Der Wert wird einmal pro Sensor-Update berechnet und von beliebig
+vielen Profilen gelesen; ohne gültige Quelle ist er ``None`` (kein ``0.0``).
+"""
+from __future__ import annotations
+import logging
+import statistics
+from datetime import timedelta
+from typing import Callable, Optional
+
+from homeassistant.core import HomeAssistant, CALLBACK_TYPE, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_state_change_event, async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    FI_NAME, FI_KIND, FI_SENSORS, FI_METHOD, FI_STALE_TIMEOUT,
+    FUSION_MAX, FUSION_MIN, FUSION_MEDIAN, FUSION_MEAN,
+    SIGNAL_FUSED_INPUT_UPDATED,
+)
+from .profiler import profiled
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_STALE_TIMEOUT = 900  # Sekunden
+
+_METHODS: dict[str, Callable[[list[float]], float]] = {
+    FUSION_MAX: max,
+    FUSION_MIN: min,
+    FUSION_MEDIAN: statistics.median,
+    FUSION_MEAN: statistics.fmean,
+}
+
+
+class FusedInput:
+    """One virtual input computed from several sensors."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, key: str, cfg: dict):
+        self.hass = hass
+        self.entry_id = entry_id
+        self.key = key
+        self.name = cfg.get(FI_NAME, key)
+        self.kind = cfg.get(FI_KIND, "lux")
+        self.sensors: list[str] = [s for s in (cfg.get(FI_SENSORS) or []) if s]
+        self.method = cfg.get(FI_METHOD, FUSION_MAX)
+        if self.method not in _METHODS:
+            _LOGGER.warning("Fused input %s: unknown method %s, using max", key, self.method)
+            self.method = FUSION_MAX
+        try:
+            self.stale_timeout = timedelta(seconds=int(cfg.get(FI_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT)))
+        except (TypeError, ValueError):
+            self.stale_timeout = timedelta(seconds=DEFAULT_STALE_TIMEOUT)
+
+        self.value: Optional[float] = None
+        self.used: list[str] = []  # Sensoren, die in den aktuellen Wert eingehen
+        self.updates = 0
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @property
+    def signal(self) -> str:
+        return SIGNAL_FUSED_INPUT_UPDATED.format(self.entry_id, self.key)
+
+    async def async_start(self):
+        if self.sensors:
+            self._unsubs.append(async_track_state_change_event(self.hass, self.sensors, self._on_source_change))
+        if self.stale_timeout.total_seconds() > 0:
+            # Veralten passiert ohne State-Update → regelmäßig nachprüfen
+            interval = max(timedelta(seconds=30), self.stale_timeout / 4)
+            self._unsubs.append(async_track_time_interval(self.hass, self._on_stale_check, interval))
+        self._recompute()
+
+    async def async_stop(self):
+        for u in self._unsubs:
+            try:
+                u()
+            except Exception:
+                pass
+        self._unsubs.clear()
+
+    @callback
+    @profiled
+    def _on_source_change(self, event):
+        self._recompute()
+
+    @callback
+    @profiled
+    def _on_stale_check(self, now):
+        self._recompute()
+
+    def _recompute(self):
+        now = dt_util.utcnow()
+        values: list[float] = []
+        used: list[str] = []
+        for entity_id in self.sensors:
+            st = self.hass.states.get(entity_id)
+            if st is None:
+                continue
+            # last_reported (neuere HA-Versionen) zählt auch unveränderte Meldungen
+            reported = getattr(st, "last_reported", None) or st.last_updated
+            if self.stale_timeout.total_seconds() > 0 and now - reported > self.stale_timeout:
+                continue
+            try:
+                values.append(float(st.state))
+            except (TypeError, ValueError):
+                continue  # unavailable / unknown / nicht numerisch
+            used.append(entity_id)
+
+        value = _METHODS[self.method](values) if values else None
+        self.used = used
+        if value == self.value:
+            return
+        if value is None:
+            _LOGGER.warning("Fused input %s: no valid source (%s)", self.name, ", ".join(self.sensors))
+        self.value = value
+        self.updates += 1
+        async_dispatcher_send(self.hass, self.signal)
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "method": self.method,
+            "value": self.value,
+            "sources": len(self.sensors),
+            "used": list(self.used),
+            "updates": self.updates,
+        }
@@ -0,0 +1,87 @@
+"""Horizon/obstruction profiles per window.
+
+Ein Horizont wird als Liste ``Azimut:Elevation`` angegeben, z. B.
+``"120:5, 180:25, 240:10"`` (Nachbarhaus im Süden). Zwischen den Stützpunkten
+wird linear interpoliert (über 360° hinweg). Beim Laden wird daraus eine
+Tabelle mit fester Auflösung erzeugt; "ist die Sonne sichtbar" ist dann ein
+einzelner Indexzugriff. Gleiche Angaben (z. B. mehrere Fenster derselben
+Fassade) teilen sich eine Tabelle.
+"""
+from __future__ import annotations
+from array import array
+from functools import lru_cache
+from typing import Optional
+
+RESOLUTION = 2  # Tabelleneinträge pro Grad Azimut
+_SIZE = 360 * RESOLUTION
+
+
+class HorizonError(ValueError):
+    """Invalid horizon specification."""
+
+
+class HorizonTable:
+    """Minimum visible sun elevation per azimuth (fixed-resolution lookup)."""
+
+    __slots__ = ("spec", "_table")
+
+    def __init__(self, spec: str, table: array):
+        self.spec = spec
+        self._table = table
+
+    def min_elevation(self, azimuth: float) -> float:
+        return self._table[int(round(azimuth * RESOLUTION)) % _SIZE]
+
+    def is_sunlit(self, azimuth: float, elevation: float) -> bool:
+        return elevation > self._table[int(round(azimuth * RESOLUTION)) % _SIZE]
+
+
+def parse_horizon(spec: str) -> list[tuple[float, float]]:
+    """Parse ``"az:el, az:el"`` into sorted points; raises HorizonError."""
+    points: dict[float, float] = {}
+    for part in spec.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            az_s, el_s = part.split(":")
+            az, el = float(az_s) % 360, float(el_s)
+        except ValueError as ex:
+            raise HorizonError(f"Invalid horizon point '{part}' (expected azimuth:elevation)") from ex
+        if not -90 <= el <= 90:
+            raise HorizonError(f"Elevation outside -90..90 in '{part}'")
+        points[az] = el
+    return sorted(points.items())
+
+
+def _normalize(spec: str) -> str:
+    return ",".join(f"{az:g}:{el:g}" for az, el in parse_horizon(spec))
+
+
+@lru_cache(maxsize=128)
+def _compile(normalized: str) -> Optional[HorizonTable]:
+    points = parse_horizon(normalized)
+    if not points:
+        return None
+    table = array("f", bytes(4 * _SIZE))
+    if len(points) == 1:
+        for i in range(_SIZE):
+            table[i] = points[0][1]
+        return HorizonTable(normalized, table)
+    # Stützpunkte zyklisch ergänzen, damit über 0°/360° interpoliert wird
+    ext = [(points[-1][0] - 360, points[-1][1]), *points, (points[0][0] + 360, points[0][1])]
+    seg = 0
+    for i in range(_SIZE):
+        az = i / RESOLUTION
+        while ext[seg + 1][0] < az:
+            seg += 1
+        (a0, e0), (a1, e1) = ext[seg], ext[seg + 1]
+        table[i] = e0 + (e1 - e0) * (az - a0) / (a1 - a0) if a1 != a0 else e1
+    return HorizonTable(normalized, table)
+
+
+def compile_horizon(spec: Optional[str]) -> Optional[HorizonTable]:
+    """Compile (or reuse) the lookup table for a horizon spec; None if empty."""
+    if not spec or not spec.strip():
+        return None
+    return _compile(_normalize(spec))
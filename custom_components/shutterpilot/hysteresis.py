@@ -0,0 +1,64 @@
+"""Schmitt trigger for lux/temperature shading decisions.
+
+Aktivierung ab Schwellwert, Deaktivierung erst unterhalb von
+Schwellwert - Hysterese (in %), und jeder Zustand wird mindestens
+``min_dwell`` gehalten. Werte, die um den Schwellwert pendeln, erzeugen so
+keine Fahrbefehle mehr; unterdrückte Wechsel werden gezählt.
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta
+from typing import Optional
+
+# Mindest-Verweildauer in einem Zustand (Beschatten / nicht Beschatten)
+DEFAULT_MIN_DWELL = timedelta(minutes=3)
+
+
+class SchmittTrigger:
+    """Two-threshold state machine with minimum dwell time."""
+
+    def __init__(self, threshold: float, hysteresis_pct: float, min_dwell: timedelta = DEFAULT_MIN_DWELL):
+        self.active: Optional[bool] = None  # None = noch kein Messwert
+        self.last_change: Optional[datetime] = None
+        self.transitions = 0
+        self.suppressed = 0
+        self._blocked = False
+        self.configure(threshold, hysteresis_pct, min_dwell)
+
+    def configure(self, threshold: float, hysteresis_pct: float, min_dwell: timedelta = DEFAULT_MIN_DWELL):
+        """Update thresholds; the current state is kept."""
+        self.enter = float(threshold)
+        self.exit = float(threshold) * (1 - max(0.0, min(float(hysteresis_pct), 100.0)) / 100)
+        self.min_dwell = min_dwell
+
+    def update(self, value: float, now: datetime) -> bool:
+        """Feed a sample and return the (possibly held) state."""
+        wanted = value >= self.exit if self.active else value >= self.enter
+        if self.active is None:
+            # Erster Messwert: sofort übernehmen
+            self.active = wanted
+            self.last_change = now
+            return self.active
+        if wanted == self.active:
+            self._blocked = False
+            return self.active
+        if self.last_change is not None and now - self.last_change < self.min_dwell:
+            # Wechsel innerhalb der Mindest-Verweildauer → halten (einmal pro Wechselversuch zählen)
+            if not self._blocked:
+                self.suppressed += 1
+                self._blocked = True
+            return self.active
+        self.active = wanted
+        self.last_change = now
+        self.transitions += 1
+        self._blocked = False
+        return self.active
+
+    def as_dict(self) -> dict:
+        return {
+            "active": self.active,
+            "enter": self.enter,
+            "exit": round(self.exit, 2),
+            "transitions": self.transitions,
+            "suppressed": self.suppressed,
+            "last_change": self.last_change.isoformat() if self.last_change else None,
+        }
@@ -0,0 +1,159 @@
+"""Internal metrics: counters and fixed-bucket latency histograms.
+
+Gemessen werden die heißen Pfade (Event-Verarbeitung, Auswertung,
+Service-Calls, Status-Veröffentlichung). Labels sind bewusst auf
+``entry``, ``profile`` und ``area`` beschränkt. Die Werte stehen zusammengefasst in
+den Diagnosedaten und im Prometheus-Textformat unter
+``/api/shutterpilot/metrics`` (nur mit Home-Assistant-Token).
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+
+from .const import DOMAIN, METRICS
+
+# Obergrenzen der Latenz-Buckets in Sekunden (+Inf kommt implizit dazu)
+BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+# Name → (Typ, Beschreibung); nur diese Metriken werden erfasst
+METRIC_DEFS: dict[str, tuple[str, str]] = {
+    "shutterpilot_events_total": (COUNTER, "Evaluation requests (state changes, ticks, area triggers)"),
+    "shutterpilot_evaluations_total": (COUNTER, "Profile evaluations executed"),
+    "shutterpilot_evaluation_seconds": (HISTOGRAM, "Duration of one profile evaluation"),
+    "shutterpilot_commands_total": (COUNTER, "Cover service calls sent"),
+    "shutterpilot_command_seconds": (HISTOGRAM, "Time spent in hass.services.async_call for covers"),
+    "shutterpilot_light_commands_total": (COUNTER, "Batched light service calls"),
+    "shutterpilot_light_command_seconds": (HISTOGRAM, "Time spent in hass.services.async_call for lights"),
+    "shutterpilot_publish_seconds": (HISTOGRAM, "Sensor callbacks and websocket status publishing"),
+    "shutterpilot_area_events_total": (COUNTER, "Area brightness events"),
+    "shutterpilot_area_event_seconds": (HISTOGRAM, "Area brightness evaluation including member dispatch"),
+    # Nur mit aktiver Simulation (simulation.py)
+    "shutterpilot_sim_events_total": (COUNTER, "Simulated sensor changes"),
+    "shutterpilot_sim_commands_total": (COUNTER, "Commands received by simulated covers"),
+    "shutterpilot_sim_dropped_commands_total": (COUNTER, "Commands dropped by simulated covers"),
+    "shutterpilot_sim_reaction_seconds": (HISTOGRAM, "Simulated sensor change until the command reached the simulated cover"),
+}
+
+_LE_INF = 'le="+Inf"'
+_LabelKey = tuple[Optional[str], Optional[str]]  # (profile, area)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Metrics of one config entry (exported with an ``entry`` label)."""
+
+    def __init__(self, entry_id: Optional[str] = None):
+        self.entry_id = entry_id
+        self._counters: dict[str, dict[_LabelKey, float]] = {}
+        self._histograms: dict[str, dict[_LabelKey, _Histogram]] = {}
+
+    def inc(self, name: str, profile: Optional[str] = None, area: Optional[str] = None, value: float = 1) -> None:
+        series = self._counters.setdefault(name, {})
+        key = (profile, area)
+        series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, profile: Optional[str] = None, area: Optional[str] = None) -> None:
+        series = self._histograms.setdefault(name, {})
+        hist = series.get((profile, area))
+        if hist is None:
+            hist = series[(profile, area)] = _Histogram()
+        hist.counts[bisect_left(BUCKETS, seconds)] += 1
+        hist.sum += seconds
+        hist.count += 1
+
+    def summary(self) -> dict:
+        """Totals per metric over all labels (diagnostics)."""
+        result: dict = {}
+        for name, series in self._counters.items():
+            result[name] = sum(series.values())
+        for name, series in self._histograms.items():
+            count = sum(h.count for h in series.values())
+            total = sum(h.sum for h in series.values())
+            counts = [sum(h.counts[i] for h in series.values()) for i in range(len(BUCKETS) + 1)]
+            result[name] = {
+                "count": count,
+                "avg_ms": round(total / count * 1000, 3) if count else None,
+                "p95_le_ms": _quantile_bound(counts, count, 0.95),
+            }
+        return result
+
+
+def _quantile_bound(counts: list[int], count: int, q: float) -> Optional[float]:
+    """Upper bucket bound containing the q-quantile (ms), None above the last bucket."""
+    if not count:
+        return None
+    seen = 0
+    for i, n in enumerate(counts[:-1]):
+        seen += n
+        if seen >= q * count:
+            return BUCKETS[i] * 1000
+    return None
+
+
+def _labels(entry_id: Optional[str], key: _LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in zip(("entry", "profile", "area"), (entry_id, *key)) if v is not None]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(registries: Iterable[MetricsRegistry]) -> str:
+    """Text exposition format (version 0.0.4) over all config entries."""
+    registries = list(registries)
+    lines: list[str] = []
+    for name, (kind, help_text) in METRIC_DEFS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for reg in registries:
+            if kind == COUNTER:
+                for key, value in reg._counters.get(name, {}).items():
+                    lines.append(f"{name}{_labels(reg.entry_id, key)} {_fmt(value)}")
+                continue
+            for key, hist in reg._histograms.get(name, {}).items():
+                cumulative = 0
+                for bound, n in zip(BUCKETS, hist.counts):
+                    cumulative += n
+                    le = 'le="%s"' % bound
+                    lines.append(f"{name}_bucket{_labels(reg.entry_id, key, le)} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(reg.entry_id, key, _LE_INF)} {hist.count}")
+                lines.append(f"{name}_sum{_labels(reg.entry_id, key)} {_fmt(hist.sum)}")
+                lines.append(f"{name}_count{_labels(reg.entry_id, key)} {hist.count}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsView(HomeAssistantView):
+    """Prometheus-style metrics of all ShutterPilot entries (authenticated)."""
+
+    url = "/api/shutterpilot/metrics"
+    name = "api:shutterpilot:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        hass = request.app[KEY_HASS]
+        registries = [
+            store[METRICS] for store in hass.data.get(DOMAIN, {}).values()
+            if isinstance(store, dict) and METRICS in store
+        ]
+        return web.Response(text=render(registries), content_type="text/plain", charset="utf-8")
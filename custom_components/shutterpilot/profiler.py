@@ -0,0 +1,181 @@
+"""On-demand profiling of ShutterPilot's entry points.
+
+Listener, Timer und Service-Handler sind mit ``@profiled`` markiert. Ohne
+laufende Sitzung kostet das nur eine Prüfung. Während einer Sitzung
+(Service ``shutterpilot.profile``) wird jeder synchrone Abschnitt – bei
+Coroutinen jeder Schritt zwischen zwei ``await`` – mit cProfile erfasst und
+gemessen. Abschnitte über dem Budget blockieren die Event-Loop und werden
+einzeln aufgeführt. Am Ende entstehen im Konfigurationsverzeichnis eine
+``.prof``-Datei (für snakeviz/pstats) und eine Textzusammenfassung.
+"""
+from __future__ import annotations
+import asyncio
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import time
+import types
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_DURATION = 60    # Sekunden
+DEFAULT_BUDGET_MS = 50   # ab hier gilt ein Abschnitt als loop-blockierend
+DEFAULT_TOP = 30
+MAX_SLOW_RECORDS = 200
+
+_session: Optional["ProfilingSession"] = None
+
+
+class ProfilingSession:
+    """Collects cProfile data and per-entry-point slice timings."""
+
+    def __init__(self, budget_ms: float = DEFAULT_BUDGET_MS, top: int = DEFAULT_TOP):
+        self.budget = budget_ms / 1000
+        self.top = top
+        self.started = datetime.now()
+        self.profiler: Optional[cProfile.Profile] = cProfile.Profile()
+        self._depth = 0
+        self.stats: dict[str, list] = {}  # Name → [Aufrufe, Abschnitte, Summe s, Max s]
+        self.slow: list[tuple[str, float, str]] = []  # (Name, ms, Zeitpunkt)
+        self.slow_total = 0
+        self.closed = False  # nach Ende: noch laufende Coroutinen nicht mehr profilen
+
+    def _enter(self):
+        if self._depth == 0 and self.profiler is not None and not self.closed:
+            try:
+                self.profiler.enable()
+            except ValueError:
+                # Anderer Profiler aktiv (z. B. die Profiler-Integration) → nur Zeitmessung
+                _LOGGER.warning("Another profiler is active; collecting timings only")
+                self.profiler = None
+        self._depth += 1
+
+    def _exit(self):
+        self._depth -= 1
+        if self._depth == 0 and self.profiler is not None and not self.closed:
+            self.profiler.disable()
+
+    def _record(self, name: str, elapsed: float, call: bool):
+        entry = self.stats.get(name)
+        if entry is None:
+            entry = self.stats[name] = [0, 0, 0.0, 0.0]
+        entry[0] += call
+        entry[1] += 1
+        entry[2] += elapsed
+        entry[3] = max(entry[3], elapsed)
+        if elapsed > self.budget and self._depth == 0:
+            self.slow_total += 1
+            if len(self.slow) < MAX_SLOW_RECORDS:
+                self.slow.append((name, elapsed * 1000, datetime.now().strftime("%H:%M:%S.%f")[:-3]))
+
+    def run_sync(self, name: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        started = time.perf_counter()
+        self._enter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._exit()
+            self._record(name, time.perf_counter() - started, True)
+
+    @types.coroutine
+    def run_coroutine(self, name: str, coro):
+        """Drive the coroutine step by step; every step is one loop-blocking slice."""
+        value, error, first = None, None, True
+        while True:
+            started = time.perf_counter()
+            self._enter()
+            try:
+                if error is not None:
+                    yielded = coro.throw(error)
+                else:
+                    yielded = coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._exit()
+                self._record(name, time.perf_counter() - started, first)
+                first = False
+            try:
+                value, error = (yield yielded), None
+            except BaseException as ex:  # Abbruch/Fehler an die Coroutine weiterreichen
+                value, error = None, ex
+
+    def summary(self) -> str:
+        """Human-readable top-N report."""
+        out = io.StringIO()
+        out.write(f"ShutterPilot profile {self.started:%Y-%m-%d %H:%M:%S} – {datetime.now():%H:%M:%S}\n")
+        out.write(f"Loop-blocking budget: {self.budget * 1000:.0f} ms, slices over budget: {self.slow_total}\n\n")
+        out.write(f"{'entry point':<55} {'calls':>7} {'slices':>7} {'total ms':>10} {'max ms':>8}\n")
+        ranked = sorted(self.stats.items(), key=lambda kv: kv[1][2], reverse=True)
+        for name, (calls, slices, total, worst) in ranked[:self.top]:
+            flag = "  !" if worst > self.budget else ""
+            out.write(f"{name:<55} {calls:>7} {slices:>7} {total * 1000:>10.1f} {worst * 1000:>8.1f}{flag}\n")
+        if self.slow:
+            out.write("\nSlices over budget:\n")
+            for name, ms, at in self.slow:
+                out.write(f"  {at}  {ms:8.1f} ms  {name}\n")
+        if self.profiler is not None:
+            out.write(f"\nTop {self.top} functions (cumulative):\n")
+            ps = pstats.Stats(self.profiler, stream=out)
+            ps.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        return out.getvalue()
+
+    def write(self, directory: str) -> tuple[Optional[str], str]:
+        """Write ``.prof`` and ``.txt`` (blocking I/O, run in the executor)."""
+        base = os.path.join(directory, f"shutterpilot_profile_{self.started:%Y%m%d_%H%M%S}")
+        prof_path = None
+        if self.profiler is not None:
+            prof_path = base + ".prof"
+            self.profiler.dump_stats(prof_path)
+        txt_path = base + ".txt"
+        with open(txt_path, "w", encoding="utf-8") as fh:
+            fh.write(self.summary())
+        return prof_path, txt_path
+
+
+def profiled(func: Callable) -> Callable:
+    """Mark a listener/timer/service entry point for on-demand profiling."""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__.replace('.<locals>', '')}"
+
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def _async_wrapper(*args, **kwargs):
+            session = _session
+            if session is None:
+                return await func(*args, **kwargs)
+            return await session.run_coroutine(name, func(*args, **kwargs))
+        return _async_wrapper
+
+    @functools.wraps(func)
+    def _wrapper(*args, **kwargs):
+        session = _session
+        if session is None:
+            return func(*args, **kwargs)
+        return session.run_sync(name, func, args, kwargs)
+    return _wrapper
+
+
+def is_running() -> bool:
+    return _session is not None
+
+
+async def async_profile(hass, duration: float, budget_ms: float, top: int) -> dict:
+    """Profile all entry points for ``duration`` seconds and write the reports."""
+    global _session
+    if _session is not None:
+        raise RuntimeError("Profiling is already running")
+    session = _session = ProfilingSession(budget_ms, top)
+    _LOGGER.info("Profiling ShutterPilot for %ss (budget %s ms)", duration, budget_ms)
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        _session = None
+        session.closed = True
+    prof_path, txt_path = await hass.async_add_executor_job(session.write, hass.config.config_dir)
+    _LOGGER.info("Profiling finished: %s (%d slice(s) over budget)", txt_path, session.slow_total)
+    return {"prof": prof_path, "summary": txt_path, "over_budget": session.slow_total}
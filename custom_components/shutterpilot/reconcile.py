@@ -0,0 +1,159 @@
+"""Batched startup reconciliation of all covers.
+
+Nach einem Start (HA-Neustart, Reload) hat bisher jedes Profil für sich
+ausgewertet und seinen Rollladen sofort angefahren – alle gleichzeitig und
+auch dann, wenn er schon richtig stand. Der Start-Abgleich liest stattdessen
+``current_position`` aller Rollläden einmal, lässt alle Profile gegen diesen
+Stand auswerten und sammelt nur die Ziele. Gesendet wird danach nur, was
+abweicht: gruppiert nach Zielposition (ein Service-Call für mehrere
+Rollläden), mit Pause zwischen den Calls und Sicherheitsfahrten (Tür/Fenster)
+zuerst. Hat ein Profil inzwischen selbst neu entschieden (z. B. Tür geöffnet),
+wird seine geplante Fahrt verworfen.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .actuator import REJECT_DELTA, REJECT_NOOP
+from .profiler import profiled
+
+if TYPE_CHECKING:
+    from .coordinator import ProfileController
+
+_LOGGER = logging.getLogger(__name__)
+
+GROUP_SIZE = 10      # Rollläden pro Service-Call
+CALL_INTERVAL = 0.5  # Sekunden zwischen zwei Calls (Funk-/Busaufkommen)
+SUPERSEDED = "superseded"  # Profil hat nach der Planung selbst neu entschieden
+
+
+@dataclass(frozen=True)
+class PlannedMove:
+    controller: "ProfileController"
+    target: int
+    policy: bool   # Automatik-Fahrt (Bewegungsbudget) statt Sicherheitsfahrt
+    service: str   # "set_cover_position" oder "open_cover"
+    seq: int       # Entscheidungszähler des Profils bei der Planung
+    one_shot: bool = False  # Zeitplan/Bereichs-Trigger: ohne Umkehr-/Ratenlimit
+
+
+class Reconciler:
+    """Startup targets of all profiles of one config entry and the moves sent for them."""
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._planned: dict[int, PlannedMove] = {}  # id(Controller) → letzte geplante Fahrt
+        self._snapshot: dict[str, Optional[int]] = {}
+        self._stats: dict[str, int] = {
+            "covers": 0,            # Rollläden im Abgleich
+            "no_move": 0,           # Profil will nicht fahren (Cooldown, Automatik aus, ...)
+            "correct": 0,           # steht schon auf dem Ziel (bzw. innerhalb der Mindeständerung)
+            "moved": 0,             # in Sammel-Calls gesendet
+            "calls": 0,
+            "superseded": 0,        # Profil hat inzwischen selbst entschieden
+            "rejected": 0,          # vom Bewegungsbudget abgelehnt
+            "unknown_position": 0,  # ohne current_position (immer gesendet)
+        }
+        self.done = False
+        self.duration: Optional[float] = None
+
+    def plan(self, ctrl: "ProfileController", target: int, policy: bool, service: str, seq: int,
+             one_shot: bool = False) -> None:
+        """Called instead of sending while the profile evaluates for the reconciliation."""
+        self._planned[id(ctrl)] = PlannedMove(ctrl, target, policy, service, seq, one_shot)
+
+    def will_move(self, ctrl: "ProfileController") -> bool:
+        """A move is planned for this profile and its cover is not in position yet."""
+        move = self._planned.get(id(ctrl))
+        return move is not None and self._snapshot.get(ctrl.cover) != move.target
+
+    async def async_plan(self, controllers: list["ProfileController"]) -> None:
+        """Evaluate all profiles against one snapshot of the cover positions (nothing is sent)."""
+        self._snapshot = {c.cover: c.current_position() for c in controllers if c.cover}
+        self._stats["covers"] = len(self._snapshot)
+        for ctrl in controllers:
+            ctrl.set_reconciler(self)
+        try:
+            await asyncio.gather(*(ctrl.async_evaluate("start") for ctrl in controllers if ctrl.cover))
+        finally:
+            for ctrl in controllers:
+                ctrl.set_reconciler(None)
+        self._stats["no_move"] = self._stats["covers"] - len(self._planned)
+
+    @profiled
+    async def async_send(self) -> None:
+        """Send the moves that differ from the snapshot, grouped by target and rate-limited."""
+        started = time.monotonic()
+        planned, self._planned = list(self._planned.values()), {}
+        groups: dict[tuple[bool, str, int], list[PlannedMove]] = {}
+        for move in planned:
+            current = self._snapshot.get(move.controller.cover)
+            if current is None:
+                self._stats["unknown_position"] += 1
+            elif current == move.target:
+                self._stats["correct"] += 1
+                continue
+            groups.setdefault((move.policy, move.service, move.target), []).append(move)
+
+        # Sicherheitsfahrten (policy=False) zuerst
+        for (policy, service, target), moves in sorted(groups.items(), key=lambda item: item[0]):
+            for start in range(0, len(moves), GROUP_SIZE):
+                if self._stats["calls"]:
+                    await asyncio.sleep(CALL_INTERVAL)
+                # Erst direkt vor dem Senden prüfen: das Profil kann inzwischen selbst entschieden haben
+                accepted = []
+                for move in moves[start:start + GROUP_SIZE]:
+                    cover = move.controller.cover
+                    reason = move.controller.accept_reconciled_move(
+                        move.seq, target, policy, self._snapshot.get(cover), move.one_shot
+                    )
+                    if reason is None:
+                        accepted.append(move.controller)
+                    elif reason == SUPERSEDED:
+                        self._stats["superseded"] += 1
+                    elif reason in (REJECT_NOOP, REJECT_DELTA):
+                        self._stats["correct"] += 1
+                    else:
+                        self._stats["rejected"] += 1
+                if accepted and await self._async_call(service, target, sorted(c.cover for c in accepted)):
+                    for controller in accepted:
+                        controller.command_sent()
+
+        self.done = True
+        self.duration = time.monotonic() - started
+        s = self._stats
+        _LOGGER.info(
+            "Startup reconciliation: %d cover(s), %d already in position, %d moved in %d call(s), "
+            "%d without move, %d superseded, %d rejected by movement budget (%.1fs)",
+            s["covers"], s["correct"], s["moved"], s["calls"], s["no_move"], s["superseded"],
+            s["rejected"], self.duration,
+        )
+
+    async def _async_call(self, service: str, target: int, entity_ids: list[str]) -> bool:
+        """Send one grouped cover call; False if it failed."""
+        data: dict = {"entity_id": entity_ids}
+        if service == "open_cover" and not self.hass.services.has_service("cover", service):
+            service = "set_cover_position"
+        if service == "set_cover_position":
+            data["position"] = target
+        self._stats["calls"] += 1
+        try:
+            await self.hass.services.async_call("cover", service, data, blocking=False)
+        except Exception as ex:
+            _LOGGER.warning("Reconciliation: cover.%s for %s failed: %s", service, ", ".join(entity_ids), ex)
+            return False
+        self._stats["moved"] += len(entity_ids)
+        _LOGGER.debug("Reconciliation: cover.%s → %d%% for %s", service, target, ", ".join(entity_ids))
+        return True
+
+    def get_stats(self) -> dict:
+        return {
+            **self._stats,
+            "done": self.done,
+            "duration_s": round(self.duration, 1) if self.duration is not None else None,
+        }
@@ -0,0 +1,111 @@
+"""Prioritized rule table with declared input dependencies.
+
+Die Auswertung eines Profils ist eine Kaskade (Tür → Fenster → Cooldown →
+Zeitplan → Helligkeit → Nacht → Beschattung → Standard); die erste Regel
+mit Ergebnis gewinnt. Jede Regel deklariert die Eingänge, von denen sie
+abhängt. Ändert sich ein Eingang, werden nur die davon abhängigen Regeln als
+"dirty" markiert; alle anderen liefern beim nächsten Lauf ihr gespeichertes
+Ergebnis. Eine Temperaturänderung rechnet so z. B. nur die Beschattung neu,
+die Ergebnisse von Tür-, Fenster- und Zeitplanregel werden wiederverwendet.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Optional
+
+# Eingänge, von denen Regeln abhängen können
+INPUT_DOOR = "door"
+INPUT_WINDOW = "window"
+INPUT_LATCH = "window_not_close"  # Fenster-/Tür-Logik aktiv (Rollladen unten)
+INPUT_COOLDOWN = "cooldown"
+INPUT_CLOCK = "clock"             # Uhrzeit/Minute (Zeitplan, Mindest-Verweildauer)
+INPUT_AREA = "area"
+INPUT_SUN = "sun"
+INPUT_LUX = "lux"
+INPUT_TEMP = "temp"
+INPUT_CONDITION = "condition"     # Entities einer eigenen Bedingung
+
+
+@dataclass(frozen=True)
+class Outcome:
+    """Terminal decision of a rule.
+
+    ``reason`` wird als Status übernommen (None = Status unverändert),
+    ``apply`` führt die Entscheidung aus. ``once`` = nicht cachen (z. B. ein
+    Bereichs-Trigger, der genau einmal angewendet wird).
+    """
+
+    reason: Optional[str]
+    apply: Optional[Callable[[], Awaitable]] = None
+    status: str = "active"
+    once: bool = False
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    priority: int  # kleiner = wichtiger
+    inputs: frozenset[str]
+    evaluate: Callable[[], Optional[Outcome]]  # None = Regel greift nicht, nächste prüfen
+
+
+class RuleEngine:
+    """Evaluates a rule table, recomputing only rules whose inputs changed."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self._rules = sorted(rules, key=lambda r: r.priority)
+        self._by_input: dict[str, set[str]] = {}
+        for rule in self._rules:
+            for name in rule.inputs:
+                self._by_input.setdefault(name, set()).add(rule.name)
+        self._cache: dict[str, Optional[Outcome]] = {}
+        self._dirty: set[str] = {r.name for r in self._rules}
+        self.last_rule: Optional[str] = None
+        self._stats: dict[str, int] = {"runs": 0, "evaluated": 0, "reused": 0}
+
+    def invalidate(self, *inputs: str) -> None:
+        """Mark every rule depending on one of the inputs for recomputation."""
+        for name in inputs:
+            self._dirty |= self._by_input.get(name, set())
+
+    def invalidate_all(self) -> None:
+        self._dirty = {r.name for r in self._rules}
+
+    def evaluate(self) -> Optional[Outcome]:
+        """Walk the table in priority order; the first outcome wins.
+
+        Regeln unterhalb der gewinnenden werden nicht berechnet und behalten
+        ihr Dirty-Flag, bis sie wieder erreicht werden.
+        """
+        self._stats["runs"] += 1
+        for rule in self._rules:
+            if rule.name in self._dirty:
+                outcome = rule.evaluate()
+                self._cache[rule.name] = outcome
+                self._dirty.discard(rule.name)
+                self._stats["evaluated"] += 1
+            else:
+                outcome = self._cache.get(rule.name)
+                self._stats["reused"] += 1
+            if outcome is not None:
+                if outcome.once:
+                    self._dirty.add(rule.name)
+                self.last_rule = rule.name
+                return outcome
+        self.last_rule = None
+        return None
+
+    def as_dict(self) -> dict:
+        return {
+            **self._stats,
+            "last_rule": self.last_rule,
+            "rules": [
+                {
+                    "name": r.name,
+                    "priority": r.priority,
+                    "inputs": sorted(r.inputs),
+                    "dirty": r.name in self._dirty,
+                    "cached": (self._cache[r.name].reason if self._cache.get(r.name) else None),
+                }
+                for r in self._rules
+            ],
+        }
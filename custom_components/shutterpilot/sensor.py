@@ -1,12 +1,18 @@
 from __future__ import annotations
 import logging
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import LIGHT_LUX
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from .const import (
-    DOMAIN, CONF_PROFILES, RUNTIME_PROFILES, P_NAME, P_COVER
+    DOMAIN, CONF_PROFILES, CONF_AREAS, CONF_COMPACT_ENTITIES, RUNTIME_PROFILES,
+    A_NAME, P_NAME, P_COVER, SIGNAL_PROFILES_CHANGED, SIMULATION,
 )
+from .websocket_api import config_version
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,24 +25,74 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     
     # Create profile-specific sensors
     store = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    area_sensors: dict[str, ShutterPilotAreaStatusSensor] = {}
+
+    @callback
+    def _sync_area_sensors() -> list:
+        """Kompaktmodus: ein Sammel-Statussensor pro Bereich; returns newly created sensors."""
+        if not store or not entry.options.get(CONF_COMPACT_ENTITIES, False):
+            return []
+        by_area: dict[str, list] = {}
+        for profile_controller in store.get(RUNTIME_PROFILES, []):
+            by_area.setdefault(profile_controller.area or "none", []).append(profile_controller)
+        created = []
+        for area_id, members in by_area.items():
+            sensor = area_sensors.get(area_id)
+            if sensor is None:
+                sensor = area_sensors[area_id] = ShutterPilotAreaStatusSensor(hass, entry, area_id, members)
+                created.append(sensor)
+                _LOGGER.debug("Created area status sensor for %s (%d profiles)", area_id, len(members))
+            else:
+                sensor.set_profile_controllers(members)
+        # Bereiche ohne Profile → Sensor entfernen
+        registry = er.async_get(hass)
+        for area_id in [a for a in area_sensors if a not in by_area]:
+            sensor = area_sensors.pop(area_id)
+            if sensor.entity_id and registry.async_get(sensor.entity_id):
+                registry.async_remove(sensor.entity_id)
+        return created
+
+    def _profile_sensors(profile_controller) -> list:
+        return [
+            ShutterPilotStatusSensor(hass, entry, profile_controller),
+            ShutterPilotLastActionSensor(hass, entry, profile_controller),
+            ShutterPilotCooldownRemainingSensor(hass, entry, profile_controller),
+            ShutterPilotSunElevationSensor(hass, entry, profile_controller),
+        ]
+
+    if store and store.get(SIMULATION):
+        sim = store[SIMULATION]
+        entities.extend(SimulatedLuxSensor(sim, k) for k in range(sim.lux_sensor_count))
+
     if store:
-        runtime_profiles = store.get(RUNTIME_PROFILES, [])
-        for profile_controller in runtime_profiles:
+        entities.extend(_sync_area_sensors())
+
+        for profile_controller in store.get(RUNTIME_PROFILES, []):
+            if not profile_controller.wants_own_entities():
+                continue
             try:
-                profile_name = profile_controller.name
-                entities.extend([
-                    ShutterPilotStatusSensor(hass, entry, profile_controller),
-                    ShutterPilotLastActionSensor(hass, entry, profile_controller),
-                    ShutterPilotCooldownRemainingSensor(hass, entry, profile_controller),
-                    ShutterPilotSunElevationSensor(hass, entry, profile_controller),
-                ])
-                _LOGGER.debug("Created sensors for profile: %s", profile_name)
+                entities.extend(_profile_sensors(profile_controller))
+                _LOGGER.debug("Created sensors for profile: %s", profile_controller.name)
             except Exception as ex:
                 _LOGGER.exception("Failed to create sensors for profile %s: %s", 
                                 profile_controller.name, ex)
     
     async_add_entities(entities, True)
 
+    @callback
+    def _on_profiles_changed(controllers: list):
+        """Add sensors for profiles added/renamed by a config patch."""
+        new_entities = _sync_area_sensors()
+        for profile_controller in controllers:
+            if profile_controller.wants_own_entities():
+                new_entities.extend(_profile_sensors(profile_controller))
+        if new_entities:
+            async_add_entities(new_entities, True)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_PROFILES_CHANGED.format(entry.entry_id), _on_profiles_changed)
+    )
+
 
 def _sanitize_name(name: str) -> str:
     """Create safe entity name from profile name."""
@@ -53,6 +109,7 @@ class ShutterPilotStatusSensor(SensorEntity):
     
     _attr_has_entity_name = True
     _attr_icon = "mdi:state-machine"
+    _unrecorded_attributes = frozenset({"moves_last_hour", "moves_rejected"})
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry, profile_controller):
         """Initialize status sensor."""
@@ -94,6 +151,7 @@ class ShutterPilotStatusSensor(SensorEntity):
             "profile_name": self.profile_name,
             "enabled": self.profile_controller.enabled,
             "cover_entity": self.profile_controller.cover,
+            **self.profile_controller.get_movement_summary(),
         }
 
     async def async_added_to_hass(self):
@@ -104,13 +162,13 @@ class ShutterPilotStatusSensor(SensorEntity):
             self.async_write_ha_state()
         
         self._update_callback = _update_callback
-        self.profile_controller.register_sensor_callback(_update_callback)
+        self.profile_controller.add_update_listener(_update_callback)
         
         # Remove callback on unload
         @callback
         def _cleanup():
-            if hasattr(self, '_update_callback') and self._update_callback in self.profile_controller._sensor_update_callbacks:
-                self.profile_controller._sensor_update_callbacks.remove(self._update_callback)
+            if hasattr(self, '_update_callback'):
+                self.profile_controller.remove_update_listener(self._update_callback)
         
         self.async_on_remove(_cleanup)
 
@@ -193,12 +251,12 @@ class ShutterPilotLastActionSensor(SensorEntity):
             """Update sensor state."""
             self.async_write_ha_state()
         
-        self.profile_controller.register_sensor_callback(_update_callback)
+        self.profile_controller.add_update_listener(_update_callback)
         
         @callback
         def _cleanup():
-            if hasattr(self, '_update_callback') and self._update_callback in self.profile_controller._sensor_update_callbacks:
-                self.profile_controller._sensor_update_callbacks.remove(self._update_callback)
+            if hasattr(self, '_update_callback'):
+                self.profile_controller.remove_update_listener(self._update_callback)
         
         self.async_on_remove(_cleanup)
 
@@ -258,12 +316,12 @@ class ShutterPilotCooldownRemainingSensor(SensorEntity):
             """Update sensor state."""
             self.async_write_ha_state()
         
-        self.profile_controller.register_sensor_callback(_update_callback)
+        self.profile_controller.add_update_listener(_update_callback)
         
         @callback
         def _cleanup():
-            if hasattr(self, '_update_callback') and self._update_callback in self.profile_controller._sensor_update_callbacks:
-                self.profile_controller._sensor_update_callbacks.remove(self._update_callback)
+            if hasattr(self, '_update_callback'):
+                self.profile_controller.remove_update_listener(self._update_callback)
         
         self.async_on_remove(_cleanup)
 
@@ -328,7 +386,7 @@ class ShutterPilotSunElevationSensor(SensorEntity):
         
         self._update_callback = _update_callback
         # Register callback for status updates (also triggers on sun changes)
-        self.profile_controller.register_sensor_callback(_update_callback)
+        self.profile_controller.add_update_listener(_update_callback)
         
         # Also update periodically (every minute) to track sun movement
         from homeassistant.helpers.event import async_track_time_interval
@@ -343,19 +401,138 @@ class ShutterPilotSunElevationSensor(SensorEntity):
         
         @callback
         def _cleanup():
-            if hasattr(self, '_update_callback') and self._update_callback in self.profile_controller._sensor_update_callbacks:
-                self.profile_controller._sensor_update_callbacks.remove(self._update_callback)
+            if hasattr(self, '_update_callback'):
+                self.profile_controller.remove_update_listener(self._update_callback)
             if hasattr(self, '_periodic_unsub'):
                 self._periodic_unsub()
         
         self.async_on_remove(_cleanup)
 
 
+class ShutterPilotAreaStatusSensor(SensorEntity):
+    """Aggregated status of all profiles of one area (compact mode)."""
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:home-group"
+    _attr_should_poll = False
+    # Verschachtelte Profil-Details nur für Card/Templates, nicht in den Recorder
+    _unrecorded_attributes = frozenset({"profiles"})
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, area_id: str, profile_controllers: list):
+        """Initialize area status sensor."""
+        self.hass = hass
+        self.entry = entry
+        self.area_id = area_id
+        self.profile_controllers = profile_controllers
+        self._attr_unique_id = f"{entry.entry_id}_area_status_{_sanitize_name(area_id)}"
+        self._write_scheduled = False
+        self._update_callback = None
+
+    @property
+    def area_name(self) -> str:
+        """Return display name of the area."""
+        if self.area_id == "none":
+            return "Ohne Bereich"
+        area_cfg = self.entry.options.get(CONF_AREAS, {}).get(self.area_id, {})
+        return area_cfg.get(A_NAME, self.area_id)
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor."""
+        return f"Bereich {self.area_name} Status"
+
+    @property
+    def native_value(self) -> str:
+        """Return the aggregated status (active > cooldown > inactive)."""
+        statuses = {c.get_status() for c in self.profile_controllers}
+        for status in ("active", "cooldown"):
+            if status in statuses:
+                return status
+        return "inactive"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.entry.entry_id)},
+            name="ShutterPilot",
+            manufacturer="ShutterPilot",
+            model="Core",
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return per-profile status as structured attribute."""
+        profiles = {}
+        for c in self.profile_controllers:
+            profiles[c.name] = {
+                "status": c.get_status(),
+                "reason": c.get_last_action_reason(),
+                "enabled": c.enabled,
+                "cover_entity": c.cover,
+                # Endzeitpunkt statt Restsekunden: ändert sich nur beim Start eines Cooldowns
+                "cooldown_until": c.cooldown_until.isoformat() if c.cooldown_until else None,
+            }
+        return {
+            "area": self.area_id,
+            "area_name": self.area_name,
+            "profile_count": len(profiles),
+            "enabled_count": sum(1 for p in profiles.values() if p["enabled"]),
+            "profiles": profiles,
+        }
+
+    @callback
+    def _schedule_write(self):
+        """Coalesce status updates of all member profiles into one state write."""
+        if self._write_scheduled:
+            return
+        self._write_scheduled = True
+
+        @callback
+        def _write():
+            self._write_scheduled = False
+            if self._update_callback is not None:  # Entity noch nicht entfernt
+                self.async_write_ha_state()
+
+        self.hass.loop.call_soon(_write)
+
+    @callback
+    def set_profile_controllers(self, profile_controllers: list):
+        """Replace the member profiles (after a config patch)."""
+        if self._update_callback is not None:
+            for c in self.profile_controllers:
+                c.remove_update_listener(self._update_callback)
+            for c in profile_controllers:
+                c.add_update_listener(self._update_callback)
+        self.profile_controllers = profile_controllers
+        if self._update_callback is not None:
+            self._schedule_write()
+
+    async def async_added_to_hass(self):
+        """When entity is added to hass."""
+        self._update_callback = self._schedule_write
+        for c in self.profile_controllers:
+            c.add_update_listener(self._update_callback)
+
+        @callback
+        def _cleanup():
+            for c in self.profile_controllers:
+                c.remove_update_listener(self._update_callback)
+            self._update_callback = None
+
+        self.async_on_remove(_cleanup)
+
+
 class ShutterPilotConfigSensor(SensorEntity):
-    """Sensor that exposes config for the management card."""
+    """Sensor that exposes the config version for the management card.
+
+    The card loads the config itself via websocket (shutterpilot/config/get);
+    only small summary attributes are kept here.
+    """
 
     _attr_has_entity_name = False  # Use explicit name
     _attr_should_poll = False
+    _unrecorded_attributes = frozenset({"entry_id", "config_version", "profile_count", "area_count"})
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
@@ -372,27 +549,18 @@ class ShutterPilotConfigSensor(SensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict:
-        """Return config as attributes."""
+        """Return config summary as attributes."""
         return {
             "entry_id": self._entry.entry_id,
-            "profiles": self._entry.options.get(CONF_PROFILES, []),
-            "areas": self._entry.options.get("areas", {}),
-            "global_settings": {
-                "default_vpos": self._entry.options.get("default_vpos", 30),
-                "default_cooldown": self._entry.options.get("default_cooldown", 120),
-                "summer_start": self._entry.options.get("summer_start", "05-01"),
-                "summer_end": self._entry.options.get("summer_end", "09-30"),
-                "sun_elevation_end": self._entry.options.get("sun_elevation_end", 3.0),
-                "sun_offset_up": self._entry.options.get("sun_offset_up", 0),
-                "sun_offset_down": self._entry.options.get("sun_offset_down", 0),
-            }
+            "config_version": config_version(dict(self._entry.options)),
+            "profile_count": len(self._entry.options.get(CONF_PROFILES, [])),
+            "area_count": len(self._entry.options.get(CONF_AREAS, {})),
         }
 
     async def async_added_to_hass(self) -> None:
         """Register update listener."""
         
-        @callback
-        def _handle_config_update(hass: HomeAssistant, entry: ConfigEntry):
+        async def _handle_config_update(hass: HomeAssistant, entry: ConfigEntry):
             """Handle config update."""
             self._entry = entry  # Update entry reference
             self.async_write_ha_state()
@@ -401,3 +569,44 @@ class ShutterPilotConfigSensor(SensorEntity):
             self._entry.add_update_listener(_handle_config_update)
         )
 
+
+class SimulatedLuxSensor(SensorEntity):
+    """Virtual brightness sensor driven by the simulation waveform (see simulation.py)."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_device_class = SensorDeviceClass.ILLUMINANCE
+    _attr_native_unit_of_measurement = LIGHT_LUX
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, sim, index: int) -> None:
+        self._sim = sim
+        self.index = index
+        self._attr_name = f"Lux {index}"
+        self._attr_unique_id = sim.unique_id("lux", index)
+        self._attr_device_info = sim.device_info
+        self._rng = sim.rng("lux", index)
+        self._walk = self._rng.uniform(0.3, 1.0)  # Bewölkung / Zufallsverlauf
+        value, self._walk = sim.lux_value(index, self._walk, self._rng)
+        self._attr_native_value = round(value)
+        self._unsub: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        self._sim.register("lux", self.index, self)
+        # Sensoren melden versetzt, nicht alle im selben Moment
+        self._unsub = async_call_later(self.hass, self._rng.uniform(0, self._sim.lux_interval), self._update)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._sim.unregister("lux", self.index)
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _update(self, _now) -> None:
+        value, self._walk = self._sim.lux_value(self.index, self._walk, self._rng)
+        self._attr_native_value = round(value)
+        self.async_write_ha_state()
+        self._sim.sensor_event(self._sim.lux_group(self.index))
+        interval = self._sim.lux_interval
+        self._unsub = async_call_later(self.hass, self._rng.uniform(0.75 * interval, 1.25 * interval), self._update)
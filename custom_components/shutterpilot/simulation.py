@@ -0,0 +1,239 @@
+"""Simulated covers and sensors for load and soak tests (developer feature).
+
+Mit aktivierter Simulation legt ShutterPilot N virtuelle Rollläden an
+(``cover``-Plattform) – mit Fahrzeit, Positionsmeldungen während der Fahrt,
+gelegentlich verlorenen Befehlen und zufälliger Anlaufverzögerung – sowie
+virtuelle Lux-, Fenster- und Türsensoren. Lux folgt einer wählbaren
+Wellenform, Fenster und Türen öffnen als Poisson-Prozess. Alles läuft über
+die normale State Machine und die normalen Service-Calls, gemessen wird also
+Ende zu Ende: vom Sensorereignis bis der Befehl beim Rollladen ankommt.
+
+Die Zeitbasis ist ``hass.loop.time()``; mit der virtuellen Uhr der Benchmarks
+laufen Simulationen damit auch beschleunigt.
+"""
+from __future__ import annotations
+import logging
+import math
+import random
+from typing import Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import DeviceInfo
+
+from .const import (
+    DOMAIN, SIM_DEFAULTS, SIM_COVERS, SIM_TRAVEL_TIME, SIM_REPORT_INTERVAL, SIM_DROP_RATE, SIM_JITTER,
+    SIM_LUX_WAVEFORM, SIM_LUX_MAX, SIM_LUX_PERIOD, SIM_LUX_INTERVAL, SIM_COVERS_PER_SENSOR,
+    SIM_WINDOW_RATE, SIM_DOOR_EVERY, SIM_DOOR_RATE, SIM_OPEN_DURATION, SIM_SEED, LUX_WAVEFORMS,
+    P_ID, P_NAME, P_COVER, P_WINDOW, P_DOOR, P_LUX, P_AREA, P_LUX_TH, P_AZ_MIN, P_AZ_MAX,
+)
+from .metrics import MetricsRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+REACTION_WINDOW = 10.0  # Sekunden: spätere Befehle gelten nicht als Reaktion auf das Sensorereignis
+_FACADES = (90, 135, 180, 225, 270)
+
+
+class SimulationController:
+    """Shared settings, random streams and end-to-end measurements of one simulation."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, cfg: dict, metrics: MetricsRegistry):
+        self.hass = hass
+        self.entry_id = entry_id
+        self.metrics = metrics
+        cfg = {**SIM_DEFAULTS, **(cfg or {})}
+        self.cover_count = max(0, int(cfg[SIM_COVERS]))
+        self.travel_time = max(0.1, float(cfg[SIM_TRAVEL_TIME]))
+        self.report_interval = max(0.1, float(cfg[SIM_REPORT_INTERVAL]))
+        self.drop_rate = min(1.0, max(0.0, float(cfg[SIM_DROP_RATE])))
+        self.jitter = max(0.0, float(cfg[SIM_JITTER]))
+        self.waveform = cfg[SIM_LUX_WAVEFORM]
+        if self.waveform not in LUX_WAVEFORMS:
+            _LOGGER.warning("Simulation: unknown lux waveform %s, using sun", self.waveform)
+            self.waveform = "sun"
+        self.lux_max = max(0.0, float(cfg[SIM_LUX_MAX]))
+        self.lux_period = max(1.0, float(cfg[SIM_LUX_PERIOD]))
+        self.lux_interval = max(1.0, float(cfg[SIM_LUX_INTERVAL]))
+        self.covers_per_sensor = max(1, int(cfg[SIM_COVERS_PER_SENSOR]))
+        self.window_rate = max(0.0, float(cfg[SIM_WINDOW_RATE]))
+        self.door_every = max(0, int(cfg[SIM_DOOR_EVERY]))
+        self.door_rate = max(0.0, float(cfg[SIM_DOOR_RATE]))
+        self.open_duration = max(1.0, float(cfg[SIM_OPEN_DURATION]))
+        self.seed = cfg[SIM_SEED]
+
+        # Index → Entity (Covers, Fenster, Türen pro Rollladen; Lux pro Gruppe)
+        self.entities: dict[str, dict[int, object]] = {"cover": {}, "window": {}, "door": {}, "lux": {}}
+        self._last_event: dict[int, float] = {}  # Rollladen-Index → Zeit des letzten Sensorereignisses
+        self.events = 0
+        self.commands = 0
+        self.dropped = 0
+        self.reactions = 0
+        self.reaction_sum = 0.0
+        self.reaction_max = 0.0
+        self.settled = 0
+        self.settle_sum = 0.0
+        self.settle_max = 0.0
+
+    # ----- Aufbau -----
+
+    @property
+    def lux_sensor_count(self) -> int:
+        return math.ceil(self.cover_count / self.covers_per_sensor)
+
+    def has_door(self, index: int) -> bool:
+        return bool(self.door_every) and index % self.door_every == 0
+
+    def lux_group(self, sensor: int) -> range:
+        """Cover indices fed by lux sensor ``sensor``."""
+        start = sensor * self.covers_per_sensor
+        return range(start, min(self.cover_count, start + self.covers_per_sensor))
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{self.entry_id}_simulation")},
+            name="ShutterPilot Simulation",
+            manufacturer="ShutterPilot",
+            model="Simulation",
+        )
+
+    def unique_id(self, kind: str, index: int) -> str:
+        return f"{self.entry_id}_sim_{kind}_{index}"
+
+    def unique_ids(self) -> set[str]:
+        """Unique IDs of all simulated entities with the current settings."""
+        ids = {self.unique_id("lux", k) for k in range(self.lux_sensor_count)}
+        for i in range(self.cover_count):
+            ids.add(self.unique_id("cover", i))
+            ids.add(self.unique_id("window", i))
+            if self.has_door(i):
+                ids.add(self.unique_id("door", i))
+        return ids
+
+    def rng(self, *parts) -> random.Random:
+        """Independent, reproducible random stream per entity."""
+        return random.Random(f"{self.seed}:" + ":".join(map(str, parts)))
+
+    def register(self, kind: str, index: int, entity) -> None:
+        self.entities[kind][index] = entity
+
+    def unregister(self, kind: str, index: int) -> None:
+        self.entities[kind].pop(index, None)
+
+    # ----- Zufallsprozesse -----
+
+    def next_opening(self, rate: float, rnd: random.Random) -> Optional[float]:
+        """Seconds until the next opening (Poisson, ``rate`` per hour); None = never."""
+        return rnd.expovariate(rate / 3600) if rate > 0 else None
+
+    def opening_duration(self, rnd: random.Random) -> float:
+        return max(1.0, rnd.expovariate(1 / self.open_duration))
+
+    def lux_value(self, sensor: int, walk: float, rnd: random.Random) -> tuple[float, float]:
+        """Next lux reading of ``sensor``; ``walk`` is the sensor's random-walk state (0–1)."""
+        phase = sensor / max(1, self.lux_sensor_count)
+        cycle = self.hass.loop.time() / self.lux_period + phase
+        if self.waveform == "sine":
+            return self.lux_max * (0.5 + 0.5 * math.sin(2 * math.pi * cycle)), walk
+        if self.waveform == "square":
+            return (self.lux_max if cycle % 1 < 0.5 else self.lux_max * 0.02), walk
+        walk = min(1.0, max(0.05, walk + rnd.gauss(0, 0.08)))
+        if self.waveform == "random":
+            return self.lux_max * walk, walk
+        # sun: Klarhimmel aus der Sonnenhöhe × Bewölkung (Random Walk)
+        sun = self.hass.states.get("sun.sun")
+        try:
+            elevation = float(sun.attributes.get("elevation")) if sun else 0.0
+        except (TypeError, ValueError):
+            elevation = 0.0
+        return self.lux_max * math.sin(math.radians(max(0.0, elevation))) * walk, walk
+
+    # ----- Messung -----
+
+    def sensor_event(self, covers) -> None:
+        """A simulated sensor changed; ShutterPilot may now command ``covers``."""
+        now = self.hass.loop.time()
+        for index in covers:
+            self._last_event[index] = now
+        self.events += 1
+        self.metrics.inc("shutterpilot_sim_events_total")
+
+    def command_received(self, index: int, rnd: random.Random) -> Optional[float]:
+        """A command reached simulated cover ``index``; returns the start delay or None if dropped."""
+        now = self.hass.loop.time()
+        self.commands += 1
+        self.metrics.inc("shutterpilot_sim_commands_total")
+        event = self._last_event.pop(index, None)
+        if event is not None and now - event <= REACTION_WINDOW:
+            latency = now - event
+            self.reactions += 1
+            self.reaction_sum += latency
+            self.reaction_max = max(self.reaction_max, latency)
+            self.metrics.observe("shutterpilot_sim_reaction_seconds", latency)
+        if self.drop_rate and rnd.random() < self.drop_rate:
+            self.dropped += 1
+            self.metrics.inc("shutterpilot_sim_dropped_commands_total")
+            return None
+        return rnd.uniform(0, self.jitter) if self.jitter else 0.0
+
+    def move_settled(self, seconds: float) -> None:
+        """A simulated cover reached its target ``seconds`` after the command."""
+        self.settled += 1
+        self.settle_sum += seconds
+        self.settle_max = max(self.settle_max, seconds)
+
+    def get_stats(self) -> dict:
+        return {
+            "covers": len(self.entities["cover"]),
+            "lux_sensors": len(self.entities["lux"]),
+            "windows": len(self.entities["window"]),
+            "doors": len(self.entities["door"]),
+            "waveform": self.waveform,
+            "sensor_events": self.events,
+            "commands": self.commands,
+            "dropped_commands": self.dropped,
+            "reactions": self.reactions,
+            "reaction_avg_ms": round(self.reaction_sum / self.reactions * 1000, 1) if self.reactions else None,
+            "reaction_max_ms": round(self.reaction_max * 1000, 1) if self.reactions else None,
+            "moves_settled": self.settled,
+            "settle_avg_s": round(self.settle_sum / self.settled, 1) if self.settled else None,
+            "settle_max_s": round(self.settle_max, 1) if self.settled else None,
+        }
+
+    # ----- Profile für die simulierten Rollläden -----
+
+    def build_profiles(self, area: Optional[str]) -> list[dict]:
+        """One profile per simulated cover, wired to its simulated sensors."""
+        profiles = []
+        for index, cover in sorted(self.entities["cover"].items()):
+            if not cover.entity_id:
+                continue
+            facade = _FACADES[index % len(_FACADES)]
+            prof = {
+                P_ID: sim_profile_id(index),
+                P_NAME: f"Sim {index:04d}",
+                P_COVER: cover.entity_id,
+                P_AREA: area or "none",
+                P_LUX_TH: round(self.lux_max / 2),
+                P_AZ_MIN: facade - 60,
+                P_AZ_MAX: facade + 60,
+            }
+            window = self.entities["window"].get(index)
+            if window is not None and window.entity_id:
+                prof[P_WINDOW] = window.entity_id
+            door = self.entities["door"].get(index)
+            if door is not None and door.entity_id:
+                prof[P_DOOR] = door.entity_id
+            lux = self.entities["lux"].get(index // self.covers_per_sensor)
+            if lux is not None and lux.entity_id:
+                prof[P_LUX] = lux.entity_id
+            profiles.append(prof)
+        return profiles
+
+
+def sim_profile_id(index: int) -> str:
+    return f"sim{index:04d}"
+
+
+def is_sim_profile_id(profile_id: Optional[str]) -> bool:
+    return bool(profile_id) and profile_id.startswith("sim") and profile_id[3:].isdigit()
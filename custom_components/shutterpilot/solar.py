@@ -0,0 +1,154 @@
+"""Façade-aware sun incidence model.
+
+Pro Profil kann optional die Fenstergeometrie hinterlegt werden
+(Ausrichtung, Neigung, Überstand/Laibung). Daraus werden Einfallswinkel,
+besonnter Anteil der Scheibe und die direkte Einstrahlung auf das Glas
+berechnet. Sonnenvektor und Klarhimmel-Direktstrahlung werden pro
+Sonnenstand nur einmal bestimmt; alle Fenster werden danach in einem
+Durchlauf ausgewertet (nur Standardbibliothek).
+"""
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+SOLAR_CONSTANT = 1353.0  # W/m²
+DEFAULT_IRRADIANCE_THRESHOLD = 150.0  # W/m² direkte Einstrahlung auf das Glas
+DEFAULT_SLAT_RATIO = 0.85  # Lamellenabstand / Lamellenbreite (typische Raffstores)
+
+
+@dataclass(frozen=True)
+class WindowGeometry:
+    """Window orientation and shading elements (lengths in m, angles in °)."""
+
+    azimuth: float              # Ausrichtung der Fassadennormalen (0 = Nord, 90 = Ost, 180 = Süd)
+    tilt: float = 90.0          # 90 = senkrechtes Fenster, 0 = waagerechtes Dachfenster
+    overhang: float = 0.0       # Tiefe des Dachüberstands/Balkons über dem Fenster
+    reveal: float = 0.0         # Tiefe der Laibung (Fenster sitzt zurückgesetzt)
+    height: float = 1.5
+    width: float = 1.0
+
+
+@dataclass(frozen=True)
+class Exposure:
+    """Result for one window at the current sun position."""
+
+    cos_incidence: float        # cos(Einfallswinkel), 0 = Sonne hinter der Fassade
+    sunlit_fraction: float      # 0..1 besonnter Anteil der Scheibe
+    irradiance: float           # W/m² direkte Klarhimmel-Einstrahlung auf das Glas
+
+    @property
+    def incidence_angle(self) -> float:
+        return math.degrees(math.acos(max(-1.0, min(1.0, self.cos_incidence))))
+
+
+def clear_sky_dni(elevation: float) -> float:
+    """Direct normal irradiance for a clear sky (Meinel air-mass model)."""
+    if elevation <= 0:
+        return 0.0
+    air_mass = 1 / (math.sin(math.radians(elevation)) + 0.50572 * (elevation + 6.07995) ** -1.6364)
+    return SOLAR_CONSTANT * 0.7 ** (air_mass ** 0.678)
+
+
+def compute_exposures(elevation: float, azimuth: float,
+                      windows: Iterable[WindowGeometry]) -> list[Exposure]:
+    """Evaluate all windows for one sun position in a single pass."""
+    dark = Exposure(0.0, 0.0, 0.0)
+    if elevation <= 0:
+        return [dark for _ in windows]
+
+    # Pro Sonnenstand einmal: Sonnenvektor (Ost, Nord, Oben) und Direktstrahlung
+    el = math.radians(elevation)
+    az = math.radians(azimuth)
+    sun_e = math.cos(el) * math.sin(az)
+    sun_n = math.cos(el) * math.cos(az)
+    sun_u = math.sin(el)
+    tan_el = math.tan(el)
+    dni = clear_sky_dni(elevation)
+
+    result: list[Exposure] = []
+    for w in windows:
+        tilt = math.radians(w.tilt)
+        w_az = math.radians(w.azimuth)
+        # Normale der Scheibe: um tilt aus der Senkrechten Richtung Fassade geneigt
+        cos_i = (math.sin(tilt) * (math.sin(w_az) * sun_e + math.cos(w_az) * sun_n)
+                 + math.cos(tilt) * sun_u)
+        if cos_i <= 0:
+            result.append(dark)
+            continue
+
+        fraction = 1.0
+        if w.tilt >= 60 and (w.overhang > 0 or w.reveal > 0):
+            # Horizontaler Winkel zwischen Sonne und Fassadennormale
+            gamma = math.cos(az - w_az)
+            gamma_sin = abs(math.sin(az - w_az))
+            # Vertikaler Schattenwinkel (profile angle): tan Ω = tan h / cos γ
+            shadow_v = (w.overhang + w.reveal) * tan_el / max(gamma, 1e-6)
+            shadow_h = w.reveal * gamma_sin / max(gamma, 1e-6)
+            lit_v = max(0.0, 1 - shadow_v / w.height) if w.height > 0 else 0.0
+            lit_h = max(0.0, 1 - shadow_h / w.width) if w.width > 0 else 0.0
+            fraction = lit_v * lit_h
+
+        result.append(Exposure(cos_i, fraction, dni * cos_i * fraction))
+    return result
+
+
+def cutoff_tilt(elevation: float, azimuth: float, facade_azimuth: Optional[float],
+                slat_ratio: float = DEFAULT_SLAT_RATIO) -> int:
+    """Tilt position (0 = closed, 100 = slats horizontal) that just blocks direct sun.
+
+    Cut-off-Winkel horizontaler Lamellen: β = asin(s/w · cos Ω) − Ω mit dem
+    vertikalen Schattenwinkel Ω (tan Ω = tan h / cos γ). Ohne Fassadenausrichtung
+    wird die Sonne als frontal angenommen (γ = 0).
+    """
+    if elevation <= 0:
+        return 100
+    gamma = 0.0 if facade_azimuth is None else math.radians(azimuth - facade_azimuth)
+    if math.cos(gamma) <= 0:
+        return 100  # Sonne hinter der Fassade → Lamellen offen
+    omega = math.atan(math.tan(math.radians(elevation)) / math.cos(gamma))
+    beta = math.asin(max(-1.0, min(1.0, slat_ratio * math.cos(omega)))) - omega
+    beta_deg = max(0.0, min(90.0, math.degrees(beta)))
+    return round(100 * (1 - beta_deg / 90))
+
+
+def quantize(value: float, step: int) -> int:
+    """Round to the configured step (0..100)."""
+    if step <= 1:
+        return max(0, min(100, round(value)))
+    return max(0, min(100, int(round(value / step)) * step))
+
+
+class SolarModel:
+    """Windows of one config entry; exposures are cached per sun position."""
+
+    def __init__(self):
+        self._windows: dict[str, WindowGeometry] = {}
+        self._key: Optional[tuple] = None
+        self._exposures: dict[str, Exposure] = {}
+        self._revision = 0
+        self.passes = 0
+
+    def set_window(self, key: str, geometry: Optional[WindowGeometry]) -> None:
+        """Register, change or (with None) remove the geometry of a profile."""
+        if geometry is None:
+            if self._windows.pop(key, None) is None:
+                return
+        elif self._windows.get(key) == geometry:
+            return
+        else:
+            self._windows[key] = geometry
+        self._revision += 1
+
+    def exposure(self, key: str, elevation: float, azimuth: float) -> Optional[Exposure]:
+        """Exposure of one window; all windows are recomputed once per sun position."""
+        cache_key = (round(elevation, 2), round(azimuth, 2), self._revision)
+        if cache_key != self._key:
+            ids = list(self._windows)
+            self._exposures = dict(zip(ids, compute_exposures(elevation, azimuth, self._windows.values())))
+            self._key = cache_key
+            self.passes += 1
+        return self._exposures.get(key)
+
+    def get_stats(self) -> dict:
+        return {"windows": len(self._windows), "passes": self.passes}
@@ -3,8 +3,13 @@ import logging
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
-from .const import DOMAIN, CONF_GLOBAL_AUTO, CONF_PROFILES, RUNTIME_PROFILES, P_NAME, P_ENABLED, P_COVER
+from .const import (
+    DOMAIN, CONF_GLOBAL_AUTO, CONF_PROFILES, RUNTIME_PROFILES, P_NAME, P_ENABLED, P_COVER,
+    SIGNAL_PROFILES_CHANGED,
+)
+from .config_manager import async_set_profiles_enabled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,6 +22,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     if store:
         runtime_profiles = store.get(RUNTIME_PROFILES, [])
         for profile_controller in runtime_profiles:
+            if not profile_controller.wants_own_entities():
+                # Kompaktmodus: Aktivierung über Service shutterpilot.set_profiles_enabled
+                continue
             try:
                 profile_switch = ShutterPilotProfileSwitch(hass, entry, profile_controller)
                 entities.append(profile_switch)
@@ -37,6 +45,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     
     async_add_entities(entities, True)
 
+    @callback
+    def _on_profiles_changed(controllers: list):
+        """Add switches for profiles added/renamed by a config patch."""
+        new_entities = [
+            ShutterPilotProfileSwitch(hass, entry, c) for c in controllers if c.wants_own_entities()
+        ]
+        if new_entities:
+            async_add_entities(new_entities, True)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_PROFILES_CHANGED.format(entry.entry_id), _on_profiles_changed)
+    )
+
 class ShutterPilotGlobalAutoSwitch(SwitchEntity):
     _attr_has_entity_name = True
 
@@ -87,9 +108,10 @@ class ShutterPilotGlobalAutoSwitch(SwitchEntity):
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(
-            self.entry.add_update_listener(lambda hass, entry: self.async_update_callback())
-        )
+        async def _on_entry_update(hass: HomeAssistant, entry: ConfigEntry):
+            self.async_update_callback()
+
+        self.async_on_remove(self.entry.add_update_listener(_on_entry_update))
 
 
 class ShutterPilotProfileSwitch(SwitchEntity):
@@ -180,7 +202,7 @@ class ShutterPilotProfileSwitch(SwitchEntity):
             
             # Update controller immediately
             if self.profile_controller:
-                self.profile_controller.enabled = value
+                self.profile_controller.set_enabled(value)
                 _LOGGER.info("Profile '%s' %s via switch", 
                            self.profile_name, "enabled" if value else "disabled")
             
@@ -195,23 +217,8 @@ class ShutterPilotProfileSwitch(SwitchEntity):
     async def _persist_profile_enabled(self, value: bool):
         """Persist enabled state to config entry options."""
         try:
-            profiles = list(self.entry.options.get(CONF_PROFILES, []))
-            
-            # Find and update the profile
-            if self.profile_index >= 0 and self.profile_index < len(profiles):
-                profiles[self.profile_index] = {**profiles[self.profile_index], P_ENABLED: value}
-            else:
-                # Fallback: search by name
-                for idx, p in enumerate(profiles):
-                    if p.get(P_NAME) == self.profile_name:
-                        profiles[idx] = {**p, P_ENABLED: value}
-                        self.profile_index = idx
-                        break
-            
-            # Update entry
-            new_opts = dict(self.entry.options)
-            new_opts[CONF_PROFILES] = profiles
-            self.hass.config_entries.async_update_entry(self.entry, options=new_opts)
+            # Controller ist bereits aktualisiert → speichern ohne Reload
+            async_set_profiles_enabled(self.hass, self.entry, {self.profile_name}, value)
             
             _LOGGER.debug("Persisted enabled state %s for profile '%s'", 
                         value, self.profile_name)
@@ -242,9 +249,10 @@ class ShutterPilotProfileSwitch(SwitchEntity):
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(
-            self.entry.add_update_listener(lambda hass, entry: self.async_update_callback())
-        )
+        async def _on_entry_update(hass: HomeAssistant, entry: ConfigEntry):
+            self.async_update_callback()
+
+        self.async_on_remove(self.entry.add_update_listener(_on_entry_update))
 
 
 class ShutterPilotProfileSwitchFromConfig(SwitchEntity):
@@ -352,6 +360,7 @@ class ShutterPilotProfileSwitchFromConfig(SwitchEntity):
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self.async_on_remove(
-            self.entry.add_update_listener(lambda hass, entry: self.async_update_callback())
-        )
\ No newline at end of file
+        async def _on_entry_update(hass: HomeAssistant, entry: ConfigEntry):
+            self.async_update_callback()
+
+        self.async_on_remove(self.entry.add_update_listener(_on_entry_update))
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""WebSocket API for the management card.
+
+Replaces the former config sensor attribute blob: the card fetches the
+configuration once (with a version/ETag) and then only receives small
+incremental updates.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+from typing import Any, Optional
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    DOMAIN, CONF_PROFILES, CONF_AREAS, CONF_FUSED_INPUTS, RUNTIME_PROFILES,
+    SIGNAL_CONFIG_UPDATED, SIGNAL_STATUS_UPDATED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def config_version(options: dict) -> str:
+    """Stable version (ETag) of the options; identical content → identical version."""
+    raw = json.dumps(options, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def build_config_payload(entry: ConfigEntry) -> dict[str, Any]:
+    """Config as used by the management card."""
+    options = entry.options
+    return {
+        "entry_id": entry.entry_id,
+        "version": config_version(dict(options)),
+        "profiles": options.get(CONF_PROFILES, []),
+        "areas": options.get(CONF_AREAS, {}),
+        "fused_inputs": options.get(CONF_FUSED_INPUTS, {}),
+        "global_settings": {
+            "default_vpos": options.get("default_vpos", 30),
+            "default_cooldown": options.get("default_cooldown", 120),
+            "summer_start": options.get("summer_start", "05-01"),
+            "summer_end": options.get("summer_end", "09-30"),
+            "sun_elevation_end": options.get("sun_elevation_end", 3.0),
+            "sun_offset_up": options.get("sun_offset_up", 0),
+            "sun_offset_down": options.get("sun_offset_down", 0),
+        },
+    }
+
+
+def _resolve_entry(hass: HomeAssistant, entry_id: Optional[str]) -> Optional[ConfigEntry]:
+    """Explicit entry or the first ShutterPilot entry."""
+    if entry_id:
+        return hass.config_entries.async_get_entry(entry_id)
+    entries = hass.config_entries.async_entries(DOMAIN)
+    return entries[0] if entries else None
+
+
+def _status_snapshot(hass: HomeAssistant, entry_id: str) -> dict[str, dict]:
+    store = hass.data.get(DOMAIN, {}).get(entry_id) or {}
+    return {c.name: c.get_status_dict() for c in store.get(RUNTIME_PROFILES, [])}
+
+
+@callback
+def async_register_commands(hass: HomeAssistant) -> None:
+    """Register all ShutterPilot websocket commands."""
+    websocket_api.async_register_command(hass, ws_get_config)
+    websocket_api.async_register_command(hass, ws_subscribe_config)
+    websocket_api.async_register_command(hass, ws_subscribe_status)
+    websocket_api.async_register_command(hass, ws_patch_config)
+    websocket_api.async_register_command(hass, ws_get_audit)
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "shutterpilot/config/get",
+    vol.Optional("entry_id"): str,
+})
+@callback
+def ws_get_config(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+    """Return the full configuration including its version."""
+    entry = _resolve_entry(hass, msg.get("entry_id"))
+    if entry is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "ShutterPilot entry not found")
+        return
+    connection.send_result(msg["id"], build_config_payload(entry))
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "shutterpilot/audit/get",
+    vol.Optional("entry_id"): str,
+    vol.Optional("profile"): str,
+    vol.Optional("limit"): vol.All(int, vol.Range(min=1)),
+})
+@callback
+def ws_get_audit(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+    """Recent evaluation decisions per profile (newest first); profile = name or id."""
+    entry = _resolve_entry(hass, msg.get("entry_id"))
+    store = hass.data.get(DOMAIN, {}).get(entry.entry_id) if entry else None
+    if store is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "ShutterPilot entry not found")
+        return
+    wanted = msg.get("profile")
+    result = {
+        c.name: c.get_audit(msg.get("limit"))
+        for c in store.get(RUNTIME_PROFILES, [])
+        if wanted is None or wanted in (c.name, c.profile_id)
+    }
+    if wanted is not None and not result:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, f"Profile {wanted} not found")
+        return
+    connection.send_result(msg["id"], {"profiles": result})
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "shutterpilot/config/subscribe",
+    vol.Optional("entry_id"): str,
+    vol.Optional("version"): str,
+})
+@callback
+def ws_subscribe_config(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+    """Send config now (unless the client version is current) and on every change."""
+    entry = _resolve_entry(hass, msg.get("entry_id"))
+    if entry is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "ShutterPilot entry not found")
+        return
+    entry_id = entry.entry_id
+    last_version = msg.get("version")
+
+    @callback
+    def _send(*_args) -> None:
+        nonlocal last_version
+        current = hass.config_entries.async_get_entry(entry_id)
+        if current is None:
+            return
+        payload = build_config_payload(current)
+        if payload["version"] == last_version:
+            # Client already has this version → only confirm it
+            connection.send_message(websocket_api.event_message(
+                msg["id"], {"version": last_version, "unchanged": True}
+            ))
+            return
+        last_version = payload["version"]
+        connection.send_message(websocket_api.event_message(msg["id"], payload))
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_CONFIG_UPDATED.format(entry_id), _send
+    )
+    connection.send_result(msg["id"])
+    _send()
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "shutterpilot/status/subscribe",
+    vol.Optional("entry_id"): str,
+})
+@callback
+def ws_subscribe_status(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+    """Send a status snapshot of all profiles, then per-profile deltas."""
+    entry = _resolve_entry(hass, msg.get("entry_id"))
+    if entry is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "ShutterPilot entry not found")
+        return
+    entry_id = entry.entry_id
+    pending: dict[str, dict] = {}
+
+    @callback
+    def _flush() -> None:
+        if not pending:
+            return
+        delta = dict(pending)
+        pending.clear()
+        connection.send_message(websocket_api.event_message(msg["id"], {"profiles": delta}))
+
+    @callback
+    def _on_status(profile_name: str, status: dict) -> None:
+        # Mehrere Änderungen derselben Loop-Iteration zu einer Nachricht bündeln
+        if not pending:
+            hass.loop.call_soon(_flush)
+        pending[profile_name] = status
+
+    @callback
+    def _on_config(*_args) -> None:
+        # Profile wurden neu gestartet → vollständiger Snapshot
+        pending.clear()
+        connection.send_message(websocket_api.event_message(
+            msg["id"], {"snapshot": True, "profiles": _status_snapshot(hass, entry_id)}
+        ))
+
+    unsub_status = async_dispatcher_connect(hass, SIGNAL_STATUS_UPDATED.format(entry_id), _on_status)
+    unsub_config = async_dispatcher_connect(hass, SIGNAL_CONFIG_UPDATED.format(entry_id), _on_config)
+
+    @callback
+    def _unsub() -> None:
+        unsub_status()
+        unsub_config()
+
+    connection.subscriptions[msg["id"]] = _unsub
+    connection.send_result(msg["id"])
+    _on_config()
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "shutterpilot/config/patch",
+    vol.Optional("entry_id"): str,
+    vol.Optional("base_version"): str,
+    vol.Optional("upsert_profiles"): [dict],
+    vol.Optional("remove_profiles"): [str],
+    vol.Optional("upsert_areas"): {str: dict},
+    vol.Optional("remove_areas"): [str],
+})
+@websocket_api.require_admin
+@websocket_api.async_response
+async def ws_patch_config(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+    """Apply a profile/area patch; the result carries the new version."""
+    from .config_manager import ConfigConflict, async_apply_patch
+
+    entry = _resolve_entry(hass, msg.get("entry_id"))
+    if entry is None or entry.entry_id not in hass.data.get(DOMAIN, {}):
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "ShutterPilot entry not found")
+        return
+    patch = {k: v for k, v in msg.items() if k not in ("id", "type", "entry_id")}
+    try:
+        result = await async_apply_patch(hass, entry, patch)
+    except ConfigConflict as err:
+        connection.send_error(msg["id"], "conflict", str(err))
+        return
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+    connection.send_result(msg["id"], result)
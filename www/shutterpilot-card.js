@@ -1,7 +1,9 @@
 /**
  * ShutterPilot Management Card
  * Professional Enterprise-Level UI for ShutterPilot
- * Version: 2.5.0 - Non-Async Service (No Coroutine Error)
+ * Version: 2.6.0 - Incremental Rendering
+ *
+ * Optionen: entity (Pflicht), debug: true → Render-Zeiten in der Browser-Konsole
  */
 
 class ShutterPilotCard extends HTMLElement {
@@ -13,6 +15,7 @@ class ShutterPilotCard extends HTMLElement {
     this._configEntry = null;
     this._profiles = [];
     this._areas = {};
+    this._fusedInputs = {};        // Virtuelle Lux-/Temperatur-Eingänge (im Options-Dialog angelegt)
     this._globalSettings = {};
     this._editingProfile = null;
     this._editingArea = null;
@@ -20,6 +23,15 @@ class ShutterPilotCard extends HTMLElement {
     this._activeTab = 'profiles';
     this._selectedProfiles = new Set();
     this._tempProfileData = null;  // Zwischenspeicher für Profil-Bearbeitung
+    this._trackedIds = null;       // Eigene Entity-IDs (nur diese lösen Updates aus)
+    this._areaSensorIds = [];
+    this._rowHtml = new Map();     // Zuletzt gerendertes HTML pro Profil-Zeile
+    this._renderScheduled = false;
+    this._pendingRender = false;   // Render aufgeschoben, solange ein Dialog offen ist
+
+    // Event-Delegation: ein Listener für die ganze Card (überlebt Teil-Renderings)
+    this.shadowRoot.addEventListener('click', (e) => this._onClick(e));
+    this.shadowRoot.addEventListener('change', (e) => this._onChange(e));
   }
 
   setConfig(config) {
@@ -33,77 +45,184 @@ class ShutterPilotCard extends HTMLElement {
     const oldHass = this._hass;
     this._hass = hass;
     
-    if (!oldHass || this._needsUpdate(oldHass, hass)) {
-      this._loadConfigEntry();
+    if (!oldHass) {
+      this._subscribe();
+      this._enrichProfilesWithStatus();
+      this.render();
+      return;
+    }
+
+    // Nur eigene Entities vergleichen (HA ersetzt State-Objekte bei Änderungen)
+    const changed = this._changedEntityIds(oldHass, hass);
+    if (changed.length === 0) return;
+
+    this._enrichProfilesWithStatus();
+    if (changed.includes(this._config.entity)) {
+      this._scheduleRender();  // Globaler Schalter betrifft Header/Global-Tab
+    } else {
+      this._updateProfileRows();
     }
-    
-    this.render();
   }
 
-  _needsUpdate(oldHass, newHass) {
-    const oldGlobal = oldHass?.states[this._config.entity];
-    const newGlobal = newHass?.states[this._config.entity];
-    
-    if (oldGlobal?.state !== newGlobal?.state) return true;
-    
-    const oldSwitches = Object.keys(oldHass?.states || {}).filter(e => e.startsWith('switch.shutterpilot_'));
-    const newSwitches = Object.keys(newHass?.states || {}).filter(e => e.startsWith('switch.shutterpilot_'));
-    
-    if (oldSwitches.length !== newSwitches.length) return true;
-    
-    return false;
+  _entityIdsFor(profile) {
+    const sanitizedName = profile.name.toLowerCase().replace(/[^a-z0-9]/g, '_');
+    return {
+      status: `sensor.shutterpilot_${sanitizedName}_status`,
+      switch: `switch.shutterpilot_${sanitizedName}_automation`,
+    };
+  }
+
+  _trackedEntityIds() {
+    if (!this._trackedIds) {
+      const ids = new Set([this._config.entity]);
+      this._profiles.forEach(p => {
+        const e = this._entityIdsFor(p);
+        ids.add(e.status);
+        ids.add(e.switch);
+      });
+      // Einmaliger Scan nach Sammel-Sensoren (nur bei Config-Änderung)
+      this._areaSensorIds = this._findAreaStatusSensors().map(st => st.entity_id);
+      this._areaSensorIds.forEach(id => ids.add(id));
+      this._trackedIds = [...ids];
+    }
+    return this._trackedIds;
+  }
+
+  _changedEntityIds(oldHass, newHass) {
+    return this._trackedEntityIds().filter(id => oldHass.states[id] !== newHass.states[id]);
+  }
+
+  _isDialogOpen() {
+    return this._editingProfile !== null || this._editingArea !== null;
+  }
+
+  _scheduleRender() {
+    // Offene Dialoge nicht neu aufbauen (Eingaben gingen verloren)
+    if (this._isDialogOpen()) {
+      this._pendingRender = true;
+      return;
+    }
+    if (this._renderScheduled) return;
+    this._renderScheduled = true;
+    requestAnimationFrame(() => {
+      this._renderScheduled = false;
+      this.render();
+    });
+  }
+
+  _timed(label, fn) {
+    if (!this._config?.debug) return fn();
+    const t0 = performance.now();
+    const result = fn();
+    console.debug(`⏱️ ShutterPilot ${label}: ${(performance.now() - t0).toFixed(1)} ms`);
+    return result;
+  }
+
+  connectedCallback() {
+    if (this._hass && !this._subscriptions) {
+      this._subscribe();
+    }
+  }
+
+  disconnectedCallback() {
+    this._unsubscribe();
+  }
+
+  async _subscribe() {
+    if (!this._hass?.connection || this._subscriptions) return;
+    this._subscriptions = [];
+
+    try {
+      // Config einmal holen, danach nur bei Änderungen (Version/ETag)
+      this._subscriptions.push(this._hass.connection.subscribeMessage(
+        (msg) => this._onConfigEvent(msg),
+        { type: 'shutterpilot/config/subscribe', ...(this._configVersion ? { version: this._configVersion } : {}) }
+      ));
+      // Laufzeit-Status: Snapshot + kleine Deltas pro Profil
+      this._subscriptions.push(this._hass.connection.subscribeMessage(
+        (msg) => this._onStatusEvent(msg),
+        { type: 'shutterpilot/status/subscribe' }
+      ));
+    } catch (err) {
+      console.error('❌ ShutterPilot WebSocket-Abo fehlgeschlagen:', err);
+    }
+  }
+
+  _unsubscribe() {
+    if (!this._subscriptions) return;
+    this._subscriptions.forEach(p => Promise.resolve(p).then(unsub => unsub && unsub()).catch(() => {}));
+    this._subscriptions = null;
   }
 
   async _loadConfigEntry() {
     if (!this._hass) return;
 
     try {
-      // Find config sensor with explicit entity_id
-      const configSensorId = 'sensor.shutterpilot_config';
-      const sensorState = this._hass.states[configSensorId];
+      const config = await this._hass.callWS({ type: 'shutterpilot/config/get' });
+      this._applyConfig(config);
+    } catch (err) {
+      console.error('❌ Fehler beim Laden der Config Entry:', err);
+    }
+  }
 
-      if (!sensorState) {
-        console.warn('❌ ShutterPilot Config Sensor nicht gefunden:', configSensorId);
-        console.warn('Verfügbare Sensoren:', Object.keys(this._hass.states).filter(e => e.includes('shutterpilot')));
-        return;
+  _applyConfig(config) {
+    this._configVersion = config.version;
+    this._trackedIds = null;
+    this._configEntry = {
+      entry_id: config.entry_id,
+      options: {
+        profiles: config.profiles || [],
+        areas: config.areas || {},
+        ...config.global_settings
       }
+    };
 
-      if (!sensorState.attributes) {
-        console.warn('❌ Config Sensor hat keine Attributes');
-        return;
-      }
+    this._profiles = (config.profiles || []).map(p => ({
+      ...p,
+      ...(this._statusByName?.[p.name] ? { status: this._statusByName[p.name].status, enabled: this._statusByName[p.name].enabled } : {}),
+    }));
+    this._areas = config.areas || this._getDefaultAreas();
+    this._fusedInputs = config.fused_inputs || {};
+    this._globalSettings = config.global_settings || {
+      default_vpos: 30,
+      default_cooldown: 120,
+      summer_start: '05-01',
+      summer_end: '09-30',
+      sun_elevation_end: 3.0,
+      sun_offset_up: 0,
+      sun_offset_down: 0,
+    };
 
-      const attrs = sensorState.attributes;
-      console.log('✅ Config Sensor geladen:', attrs);
-      
-      // Store entry ID
-      this._configEntry = {
-        entry_id: attrs.entry_id,
-        options: {
-          profiles: attrs.profiles || [],
-          areas: attrs.areas || {},
-          ...attrs.global_settings
-        }
-      };
-      
-      this._profiles = attrs.profiles || [];
-      this._areas = attrs.areas || this._getDefaultAreas();
-      this._globalSettings = attrs.global_settings || {
-        default_vpos: 30,
-        default_cooldown: 120,
-        summer_start: '05-01',
-        summer_end: '09-30',
-        sun_elevation_end: 3.0,
-        sun_offset_up: 0,
-        sun_offset_down: 0,
-      };
+    console.log(`✅ ${this._profiles.length} Profile geladen (Version ${config.version}):`, this._profiles.map(p => p.name));
+    this._enrichProfilesWithStatus();
+  }
 
-      console.log(`✅ ${this._profiles.length} Profile geladen:`, this._profiles.map(p => p.name));
+  _onConfigEvent(msg) {
+    if (msg.unchanged) return;
+    this._applyConfig(msg);
+    this._scheduleRender();
+    // Entities neuer Profile entstehen kurz nach dem Config-Event → Entity-Liste erneut ermitteln
+    setTimeout(() => {
+      this._trackedIds = null;
       this._enrichProfilesWithStatus();
+      this._updateProfileRows();
+    }, 2000);
+  }
 
-    } catch (err) {
-      console.error('❌ Fehler beim Laden der Config Entry:', err);
+  _onStatusEvent(msg) {
+    if (msg.snapshot || !this._statusByName) {
+      this._statusByName = {};
     }
+    Object.assign(this._statusByName, msg.profiles || {});
+
+    let changed = false;
+    this._profiles = this._profiles.map(p => {
+      const st = msg.profiles?.[p.name];
+      if (!st) return p;
+      changed = true;
+      return { ...p, status: st.status, enabled: st.enabled, reason: st.reason, cooldown_until: st.cooldown_until };
+    });
+    if (changed) this._updateProfileRows();
   }
 
   _getDefaultAreas() {
@@ -144,21 +263,39 @@ class ShutterPilotCard extends HTMLElement {
     };
   }
 
+  _findAreaStatusSensors() {
+    // Kompaktmodus: Sammel-Statussensoren pro Bereich (Attribut "profiles")
+    return Object.values(this._hass.states).filter(st =>
+      st.entity_id.startsWith('sensor.shutterpilot_') &&
+      st.attributes?.area !== undefined &&
+      typeof st.attributes?.profiles === 'object'
+    );
+  }
+
   _enrichProfilesWithStatus() {
     if (!this._hass || !this._profiles) return;
 
+    const areaProfiles = {};
+    this._trackedEntityIds();
+    this._areaSensorIds.map(id => this._hass.states[id]).filter(Boolean).forEach(st => {
+      Object.entries(st.attributes.profiles || {}).forEach(([name, info]) => {
+        areaProfiles[name] = { ...info, entity_id: st.entity_id };
+      });
+    });
+
     this._profiles = this._profiles.map(profile => {
-      const sanitizedName = profile.name.toLowerCase().replace(/[^a-z0-9]/g, '_');
-      
-      const statusSensor = this._hass.states[`sensor.shutterpilot_${sanitizedName}_status`];
-      const enabledSwitch = this._hass.states[`switch.shutterpilot_${sanitizedName}_automation`];
+      const ids = this._entityIdsFor(profile);
+      const statusSensor = this._hass.states[ids.status];
+      const enabledSwitch = this._hass.states[ids.switch];
+      const areaInfo = areaProfiles[profile.name];
+      const live = this._statusByName?.[profile.name];  // WebSocket-Status (aktuellster Stand)
       
       return {
         ...profile,
-        status: statusSensor?.state || 'unknown',
-        enabled: enabledSwitch?.state === 'on',
+        status: live?.status || statusSensor?.state || areaInfo?.status || 'unknown',
+        enabled: live ? live.enabled : enabledSwitch ? enabledSwitch.state === 'on' : (areaInfo ? areaInfo.enabled : profile.enabled !== false),
         _entities: {
-          status: statusSensor?.entity_id,
+          status: statusSensor?.entity_id || areaInfo?.entity_id,
           switch: enabledSwitch?.entity_id,
         }
       };
@@ -167,23 +304,56 @@ class ShutterPilotCard extends HTMLElement {
 
   render() {
     if (!this._hass || !this._config) return;
+    this._pendingRender = false;
+
+    this._timed('render', () => {
+      this._rowHtml.clear();
+      const tabContent = this._activeTab === 'profiles' ? this._renderProfilesTab() :
+                         this._activeTab === 'areas' ? this._renderAreasTab() :
+                         this._renderGlobalTab();
+
+      this.shadowRoot.innerHTML = `
+        <style>${this._getStyles()}</style>
+        <div class="card-container">
+          ${this._renderHeader()}
+          ${this._renderTabs()}
+          <div class="card-content">${tabContent}</div>
+          ${this._editingProfile !== null ? this._renderProfileEditDialog() : ''}
+          ${this._editingArea !== null ? this._renderAreaEditDialog() : ''}
+        </div>
+      `;
+    });
+  }
 
-    const tabContent = this._activeTab === 'profiles' ? this._renderProfilesTab() :
-                       this._activeTab === 'areas' ? this._renderAreasTab() :
-                       this._renderGlobalTab();
-
-    this.shadowRoot.innerHTML = `
-      <style>${this._getStyles()}</style>
-      <div class="card-container">
-        ${this._renderHeader()}
-        ${this._renderTabs()}
-        <div class="card-content">${tabContent}</div>
-        ${this._editingProfile !== null ? this._renderProfileEditDialog() : ''}
-        ${this._editingArea !== null ? this._renderAreaEditDialog() : ''}
-      </div>
-    `;
+  _rowKey(profile, index) {
+    return profile.id || `idx-${index}`;
+  }
 
-    this._attachEventListeners();
+  _updateProfileRows() {
+    // Nur geänderte Profil-Zeilen ersetzen statt die ganze Card neu aufzubauen
+    if (this._activeTab !== 'profiles') return;
+    const table = this.shadowRoot.querySelector('.profile-table');
+    if (!table) {
+      this._scheduleRender();
+      return;
+    }
+
+    this._timed('rows', () => {
+      this._profiles.forEach((profile, idx) => {
+        const key = this._rowKey(profile, idx);
+        const html = this._renderProfileRow(profile, idx);
+        if (this._rowHtml.get(key) === html) return;
+        const row = table.querySelector(`[data-row="${key}"]`);
+        if (!row) {
+          this._scheduleRender();
+          return;
+        }
+        const tpl = document.createElement('template');
+        tpl.innerHTML = html.trim();
+        row.replaceWith(tpl.content);
+        this._rowHtml.set(key, html);
+      });
+    });
   }
 
   _renderHeader() {
@@ -272,7 +442,11 @@ class ShutterPilotCard extends HTMLElement {
           <div class="th th-actions">Aktionen</div>
         </div>
 
-        ${this._profiles.map((profile, idx) => this._renderProfileRow(profile, idx)).join('')}
+        ${this._profiles.map((profile, idx) => {
+          const html = this._renderProfileRow(profile, idx);
+          this._rowHtml.set(this._rowKey(profile, idx), html);
+          return html;
+        }).join('')}
       </div>
     `;
   }
@@ -283,7 +457,7 @@ class ShutterPilotCard extends HTMLElement {
     const statusText = this._getStatusText(profile.status);
     
     return `
-      <div class="table-row ${profile.enabled ? '' : 'disabled'}">
+      <div class="table-row ${profile.enabled ? '' : 'disabled'}" data-row="${this._rowKey(profile, index)}">
         <div class="td td-status">
           <span class="status-badge status-${statusClass}">
             ${statusText}
@@ -570,6 +744,22 @@ class ShutterPilotCard extends HTMLElement {
     `;
   }
 
+  _renderFusedInputSelect(name, kind, profile, label) {
+    const inputs = Object.entries(this._fusedInputs).filter(([, cfg]) => (cfg.kind || 'lux') === kind);
+    if (!inputs.length) return '';
+    return `
+      <div class="form-group">
+        <label>${label}</label>
+        <select name="${name}" class="form-input">
+          <option value="">Keiner</option>
+          ${inputs.map(([key, cfg]) => `
+            <option value="${key}" ${profile[name] === key ? 'selected' : ''}>${cfg.name || key}</option>
+          `).join('')}
+        </select>
+      </div>
+    `;
+  }
+
   _renderProfileSensorsForm(profile) {
     const binarySensors = Object.keys(this._hass.states).filter(e => e.startsWith('binary_sensor.'));
     const luxSensors = Object.keys(this._hass.states).filter(e => 
@@ -592,10 +782,13 @@ class ShutterPilotCard extends HTMLElement {
           `).join('')}
         </select>
         <small class="form-hint">
-          ${profile.lux_sensor ? '✅ Sensor konfiguriert' : '⚠️ Empfohlen für automatische Beschattung'}
+          ${profile.lux_sensor || profile.lux_input ? '✅ Sensor konfiguriert' : '⚠️ Empfohlen für automatische Beschattung'}
         </small>
       </div>
 
+      ${this._renderFusedInputSelect('lux_input', 'lux', profile, 'Fused Input Helligkeit (ersetzt den Sensor)')}
+      ${this._renderFusedInputSelect('temp_input', 'temperature', profile, 'Fused Input Temperatur (ersetzt den Sensor)')}
+
       <div class="form-group">
         <label>
           <ha-icon icon="mdi:window-open"></ha-icon>
@@ -672,6 +865,65 @@ class ShutterPilotCard extends HTMLElement {
         </div>
       </div>
 
+      <div class="form-row">
+        <div class="form-group">
+          <label>Fassadenausrichtung (°, -1 = aus)</label>
+          <input type="number" name="facade_azimuth" value="${profile.facade_azimuth ?? -1}" min="-1" max="360" class="form-input">
+        </div>
+        <div class="form-group">
+          <label>Einstrahlung Schwelle (W/m²)</label>
+          <input type="number" name="irradiance_threshold" value="${profile.irradiance_threshold ?? 150}" min="0" max="1200" class="form-input">
+        </div>
+      </div>
+
+      <div class="form-row">
+        <div class="form-group">
+          <label>Fensterneigung (°)</label>
+          <input type="number" name="window_tilt" value="${profile.window_tilt ?? 90}" min="0" max="90" class="form-input">
+        </div>
+        <div class="form-group">
+          <label>Überstand (m)</label>
+          <input type="number" name="overhang_depth" value="${profile.overhang_depth ?? 0}" min="0" max="10" step="0.05" class="form-input">
+        </div>
+      </div>
+
+      <div class="form-row">
+        <div class="form-group">
+          <label>Laibung (m)</label>
+          <input type="number" name="reveal_depth" value="${profile.reveal_depth ?? 0}" min="0" max="2" step="0.01" class="form-input">
+        </div>
+        <div class="form-group">
+          <label>Fenster H × B (m)</label>
+          <div class="form-row">
+            <input type="number" name="window_height" value="${profile.window_height ?? 1.5}" min="0.1" max="10" step="0.05" class="form-input">
+            <input type="number" name="window_width" value="${profile.window_width ?? 1.0}" min="0.1" max="10" step="0.05" class="form-input">
+          </div>
+        </div>
+      </div>
+
+      <div class="form-group">
+        <label>Horizont / Verschattung (Azimut:Elevation, …)</label>
+        <input type="text" name="horizon" value="${profile.horizon || ''}" placeholder="150:5, 200:25, 240:10" class="form-input">
+      </div>
+
+      <div class="form-group">
+        <label>Zusätzliche Bedingung für Beschattung (optional)</label>
+        <input type="text" name="shade_condition" value="${(profile.shade_condition || '').replace(/"/g, '&quot;')}" placeholder="input_boolean.gaeste == off and sensor.raumtemperatur > 24" class="form-input">
+      </div>
+
+      <div class="form-row">
+        <div class="form-group">
+          <label class="checkbox-label">
+            <input type="checkbox" name="slat_tracking" ${profile.slat_tracking ? 'checked' : ''}>
+            <span>Lamellennachführung</span>
+          </label>
+        </div>
+        <div class="form-group">
+          <label>Lamellen-Schrittweite (%)</label>
+          <input type="number" name="tilt_step" value="${profile.tilt_step ?? 10}" min="1" max="50" class="form-input">
+        </div>
+      </div>
+
       <div class="form-group">
         <label>Beschattungsposition (%)</label>
         <input type="number" name="shade_pos" value="${profile.shade_pos || 20}" min="0" max="100" class="form-input">
@@ -864,100 +1116,40 @@ class ShutterPilotCard extends HTMLElement {
   }
 
   // Event Listeners
-  _attachEventListeners() {
-    const root = this.shadowRoot;
-
-    // Header Buttons
-    root.querySelectorAll('[data-action="refresh"]').forEach(btn => {
-      btn.addEventListener('click', () => this._refresh());
-    });
-
-    // Tab Navigation
-    root.querySelectorAll('[data-tab]').forEach(tab => {
-      tab.addEventListener('click', (e) => {
-        const tabName = e.currentTarget.getAttribute('data-tab');
-        this._setTab(tabName);
-      });
-    });
-
-    // Service Buttons
-    root.querySelectorAll('[data-service]').forEach(btn => {
-      btn.addEventListener('click', (e) => {
-        const service = e.currentTarget.getAttribute('data-service');
-        this._callService(service);
-      });
-    });
-
-    // Profile Actions
-    root.querySelectorAll('[data-action="add-profile"]').forEach(btn => {
-      btn.addEventListener('click', () => this._addProfile());
-    });
-
-    root.querySelectorAll('[data-action="toggle"]').forEach(btn => {
-      btn.addEventListener('click', (e) => {
-        const index = parseInt(e.currentTarget.getAttribute('data-index'));
-        this._toggleProfileEnabled(index);
-      });
-    });
-
-    root.querySelectorAll('[data-action="edit"]').forEach(btn => {
-      btn.addEventListener('click', (e) => {
-        const index = parseInt(e.currentTarget.getAttribute('data-index'));
-        this._editProfile(index);
-      });
-    });
-
-    root.querySelectorAll('[data-action="copy"]').forEach(btn => {
-      btn.addEventListener('click', (e) => {
-        const index = parseInt(e.currentTarget.getAttribute('data-index'));
-        this._copyProfile(index);
-      });
-    });
-
-    root.querySelectorAll('[data-action="delete"]').forEach(btn => {
-      btn.addEventListener('click', (e) => {
-        const index = parseInt(e.currentTarget.getAttribute('data-index'));
-        this._deleteProfile(index);
-      });
-    });
-
-    // Area Actions
-    root.querySelectorAll('[data-action="edit-area"]').forEach(btn => {
-      btn.addEventListener('click', (e) => {
-        const area = e.currentTarget.getAttribute('data-area');
-        this._editArea(area);
-      });
-    });
-
-    // Global Auto Toggle
-    root.querySelectorAll('[data-action="toggle-global"]').forEach(cb => {
-      cb.addEventListener('change', (e) => {
-        this._toggleGlobalAuto(e.target.checked);
-      });
-    });
-
-    // Dialog Actions
-    root.querySelectorAll('[data-action="close-dialog"]').forEach(btn => {
-      btn.addEventListener('click', () => this._closeDialog());
-    });
-
-    root.querySelectorAll('[data-dialog-tab]').forEach(tab => {
-      tab.addEventListener('click', (e) => {
-        // Speichere aktuelle Formular-Daten vor Tab-Wechsel
-        this._saveCurrentProfileFormData();
-        
-        this._editDialogTab = e.currentTarget.getAttribute('data-dialog-tab');
-        this.render();
-      });
-    });
-
-    root.querySelectorAll('[data-action="save-profile"]').forEach(btn => {
-      btn.addEventListener('click', () => this._saveProfile());
-    });
+  _onClick(e) {
+    const el = e.target.closest('[data-action], [data-tab], [data-service], [data-dialog-tab]');
+    if (!el) return;
+    const index = parseInt(el.getAttribute('data-index'));
+
+    if (el.hasAttribute('data-tab')) {
+      this._setTab(el.getAttribute('data-tab'));
+    } else if (el.hasAttribute('data-service')) {
+      this._callService(el.getAttribute('data-service'));
+    } else if (el.hasAttribute('data-dialog-tab')) {
+      // Speichere aktuelle Formular-Daten vor Tab-Wechsel
+      this._saveCurrentProfileFormData();
+      this._editDialogTab = el.getAttribute('data-dialog-tab');
+      this.render();
+    } else {
+      switch (el.getAttribute('data-action')) {
+        case 'refresh': this._refresh(); break;
+        case 'add-profile': this._addProfile(); break;
+        case 'toggle': this._toggleProfileEnabled(index); break;
+        case 'edit': this._editProfile(index); break;
+        case 'copy': this._copyProfile(index); break;
+        case 'delete': this._deleteProfile(index); break;
+        case 'edit-area': this._editArea(el.getAttribute('data-area')); break;
+        case 'close-dialog': this._closeDialog(); break;
+        case 'save-profile': this._saveProfile(); break;
+        case 'save-area': this._saveArea(); break;
+      }
+    }
+  }
 
-    root.querySelectorAll('[data-action="save-area"]').forEach(btn => {
-      btn.addEventListener('click', () => this._saveArea());
-    });
+  _onChange(e) {
+    if (e.target.getAttribute?.('data-action') === 'toggle-global') {
+      this._toggleGlobalAuto(e.target.checked);
+    }
   }
 
   _setTab(tab) {
@@ -988,22 +1180,23 @@ class ShutterPilotCard extends HTMLElement {
   async _copyProfile(index) {
     const profile = { ...this._profiles[index] };
     profile.name = `${profile.name} (Kopie)`;
-    delete profile.status;
+    delete profile.id;  // neue ID vergibt das Backend
     delete profile.enabled;
-    delete profile._entities;
 
-    this._profiles.push(profile);
-    await this._saveConfig();
-    this._showToast('Profil dupliziert');
+    if (await this._patchConfig({ upsert_profiles: [this._cleanProfile(profile)] })) {
+      this._showToast('Profil dupliziert');
+    }
   }
 
   async _deleteProfile(index) {
     const profile = this._profiles[index];
     if (!confirm(`Profil "${profile.name}" wirklich löschen?`)) return;
 
-    this._profiles.splice(index, 1);
-    await this._saveConfig();
-    this._showToast('Profil gelöscht');
+    if (await this._patchConfig({ remove_profiles: [profile.id] })) {
+      this._profiles.splice(index, 1);
+      this.render();
+      this._showToast('Profil gelöscht');
+    }
   }
 
   _editArea(areaKey) {
@@ -1076,17 +1269,13 @@ class ShutterPilotCard extends HTMLElement {
     
     console.log('💾 Speichere Profil:', profile);
 
-    // Save
+    // Save (nur dieses Profil; ohne id legt das Backend ein neues an)
     const index = this._editingProfile.index;
     if (index === -1) {
-      this._profiles.push(profile);
-    } else {
-      // Preserve runtime data
-      const oldProfile = this._profiles[index];
-      this._profiles[index] = { ...profile, status: oldProfile.status, _entities: oldProfile._entities };
+      delete profile.id;
     }
 
-    await this._saveConfig();
+    if (!await this._patchConfig({ upsert_profiles: [this._cleanProfile(profile)] })) return;
     this._closeDialog();
     this._showToast(index === -1 ? 'Profil erstellt' : 'Profil gespeichert');
   }
@@ -1106,96 +1295,73 @@ class ShutterPilotCard extends HTMLElement {
 
     area.stagger_delay = parseInt(formData.get('stagger_delay')) || 0;
 
+    if (!await this._patchConfig({ upsert_areas: { [areaKey]: area } })) return;
     this._areas[areaKey] = area;
-    await this._saveConfig();
     this._closeDialog();
     this._showToast('Bereich gespeichert');
   }
 
-  async _saveConfig() {
+  _cleanProfile(profile) {
+    // Runtime-Daten nicht speichern
+    const clean = { ...profile };
+    delete clean.status;
+    delete clean._entities;
+    return clean;
+  }
+
+  async _patchConfig(patch) {
     if (!this._configEntry) {
       this._showToast('Config Entry nicht gefunden', 'error');
-      console.error('❌ _saveConfig: Config Entry nicht gefunden');
-      return;
+      console.error('❌ _patchConfig: Config Entry nicht gefunden');
+      return null;
     }
 
     try {
-      // Bereinige Profile (entferne Runtime-Daten)
-      const cleanProfiles = this._profiles.map(p => {
-        const clean = { ...p };
-        delete clean.status;
-        delete clean._entities;
-        return clean;
+      // Nur die Änderung senden; base_version verhindert das Überschreiben paralleler Änderungen.
+      // Das Backend wendet den Patch ohne Reload an, die neue Config kommt über das Config-Abo.
+      const result = await this._hass.callWS({
+        type: 'shutterpilot/config/patch',
+        entry_id: this._configEntry.entry_id,
+        base_version: this._configVersion,
+        ...patch,
       });
-
-      console.log('💾 Speichere Config:', {
-        profiles: cleanProfiles.length,
-        areas: Object.keys(this._areas).length
-      });
-
-      // Nutze den update_config Service (triggert Background-Reload)
-      await this._hass.callService('shutterpilot', 'update_config', {
-        profiles: cleanProfiles,
-        areas: this._areas,
-      });
-
-      console.log('✅ Service-Call erfolgreich! Config wurde gespeichert.');
-      this._showToast('Gespeichert! Integration lädt neu...', 'success');
-
-      // Warte auf Integration-Reload und poll Config-Sensor
-      console.log('🔄 Warte auf Integration-Reload (Background-Task)...');
-      
-      let attempts = 0;
-      const maxAttempts = 15;  // Erhöht für längere Wartezeit
-      const checkInterval = 700; // Check alle 700ms
-      
-      const pollConfig = async () => {
-        attempts++;
-        await this._loadConfigEntry();
-        
-        // Prüfe ob neue Profile geladen wurden
-        const currentProfileCount = this._profiles.length;
-        console.log(`🔄 Poll ${attempts}/${maxAttempts}: ${currentProfileCount} von ${cleanProfiles.length} Profilen geladen`);
-        
-        if (currentProfileCount === cleanProfiles.length) {
-          this.render();
-          console.log('✅ Alle Profile erfolgreich geladen!');
-          this._showToast('Integration neu geladen!', 'success');
-        } else if (attempts >= maxAttempts) {
-          this.render();
-          console.warn('⚠️ Timeout: Integration-Reload dauert länger als erwartet');
-          this._showToast('Bitte Seite manuell neu laden (F5)', 'warning');
-        } else {
-          // Versuche erneut
-          setTimeout(pollConfig, checkInterval);
-        }
-      };
-      
-      // Starte nach 1,5 Sekunden (gibt Integration Zeit zum Start des Reloads)
-      setTimeout(pollConfig, 1500);
-
+      this._configVersion = result.version;
+      console.log('✅ Config gespeichert (Version ' + result.version + '):', result);
+      return result;
     } catch (err) {
-      console.error('Fehler beim Speichern:', err);
-      this._showToast(`Fehler beim Speichern: ${err.message}`, 'error');
+      if (err.code === 'conflict') {
+        console.warn('⚠️ Config-Konflikt, lade neu:', err.message);
+        await this._loadConfigEntry();
+        this.render();
+        this._showToast('Konfiguration wurde zwischenzeitlich geändert – bitte erneut speichern', 'warning');
+      } else {
+        console.error('Fehler beim Speichern:', err);
+        this._showToast(`Fehler beim Speichern: ${err.message}`, 'error');
+      }
+      return null;
     }
   }
 
   async _toggleProfileEnabled(index) {
     const profile = this._profiles[index];
-    if (!profile || !profile._entities?.switch) {
-      this._showToast('Switch-Entity nicht gefunden', 'error');
-      return;
-    }
+    if (!profile) return;
 
     const service = profile.enabled ? 'turn_off' : 'turn_on';
     
     try {
-      await this._hass.callService('switch', service, {
-        entity_id: profile._entities.switch
-      });
+      if (profile._entities?.switch) {
+        await this._hass.callService('switch', service, {
+          entity_id: profile._entities.switch
+        });
+      } else {
+        // Kompaktmodus: kein Switch pro Profil → Sammel-Service
+        await this._hass.callService('shutterpilot', 'set_profiles_enabled', {
+          profiles: [profile.name],
+          enabled: !profile.enabled,
+        });
+      }
+      // Zeile aktualisiert sich über das Status-Abo
       this._showToast(`Profil ${profile.enabled ? 'deaktiviert' : 'aktiviert'}`);
-      
-      setTimeout(() => this._refresh(), 500);
     } catch (err) {
       this._showToast(`Fehler: ${err.message}`, 'error');
     }
@@ -1222,8 +1388,6 @@ class ShutterPilotCard extends HTMLElement {
         entity_id: this._config.entity
       });
       this._showToast(`Globale Automatik ${checked ? 'aktiviert' : 'deaktiviert'}`);
-      
-      setTimeout(() => this.render(), 300);
     } catch (err) {
       this._showToast(`Fehler: ${err.message}`, 'error');
       console.error('Toggle global auto error:', err);
@@ -2091,7 +2255,7 @@ window.customCards.push({
 });
 
 console.info(
-  '%c  SHUTTERPILOT-CARD  \n%c  Version 2.5.0 - Non-Async Service Fix ',
+  '%c  SHUTTERPILOT-CARD  \n%c  Version 2.6.0 - Incremental Rendering ',
   'color: white; background: #1a73e8; font-weight: 700;',
   'color: #1a73e8; font-weight: 300;'
 );